@@ -0,0 +1,109 @@
+"""
+Categorization Stem Cache Benchmark
+
+Kayıtlı data/daily_raw_*.json dosyalarındaki tüm 'genel' metinleri
+HoroscopeCategorizer ile kategorize eder ve kelime köklerinin:
+  - önbelleksiz (her kelimede TurkishStemmer.stem çağrılır)
+  - bellekteki LRU önbellekle (her dosya için yeni categorizer, günlük çalıştırma gibi)
+  - LRU + önceki çalıştırmalardan kalan kalıcı kök sözlüğüyle
+bulunduğu halleri, son olarak da kök eşleşmelerinin cümle başına küme kesişimleri
+(python motoru) yerine dosya başına tek seyrek matris çarpımıyla (vectorized motoru)
+bulunduğu hali karşılaştırır. Her yolun çıktısı önbelleksiz halinkiyle karşılaştırılır.
+
+Kullanım:
+    python benchmarks/categorize_benchmark.py
+    python benchmarks/categorize_benchmark.py --data-dir data --repeat 3
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from categorize_horoscopes import HoroscopeCategorizer, SCIPY_AVAILABLE, STEM_CACHE_SIZE  # noqa: E402
+
+
+def load_texts(data_dir):
+    """Her daily_raw dosyası için (dosya, genel metinleri) listesi"""
+    files = []
+    for path in sorted(glob.glob(os.path.join(data_dir, 'daily_raw_*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        texts = [sign_data['genel']
+                 for source_data in data.values() if isinstance(source_data, dict)
+                 for sign_data in source_data.values()
+                 if isinstance(sign_data, dict) and sign_data.get('genel')
+                 and sign_data['genel'] != 'null']
+        files.append((path, texts))
+    return files
+
+
+def run(files, stem_cache_size, stem_cache_file=None, engine='python'):
+    """Dosyaları sırayla kategorize eder; süre (ms), çıktılar ve kök önbelleği istatistikleri"""
+    outputs = []
+    totals = {}
+    elapsed = 0.0
+    for path, texts in files:
+        start = time.perf_counter()
+        categorizer = HoroscopeCategorizer(path, stem_cache_file=stem_cache_file,
+                                           stem_cache_size=stem_cache_size, engine=engine)
+        outputs.append(categorizer.categorize_texts(texts))
+        categorizer.stem_cache.save()
+        elapsed += time.perf_counter() - start
+        for key, value in categorizer.stem_cache.stats().items():
+            totals[key] = totals.get(key, 0) + value
+    return elapsed * 1000, outputs, totals
+
+
+def best_run(files, repeat, stem_cache_size, stem_cache_file=None, engine='python'):
+    """run'ı repeat kez çalıştırır, en iyi süreyi döner (kalıcı sözlük her seferinde ısınmış)"""
+    results = [run(files, stem_cache_size, stem_cache_file, engine) for _ in range(repeat)]
+    return min(results, key=lambda result: result[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kategorizasyonda kök önbelleğinin etkisini ölçer")
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    files = load_texts(args.data_dir)
+    if not files:
+        print(f"{args.data_dir} içinde daily_raw_*.json yok. Önce 'python scraper.py' çalıştırın.")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stem_file = os.path.join(tmp_dir, 'stem_cache.json')
+        # Kalıcı sözlüğü bir kez doldur (önceki günlerin çalıştırmaları)
+        run(files, STEM_CACHE_SIZE, stem_file)
+
+        modes = [
+            ('Önbelleksiz', best_run(files, args.repeat, 0)),
+            ('LRU', best_run(files, args.repeat, STEM_CACHE_SIZE)),
+            ('LRU + dosya', best_run(files, args.repeat, STEM_CACHE_SIZE, stem_file)),
+            ('Vektörel', best_run(files, args.repeat, STEM_CACHE_SIZE, stem_file, 'vectorized')),
+        ]
+
+    base_ms, base_out, _ = modes[0][1]
+    texts = sum(len(texts) for _, texts in files)
+    print(f"{len(files)} dosya, {texts} metin, tekrar: {args.repeat}, en iyi süre "
+          f"(vektörel: {'scipy.sparse' if SCIPY_AVAILABLE else 'numpy'})")
+    print("=" * 78)
+    print(f"{'Yol':12} {'Süre (ms)':>10} {'Hızlanma':>9} {'İsabet':>8} {'Stemmer':>9}  Çıktı")
+    print("-" * 78)
+    for name, (ms, outputs, stats) in modes:
+        hits = stats['memory_hits'] + stats['stored_hits']
+        hit_rate = hits / stats['lookups'] * 100 if stats['lookups'] else 0
+        speedup = base_ms / ms if ms else 0
+        same = "aynı" if outputs == base_out else "FARKLI"
+        print(f"{name:12} {ms:10.1f} {speedup:8.2f}x {hit_rate:7.1f}% {stats['stemmed']:9}  {same}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Scrape Metrics Report
+
+scraper.py'nin data/scrape_metrics_YYYY-MM-DD.jsonl dosyalarını okuyup:
+  - son günün son çalıştırmasında her sitenin istek aşamalarının ortalamalarını
+  - son N günde her sitenin toplam süresini (günün son çalıştırması)
+tablo olarak yazdırır. Hangi sitenin süreyi domine ettiğini ve günler arası
+gerilemeleri görmek için kullanılır.
+
+Kullanım:
+    python benchmarks/metrics_report.py
+    python benchmarks/metrics_report.py --days 14 --data-dir data
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from collections import defaultdict
+
+PHASES = ['rate_wait_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'download_ms', 'parse_ms']
+
+
+def load_last_run(path: str):
+    """Dosyadaki son çalıştırmanın kayıtlarını döner"""
+    with open(path, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records:
+        return []
+    last_run = records[-1]['run']
+    return [r for r in records if r.get('run') == last_run]
+
+
+def print_phases(records):
+    """Site bazında istek aşamalarının ortalamaları"""
+    by_site = defaultdict(list)
+    for record in records:
+        if record['type'] == 'request':
+            by_site[record['site']].append(record)
+
+    header = f"{'Site':12} {'İstek':>5} {'KB':>7} " + ' '.join(f"{p[:-3]:>9}" for p in PHASES) + f" {'Hücre':>6}"
+    print(header)
+    print("-" * len(header))
+    for site, requests in by_site.items():
+        kb = sum(r.get('bytes', 0) for r in requests) / 1024
+        averages = [sum(r.get(p, 0) for r in requests) / len(requests) for p in PHASES]
+        cells = sum(r.get('cells', 0) for r in requests)
+        errors = sum(1 for r in requests if 'error' in r)
+        line = f"{site:12} {len(requests):5} {kb:7.0f} " + ' '.join(f"{a:9.1f}" for a in averages) + f" {cells:6}"
+        if errors:
+            line += f"  ({errors} hata)"
+        print(line)
+
+
+def print_trend(files):
+    """Günler boyunca site sürelerinin (elapsed_ms) değişimi"""
+    days = []
+    elapsed = defaultdict(dict)
+    for path in files:
+        day = os.path.basename(path)[len('scrape_metrics_'):-len('.jsonl')]
+        days.append(day)
+        for record in load_last_run(path):
+            if record['type'] == 'site':
+                elapsed[record['site']][day] = record['elapsed_ms']
+
+    print(f"{'Site':12} " + ' '.join(f"{day[5:]:>8}" for day in days))
+    print("-" * (13 + 9 * len(days)))
+    for site, values in elapsed.items():
+        cells = [f"{values[day] / 1000:7.2f}s" if day in values else f"{'-':>8}" for day in days]
+        print(f"{site:12} " + ' '.join(cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper metriklerini özetler")
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--days', type=int, default=7, help="Trend tablosundaki gün sayısı")
+    args = parser.parse_args()
+
+    files = sorted(glob.glob(os.path.join(args.data_dir, 'scrape_metrics_*.jsonl')))
+    if not files:
+        print(f"{args.data_dir} içinde scrape_metrics_*.jsonl yok. Önce 'python scraper.py' çalıştırın.")
+        sys.exit(1)
+
+    latest = files[-1]
+    print(f"Son çalıştırma: {latest}  (ortalama ms / istek)")
+    print("=" * 100)
+    print_phases(load_last_run(latest))
+
+    print()
+    print(f"Site süreleri (son {args.days} gün, günün son çalıştırması)")
+    print("=" * 100)
+    print_trend(files[-args.days:])
+
+
+if __name__ == "__main__":
+    main()
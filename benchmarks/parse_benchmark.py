@@ -0,0 +1,81 @@
+"""
+Parse Benchmark
+
+Kayıtlı HTML snapshot'ları üzerinde her site için iki parse yolunu karşılaştırır:
+  - tam: sayfanın tamamı BeautifulSoup ağacına dönüştürülür (eski yol)
+  - hızlı: sadece sitenin parse_only container alt ağacı parse edilir (sites.py)
+
+Scraper'lar replay modunda (ağa çıkmadan) çalıştırıldığı için ölçülen süre
+sitenin toplam parse + çıkarım süresidir. İki yolun çıktısı da karşılaştırılır.
+
+Kullanım:
+    python benchmarks/parse_benchmark.py                  # en son snapshot günü
+    python benchmarks/parse_benchmark.py --date 2025-12-04 --repeat 10
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fetcher  # noqa: E402
+import scraper  # noqa: E402
+from snapshots import SNAPSHOT_DIR, SnapshotStore, available_dates  # noqa: E402
+
+
+def time_site(site: str, fast: bool, repeat: int):
+    """Siteyi repeat kez çalıştırır, en iyi süreyi (ms) ve son çıktıyı döner"""
+    scraper.FAST_PARSE = fast
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = scraper.run_scraper(site)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tam ve hızlı HTML parse yollarını karşılaştırır")
+    parser.add_argument('--date', help="Snapshot günü (varsayılan: en son gün)")
+    parser.add_argument('--snapshot-dir', default=SNAPSHOT_DIR)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    dates = available_dates(args.snapshot_dir)
+    date = args.date or (dates[-1] if dates else None)
+    if not date:
+        print(f"{args.snapshot_dir} içinde snapshot yok. Önce 'python scraper.py' çalıştırın.")
+        sys.exit(1)
+
+    # Scraper'ın satır satır INFO logları ölçümü gölgelemesin
+    logging.getLogger().setLevel(logging.WARNING)
+    fetcher.configure(snapshot_store=SnapshotStore(args.snapshot_dir, date), replay=True)
+
+    print(f"Snapshot günü: {date}  (tekrar: {args.repeat}, en iyi süre)")
+    print("=" * 72)
+    print(f"{'Site':12} {'Tam (ms)':>10} {'Hızlı (ms)':>11} {'Hızlanma':>9}  Çıktı")
+    print("-" * 72)
+
+    total_full = total_fast = 0.0
+    for site in scraper.SITES:
+        full_ms, full_result = time_site(site, fast=False, repeat=args.repeat)
+        fast_ms, fast_result = time_site(site, fast=True, repeat=args.repeat)
+        total_full += full_ms
+        total_fast += fast_ms
+
+        speedup = full_ms / fast_ms if fast_ms else 0
+        same = "aynı" if full_result == fast_result else "FARKLI"
+        print(f"{site:12} {full_ms:10.1f} {fast_ms:11.1f} {speedup:8.2f}x  {same}")
+
+    print("-" * 72)
+    speedup = total_full / total_fast if total_fast else 0
+    print(f"{'TOPLAM':12} {total_full:10.1f} {total_fast:11.1f} {speedup:8.2f}x")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
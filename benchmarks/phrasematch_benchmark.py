@@ -0,0 +1,184 @@
+"""
+Phrase Matcher Benchmark
+
+Kategorizasyondaki ifade kontrolünü ve scorer'ın sentiment kelime saymasını eski
+(her kelime için ayrı `in` / str.count taraması) ve phrasematch.py'deki tek geçişli
+halleriyle karşılaştırır:
+  - ifade kontrolü: daily_raw 'genel' metinlerinin cümlelerinde aşk/para/sağlık ifadeleri
+  - sentiment: processed_daily_raw kategori metinlerinde pozitif/negatif/boost kelimeleri
+  - büyüyen sözlük: kelime listeleri türetilmiş kelimelerle N katına çıkarıldığında sayma
+
+Her adımda iki yolun çıktısı da karşılaştırılır.
+
+Kullanım:
+    python benchmarks/phrasematch_benchmark.py
+    python benchmarks/phrasematch_benchmark.py --data-dir data --repeat 5 --grow 1 4 16
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scorer  # noqa: E402
+from categorize_horoscopes import HoroscopeCategorizer  # noqa: E402
+from phrasematch import PhraseMatcher  # noqa: E402
+
+# Büyüyen sözlük adımında kelimelere eklenen ekler
+SUFFIXES = ['ler', 'lar', 'lik', 'lık', 'siz', 'sız', 'ce', 'ca', 'de', 'da',
+            'yi', 'yı', 'ni', 'nı', 'le', 'la', 'sel', 'sal', 'ci', 'cı']
+
+
+# ESKİ UYGULAMALAR (karşılaştırma için)
+
+def old_phrase_category(categorizer, sentence):
+    sentence_lower = sentence.lower()
+    for category, phrases in (('love', categorizer.LOVE_PHRASES),
+                              ('money', categorizer.MONEY_PHRASES),
+                              ('health', categorizer.HEALTH_PHRASES)):
+        for phrase in phrases:
+            if phrase in sentence_lower:
+                return category
+    return None
+
+
+def old_sentiment(item):
+    text, category = item
+    text_lower = text.lower()
+    positive_score = negative_score = positive_count = negative_count = 0
+    for word, weight in scorer.POSITIVE_WORDS.items():
+        if word in text_lower:
+            count = text_lower.count(word)
+            positive_score += weight * count
+            positive_count += count
+    for word, weight in scorer.NEGATIVE_WORDS.items():
+        if word in text_lower:
+            count = text_lower.count(word)
+            negative_score += abs(weight) * count
+            negative_count += count
+    category_boost = 0
+    for boost_word in scorer.CATEGORY_KEYWORDS[category]['positive_boost']:
+        if boost_word in text_lower:
+            category_boost += 5
+    for neg_word in scorer.CATEGORY_KEYWORDS[category]['negative_words']:
+        if neg_word in text_lower:
+            category_boost -= 5
+    return positive_count, negative_count, positive_score, negative_score, category_boost
+
+
+def old_counts(lexicon, text):
+    text_lower = text.lower()
+    return {word: text_lower.count(word) for word in lexicon if word in text_lower}
+
+
+# YENİ UYGULAMALAR
+
+def new_phrase_category(categorizer, sentence):
+    phrases = categorizer.phrase_matcher.found(sentence.lower())
+    for category, category_phrases in (('love', categorizer.LOVE_PHRASES),
+                                       ('money', categorizer.MONEY_PHRASES),
+                                       ('health', categorizer.HEALTH_PHRASES)):
+        if not phrases.isdisjoint(category_phrases):
+            return category
+    return None
+
+
+def new_sentiment(item):
+    text, category = item
+    details = scorer.calculate_sentiment_score(text, category)['details']
+    return (details['positive_count'], details['negative_count'], details['positive_score'],
+            details['negative_score'], details['category_boost'])
+
+
+def load_inputs(data_dir, categorizer):
+    """Cümleler (daily_raw genel metinleri) ve (metin, kategori) çiftleri (processed dosyaları)"""
+    sentences = []
+    for path in sorted(glob.glob(os.path.join(data_dir, 'daily_raw_*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for source_data in data.values():
+            for sign_data in source_data.values():
+                if isinstance(sign_data, dict) and sign_data.get('genel'):
+                    sentences.extend(categorizer.split_into_sentences(sign_data['genel']))
+
+    texts = []
+    for path in sorted(glob.glob(os.path.join(data_dir, 'processed_daily_raw_*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for source_data in data.values():
+            for sign_data in source_data.values():
+                for category in ('genel', 'aşk', 'para', 'sağlık'):
+                    text = sign_data.get(category)
+                    if text and text != 'null':
+                        texts.append((text, category))
+    return sentences, texts
+
+
+def grown_lexicon(factor):
+    """Sentiment kelime listesi, türetilmiş kelimelerle yaklaşık factor katına çıkarılmış"""
+    base = list(scorer.POSITIVE_WORDS) + list(scorer.NEGATIVE_WORDS)
+    lexicon = list(base)
+    for suffix in SUFFIXES[:factor - 1]:
+        lexicon.extend(word + suffix for word in base)
+    return list(dict.fromkeys(lexicon))
+
+
+def best_ms(func, inputs, repeat):
+    """Fonksiyonu tüm girdilerde repeat kez çalıştırır; en iyi süreyi (ms) ve çıktıyı döner"""
+    best = float('inf')
+    outputs = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [func(item) for item in inputs]
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kelime/ifade aramalarının eski ve tek geçişli hallerini karşılaştırır")
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--grow', type=int, nargs='+', default=[1, 4, 16],
+                        help='Büyüyen sözlük adımındaki sözlük katları')
+    args = parser.parse_args()
+
+    categorizer = HoroscopeCategorizer(os.path.join(args.data_dir, 'daily_raw_benchmark.json'))
+    sentences, texts = load_inputs(args.data_dir, categorizer)
+    if not sentences or not texts:
+        print(f"{args.data_dir} içinde daily_raw_*.json / processed_daily_raw_*.json yok. "
+              f"Önce pipeline'ı çalıştırın.")
+        sys.exit(1)
+
+    steps = [
+        ('İfade kontrolü', len(categorizer.phrase_matcher.phrases),
+         lambda sentence: old_phrase_category(categorizer, sentence),
+         lambda sentence: new_phrase_category(categorizer, sentence), sentences),
+        ('Sentiment', len(scorer.LEXICON_MATCHER.phrases), old_sentiment, new_sentiment, texts),
+    ]
+    genel_texts = [text for text, category in texts if category == 'genel']
+    for factor in args.grow:
+        lexicon = grown_lexicon(factor)
+        matcher = PhraseMatcher(lexicon)
+        steps.append((f'Sözlük x{factor}', len(lexicon),
+                      lambda text, lexicon=lexicon: old_counts(lexicon, text),
+                      lambda text, matcher=matcher: matcher.counts(text.lower()), genel_texts))
+
+    print(f"Tekrar: {args.repeat}, en iyi süre")
+    print("=" * 80)
+    print(f"{'Adım':16} {'Kelime':>7} {'Girdi':>7} {'Eski (ms)':>10} {'Yeni (ms)':>10} {'Hızlanma':>9}  Çıktı")
+    print("-" * 80)
+    for name, words, old, new, inputs in steps:
+        old_ms, old_out = best_ms(old, inputs, args.repeat)
+        new_ms, new_out = best_ms(new, inputs, args.repeat)
+        speedup = old_ms / new_ms if new_ms else 0
+        same = "aynı" if old_out == new_out else "FARKLI"
+        print(f"{name:16} {words:7} {len(inputs):7} {old_ms:10.1f} {new_ms:10.1f} {speedup:8.2f}x  {same}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Text Normalization Benchmark
+
+Kayıtlı data/daily_raw_*.json metinleri üzerinde scraper'ın metin temizleme
+adımlarını eski (döngü içinde regex derleyen / string üreten) ve textnorm.py'deki
+önceden hazırlanmış halleriyle karşılaştırır:
+  - etiket temizleme: Milliyet paragraflarındaki 'aşk:', 'para:' vb. etiketler
+  - burç tespiti: Haberturk figcaption'larında büyük harfli burç adı arama
+  - isim normalizasyonu: Hurriyet / Vogue başlıklarındaki burç adları
+
+Her adımda iki yolun çıktısı da karşılaştırılır.
+
+Kullanım:
+    python benchmarks/textnorm_benchmark.py
+    python benchmarks/textnorm_benchmark.py --data-dir data --repeat 5
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import textnorm  # noqa: E402
+from textnorm import BURC_NORMALIZATION, BURCLAR  # noqa: E402
+
+LABELS = ['iş:', 'aşk:', 'para:', 'kariyer:', 'sağlık:', 'ilişkiler:']
+LABEL_SET = textnorm.LabelSet(LABELS)
+
+
+# ESKİ UYGULAMALAR (karşılaştırma için)
+
+def old_strip_labels(text):
+    text_clean = text
+    for label in LABELS:
+        if text_clean.lower().startswith(label):
+            text_clean = text_clean[len(label):].strip()
+            break
+        text_clean = re.sub(rf'\b{label}\s*', '', text_clean, flags=re.IGNORECASE)
+    return text_clean
+
+
+def old_find_sign(text):
+    text_upper = text.upper()
+    for burc_name in BURCLAR:
+        burc_upper_tr = burc_name.upper()
+        burc_upper_en = burc_name.replace('İ', 'I').replace('i', 'I').upper()
+
+        search_term = None
+        if burc_upper_tr in text_upper[:200]:
+            search_term = burc_upper_tr
+        elif burc_upper_en in text_upper[:200]:
+            search_term = burc_upper_en
+
+        if search_term:
+            idx = text_upper.index(search_term)
+            return burc_name, text[idx + len(search_term):]
+    return None
+
+
+def old_normalize(name):
+    if not name:
+        return None
+    special_cases = {
+        "İKİZLER": "İkizler",
+        "IKIZLER": "İkizler",
+        "TERAZİ": "Terazi",
+        "TERAZI": "Terazi",
+    }
+    clean_name_upper = name.strip().upper()
+    if clean_name_upper in special_cases:
+        return special_cases[clean_name_upper]
+    clean_name = name.strip().lower()
+    normalized = BURC_NORMALIZATION.get(clean_name)
+    if normalized:
+        return normalized
+    for burc in BURCLAR:
+        if burc.lower() == clean_name:
+            return burc
+    return None
+
+
+# YENİ UYGULAMALAR
+
+def new_strip_labels(text):
+    return LABEL_SET.strip(text)
+
+
+def new_find_sign(text):
+    found = textnorm.find_upper_sign(text)
+    if not found:
+        return None
+    burc_name, search_term, idx = found
+    return burc_name, text[idx + len(search_term):]
+
+
+def new_normalize(name):
+    return textnorm.normalize_burc_name(name)
+
+
+def load_inputs(data_dir):
+    """daily_raw dosyalarındaki metinlerden her adım için girdi listeleri üretir"""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(data_dir, 'daily_raw_*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for site_data in data.values():
+            if not isinstance(site_data, dict):
+                continue
+            for burc, categories in site_data.items():
+                if not isinstance(categories, dict):
+                    continue
+                for category, text in categories.items():
+                    if text:
+                        texts.append((burc, category, text))
+
+    # Milliyet: metnin kendisi ve başına kategori etiketi eklenmiş hali
+    paragraphs = []
+    for _, category, text in texts:
+        paragraphs.append(text)
+        paragraphs.append(f"{category.capitalize()}: {text}")
+
+    # Haberturk: "KOÇ GÜNLÜK BURÇ YORUMU ..." biçimindeki figcaption metinleri
+    figcaptions = [f"{burc.upper()} GÜNLÜK BURÇ YORUMU {text}" for burc, _, text in texts]
+
+    # Hurriyet / Vogue başlıklarından çıkan isimler
+    names = list(BURC_NORMALIZATION) + BURCLAR + [b.upper() for b in BURCLAR] + ['IKIZLER', 'TERAZI', 'Burç']
+    names = names * max(1, len(texts) // len(names))
+    return paragraphs, figcaptions, names
+
+
+def best_ms(func, inputs, repeat):
+    """Fonksiyonu tüm girdilerde repeat kez çalıştırır; en iyi süreyi (ms) ve çıktıyı döner"""
+    best = float('inf')
+    outputs = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [func(item) for item in inputs]
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metin normalizasyonunun eski ve yeni hallerini karşılaştırır")
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    paragraphs, figcaptions, names = load_inputs(args.data_dir)
+    if not paragraphs:
+        print(f"{args.data_dir} içinde daily_raw_*.json yok. Önce 'python scraper.py' çalıştırın.")
+        sys.exit(1)
+
+    steps = [
+        ('Etiket temizleme', old_strip_labels, new_strip_labels, paragraphs),
+        ('Burç tespiti', old_find_sign, new_find_sign, figcaptions),
+        ('İsim normalize', old_normalize, new_normalize, names),
+    ]
+
+    print(f"Tekrar: {args.repeat}, en iyi süre")
+    print("=" * 72)
+    print(f"{'Adım':18} {'Girdi':>7} {'Eski (ms)':>10} {'Yeni (ms)':>10} {'Hızlanma':>9}  Çıktı")
+    print("-" * 72)
+    for name, old, new, inputs in steps:
+        old_ms, old_out = best_ms(old, inputs, args.repeat)
+        new_ms, new_out = best_ms(new, inputs, args.repeat)
+        speedup = old_ms / new_ms if new_ms else 0
+        same = "aynı" if old_out == new_out else "FARKLI"
+        print(f"{name:18} {len(inputs):7} {old_ms:10.1f} {new_ms:10.1f} {speedup:8.2f}x  {same}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
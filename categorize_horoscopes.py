@@ -3,12 +3,175 @@ Burç Yorumu Kategorizasyon Sistemi
 
 Ham burç yorumu JSON verisini işleyerek "genel" anahtarındaki metni analiz eder.
 Aşk, para ve sağlık konularına dair cümleleri tespit edip ilgili kategorilere kopyalar.
+
+Kelime kökleri bellekte bir LRU önbellekte, AISTROLOG_STEM_CACHE ile verilen
+dosyada da çalıştırmalar arasında tutulur (bkz. StemCache).
+Ölçüm: python benchmarks/categorize_benchmark.py
+
+Birden fazla dosya tek çalıştırmada işlenebilir; --workers N ile (kaynak, burç)
+metinleri N süreçte kategorize edilir:
+    python categorize_horoscopes.py data/daily_raw_2025-11-*.json --workers 8
+
+--engine vectorized ile kök eşleşmeleri cümle başına küme kesişimleri yerine bir
+dosyanın tüm cümleleri için tek bir seyrek matris çarpımıyla bulunur (bkz. StemMatrix).
+
+Toplu yeniden işleme (keyword / ifade listeleri değiştiğinde): --glob ya da --from/--to
+ile seçilen dosyalardan girdisi ve keyword ayarları son çıktıdakiyle aynı olanlar
+(.cache/categorize_manifest.json, AISTROLOG_CATEGORIZE_MANIFEST ile değiştirilebilir)
+atlanır; --force hepsini yeniden işler:
+    python categorize_horoscopes.py --from 2025-11-01 --to 2025-11-30
 """
 
+import argparse
+import glob
+import hashlib
 import json
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+import content_index
+import storage
+from phrasematch import PhraseMatcher
+
+# scipy isteğe bağlı; yoksa vektörel motor aynı çarpımı numpy ile yapar
+try:
+    from scipy import sparse
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Bellekteki kök önbelleğinin boyutu (kelime sayısı)
+STEM_CACHE_SIZE = 50000
+
+# Çıktıların girdi / keyword ayarı parmak izlerinin tutulduğu dosya. Workflow data/'yı
+# commit'lediği için orada değil, .cache/ altında (Actions cache'iyle saklanır) durur.
+MANIFEST_ENV = "AISTROLOG_CATEGORIZE_MANIFEST"
+DEFAULT_MANIFEST = ".cache/categorize_manifest.json"
+
+# Cümlelerin kök eşleşmelerini bulan motorlar (bkz. HoroscopeCategorizer.categorize_sentences)
+ENGINES = ('python', 'vectorized')
+
+# Kalıcı kök sözlüğü dosyası için ortam değişkeni (yoksa sadece bellekte tutulur)
+STEM_CACHE_ENV = "AISTROLOG_STEM_CACHE"
+DEFAULT_STEM_CACHE = ".cache/stem_cache.json"
+
+
+class StemCache:
+    """
+    TurkishStemmer önünde kök önbelleği. Burç yorumlarının kelime dağarcığı küçük ve
+    çok tekrarlı olduğu için kökler bellekteki sınırlı bir LRU'da tutulur. path
+    verilirse kökler bir JSON sözlükte saklanır ve sonraki çalıştırmalar stemmer'ı
+    hiç çağırmadan buradan okur (sözlük de STEM_CACHE_SIZE ile sınırlıdır).
+    """
+
+    def __init__(self, stemmer, maxsize: int = STEM_CACHE_SIZE, path: str = None):
+        self.stemmer = stemmer
+        self.maxsize = maxsize
+        self.path = path
+        self.stored = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.stored = json.load(f)
+        self.stored_hits = 0
+        self.new_stems = {}
+        self.stem = lru_cache(maxsize=maxsize)(self._lookup)
+
+    def _lookup(self, word: str) -> str:
+        """LRU'da olmayan kelime: önce kalıcı sözlük, sonra stemmer"""
+        stem = self.stored.get(word)
+        if stem is not None:
+            self.stored_hits += 1
+            return stem
+        stem = self.stemmer.stem(word)
+        if self.path and len(self.stored) < self.maxsize:
+            self.stored[word] = stem
+            self.new_stems[word] = stem
+        return stem
+
+    def stats(self) -> dict:
+        """Toplam istek, bellek/dosya isabetleri ve stemmer çağrıları"""
+        info = self.stem.cache_info()
+        return {
+            'lookups': info.hits + info.misses,
+            'memory_hits': info.hits,
+            'stored_hits': self.stored_hits,
+            'stemmed': info.misses - self.stored_hits,
+        }
+
+    def take_new(self) -> Dict[str, str]:
+        """Son çağrıdan beri sözlüğe eklenen kökleri döner (worker süreçlerinden toplamak için)"""
+        new_stems, self.new_stems = self.new_stems, {}
+        return new_stems
+
+    def merge(self, stems: Dict[str, str]):
+        """Başka bir süreçte bulunan kökleri sözlüğe ekler"""
+        for word, stem in stems.items():
+            if word not in self.stored and len(self.stored) < self.maxsize:
+                self.stored[word] = stem
+                self.new_stems[word] = stem
+
+    def save(self):
+        """Yeni kökler varsa sözlüğü kaydeder (önce geçici dosyaya)"""
+        if not self.path or not self.new_stems:
+            return
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.stored, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.new_stems = {}
+
+
+class StemMatrix:
+    """
+    Kök -> kategori eşlemesinin matris hali. Kategori köklerine birer sütun numarası verilir;
+    her kategori, köklerinin göstergesi olan seyrek bir vektördür (kök x kategori matrisi C).
+    Cümle grubunun kategori kökleri seyrek bir gösterge matrisine (cümle x kök, S) yazılır ve
+    S @ C her cümlede her kategoriden kaç kök geçtiğini verir. Hiçbir kategoride olmayan
+    kökler sayılara katkı vermediği için numaralanmaz; sözlük kategori kökleriyle sınırlıdır.
+    """
+
+    def __init__(self, category_stems: List[Set[str]]):
+        self.stem_ids: Dict[str, int] = {}
+        rows, columns = [], []
+        for column, stems in enumerate(category_stems):
+            for stem in sorted(stems):
+                rows.append(self.stem_ids.setdefault(stem, len(self.stem_ids)))
+                columns.append(column)
+        self.categories = len(category_stems)
+        self.category_matrix = np.zeros((len(self.stem_ids), self.categories), dtype=np.int32)
+        self.category_matrix[rows, columns] = 1
+        self.category_sparse = None
+        if SCIPY_AVAILABLE:
+            self.category_sparse = sparse.csr_matrix(self.category_matrix)
+
+    def counts(self, stem_sets: List[Set[str]]) -> np.ndarray:
+        """Her kök kümesi (cümle) için kategori başına eşleşen kök sayısı (cümle x kategori)"""
+        get = self.stem_ids.get
+        sentences = len(stem_sets)
+        # Sadece kategori köklerine düşen (cümle, kök) çiftleri
+        pairs = [(row, column) for row, stems in enumerate(stem_sets)
+                 for column in map(get, stems) if column is not None]
+        rows = np.array([row for row, _ in pairs], dtype=np.int64)
+        columns = np.array([column for _, column in pairs], dtype=np.int64)
+
+        if SCIPY_AVAILABLE:
+            sentence_matrix = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.int32), (rows, columns)),
+                shape=(sentences, len(self.stem_ids)))
+            return (sentence_matrix @ self.category_sparse).toarray()
+
+        result = np.zeros((sentences, self.categories), dtype=np.int32)
+        np.add.at(result, rows, self.category_matrix[columns])
+        return result
 
 
 class HoroscopeCategorizer:
@@ -56,15 +219,27 @@ class HoroscopeCategorizer:
     }
     
     
-    def __init__(self, input_file: str, output_file: str = None):
+    def __init__(self, input_file: str = None, output_file: str = None,
+                 stem_cache_file: str = None, stem_cache_size: int = STEM_CACHE_SIZE,
+                 engine: str = 'python', manifest_file: str = None):
         from TurkishStemmer import TurkishStemmer
         self.stemmer = TurkishStemmer()
+        self.stem_cache = StemCache(self.stemmer, stem_cache_size,
+                                    stem_cache_file or os.environ.get(STEM_CACHE_ENV))
+        self.manifest_file = manifest_file or os.environ.get(MANIFEST_ENV) or DEFAULT_MANIFEST
 
         # Keywordleri köke çeviriyoruz (bir kez)
         self.LOVE_STEMS = {self.stemmer.stem(x) for x in self.LOVE_KEYWORDS}
         self.MONEY_STEMS = {self.stemmer.stem(x) for x in self.MONEY_KEYWORDS}
         self.HEALTH_STEMS = {self.stemmer.stem(x) for x in self.HEALTH_KEYWORDS}
 
+        if engine not in ENGINES:
+            raise ValueError(f"Bilinmeyen motor: {engine} (seçenekler: {', '.join(ENGINES)})")
+        self.engine = engine
+        self.stem_matrix = None
+        if engine == 'vectorized':
+            self.stem_matrix = StemMatrix([self.LOVE_STEMS, self.MONEY_STEMS, self.HEALTH_STEMS])
+
         # PHRASES (sadece tek kelimeyle yakalanamayanlar)
         self.LOVE_PHRASES = [
             "duygusal bağ",
@@ -94,8 +269,29 @@ class HoroscopeCategorizer:
             "psikolojik olarak",
             "fiziksel yorgunluk"
         ]
+        # Üç listedeki ifadeler cümlede tek geçişte aranır (bkz. phrasematch.py)
+        self.phrase_matcher = PhraseMatcher(
+            self.LOVE_PHRASES + self.MONEY_PHRASES + self.HEALTH_PHRASES)
+
+        # Keyword / ifade listelerinin parmak izi; değişince eski çıktılar yeniden işlenir
+        self.config_hash = hashlib.sha1(json.dumps([
+            sorted(self.LOVE_KEYWORDS), sorted(self.MONEY_KEYWORDS), sorted(self.HEALTH_KEYWORDS),
+            self.LOVE_PHRASES, self.MONEY_PHRASES, self.HEALTH_PHRASES,
+        ], ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
 
 
+        # genel metni -> {kategori: metin}; önceden kategorize edilmiş metinler
+        # (worker süreçleri, vectorized motorun dosya başına toplu çalıştırması).
+        # Aynı dosyada tekrar eden metinler içerik tablosuyla (content_index.py) bir
+        # kez kategorize edilip sonucu kopya hücrelere dağıtılır.
+        self._categorized = {}
+        self.input_file = None
+        self.output_file = None
+        if input_file:
+            self.set_files(input_file, output_file)
+    
+    def set_files(self, input_file: str, output_file: str = None):
+        """İşlenecek dosyayı seçer; aynı categorizer (stemmer, önbellekler) birden fazla dosyada kullanılabilir"""
         self.input_file = Path(input_file)
         
         if output_file:
@@ -125,25 +321,30 @@ class HoroscopeCategorizer:
     def stem_sentence(self, sentence: str) -> set:
         """Cümledeki tüm kelimeleri köklerine indirger ve set döner."""
         words = re.findall(r'\b\w+\b', sentence.lower())
-        return {self.stemmer.stem(w) for w in words}
-    
-    def categorize_sentence(self, sentence: str) -> dict:
-        """Bir cümleyi PHRASE ve kök tabanlı olarak kategorize eder."""
-
-        sentence_lower = sentence.lower()
+        stem = self.stem_cache.stem
+        return {stem(w) for w in words}
     
-        # Önce PHRASE kontrolü (öncelikli)
-        for phrase in self.LOVE_PHRASES:
-            if phrase in sentence_lower:
+    def categorize_phrases(self, sentence: str) -> Optional[dict]:
+        """Cümlede PHRASE varsa kategorisi (öncelik: aşk > para > sağlık), yoksa None"""
+        phrases = self.phrase_matcher.found(sentence.lower())
+        if phrases:
+            if not phrases.isdisjoint(self.LOVE_PHRASES):
                 return {'love': True, 'money': False, 'health': False}
 
-        for phrase in self.MONEY_PHRASES:
-            if phrase in sentence_lower:
+            if not phrases.isdisjoint(self.MONEY_PHRASES):
                 return {'love': False, 'money': True, 'health': False}
 
-        for phrase in self.HEALTH_PHRASES:
-            if phrase in sentence_lower:
+            if not phrases.isdisjoint(self.HEALTH_PHRASES):
                 return {'love': False, 'money': False, 'health': True}
+        return None
+
+    def categorize_sentence(self, sentence: str) -> dict:
+        """Bir cümleyi PHRASE ve kök tabanlı olarak kategorize eder."""
+
+        # Önce PHRASE kontrolü (öncelikli)
+        by_phrase = self.categorize_phrases(sentence)
+        if by_phrase:
+            return by_phrase
 
         # Kök tabanlı kontrol
         sent_stems = self.stem_sentence(sentence)
@@ -154,8 +355,26 @@ class HoroscopeCategorizer:
             'health': len(self.HEALTH_STEMS & sent_stems) > 0
         }
     
-    def process_horoscope(self, horoscope_data: dict) -> dict:
-        """Bir burç verisini işler ve kategorize eder"""
+    def categorize_sentences(self, sentences: List[str]) -> List[dict]:
+        """
+        Cümle listesini kategorize eder (categorize_sentence ile aynı sonuç). vectorized
+        motorda PHRASE içermeyen tüm cümlelerin kök eşleşmeleri tek matris çarpımıyla bulunur.
+        """
+        if self.engine != 'vectorized':
+            return [self.categorize_sentence(sentence) for sentence in sentences]
+        
+        results = [self.categorize_phrases(sentence) for sentence in sentences]
+        pending = [i for i, result in enumerate(results) if result is None]
+        counts = self.stem_matrix.counts([self.stem_sentence(sentences[i]) for i in pending])
+        for i, (love, money, health) in zip(pending, counts.tolist()):
+            results[i] = {'love': love > 0, 'money': money > 0, 'health': health > 0}
+        return results
+    
+    def process_horoscope(self, horoscope_data: dict, categorized: Optional[dict] = None) -> dict:
+        """
+        Bir burç verisini işler ve kategorize eder. categorized verilirse (aynı metnin
+        başka hücredeki sonucu) metin yeniden kategorize edilmez.
+        """
         result = horoscope_data.copy()
         
         genel_text = horoscope_data.get('genel', '')
@@ -163,39 +382,56 @@ class HoroscopeCategorizer:
         if not genel_text or genel_text == 'null' or genel_text is None:
             return result
         
-        sentences = self.split_into_sentences(genel_text)
-        
-        love_sentences = []
-        money_sentences = []
-        health_sentences = []
+        if categorized is None:
+            categorized = self._categorized.get(genel_text)
+        if categorized is None:
+            categorized = self.categorize_text(genel_text)
+        result.update(categorized)
+        return result
+    
+    def categorize_text(self, genel_text: str) -> dict:
+        """genel metnini cümle cümle kategorize eder, dolu kategorileri döner"""
+        return self.categorize_texts([genel_text])[0]
+    
+    def categorize_texts(self, texts: List[str]) -> List[dict]:
+        """Metinleri kategorize eder; tüm metinlerin cümleleri birlikte categorize_sentences'a verilir"""
+        sentence_lists = [self.split_into_sentences(text) for text in texts]
+        categories_iter = iter(self.categorize_sentences(
+            [sentence for sentences in sentence_lists for sentence in sentences]))
         
-        for sentence in sentences:
-            categories = self.categorize_sentence(sentence)
+        results = []
+        for sentences in sentence_lists:
+            result = {}
+            love_sentences = []
+            money_sentences = []
+            health_sentences = []
             
-            if categories['love']:
-                love_sentences.append(sentence)
+            for sentence in sentences:
+                categories = next(categories_iter)
+                
+                if categories['love']:
+                    love_sentences.append(sentence)
+                
+                if categories['money']:
+                    money_sentences.append(sentence)
+                
+                if categories['health']:
+                    health_sentences.append(sentence)
             
-            if categories['money']:
-                money_sentences.append(sentence)
+            if love_sentences:
+                result['aşk'] = ' '.join(love_sentences)
             
-            if categories['health']:
-                health_sentences.append(sentence)
-        
-        if love_sentences:
-            result['aşk'] = ' '.join(love_sentences)
-        
-        if money_sentences:
-            result['para'] = ' '.join(money_sentences)
-        
-        if health_sentences:
-            result['sağlık'] = ' '.join(health_sentences)
-        
-        return result
+            if money_sentences:
+                result['para'] = ' '.join(money_sentences)
+            
+            if health_sentences:
+                result['sağlık'] = ' '.join(health_sentences)
+            
+            results.append(result)
+        return results
     
-    def process_file(self) -> dict:
-        """JSON dosyasını yükler, tüm burçları işler ve sonucu kaydeder"""
-        print(f"Dosya okunuyor: {self.input_file}")
-        
+    def load_input(self) -> dict:
+        """Girdi dosyasını yükler"""
         # Dosya varlığını kontrol et
         if not self.input_file.exists():
             raise FileNotFoundError(
@@ -204,13 +440,60 @@ class HoroscopeCategorizer:
             )
         
         with open(self.input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+            return json.load(f)
+    
+    def fingerprint(self) -> dict:
+        """Girdi dosyasının ve keyword ayarlarının parmak izi"""
+        return {'input': file_hash(self.input_file), 'config': self.config_hash}
+    
+    def is_up_to_date(self) -> bool:
+        """Çıktı var ve son işlendiği andaki girdi / keyword ayarlarıyla aynı mı"""
+        if not self.output_file.exists() or not self.input_file.exists():
+            return False
+        manifest = load_manifest(self.manifest_file)
+        return manifest.get(os.path.normpath(self.output_file)) == self.fingerprint()
+    
+    def record_fingerprint(self):
+        """Çıktının parmak izini manifest dosyasına yazar (anahtar: çıktı dosyasının yolu)"""
+        manifest = load_manifest(self.manifest_file)
+        manifest[os.path.normpath(self.output_file)] = self.fingerprint()
+        save_manifest(self.manifest_file, manifest)
+    
+    def process_file(self, categorized: Optional[Dict[str, dict]] = None) -> dict:
+        """
+        JSON dosyasını yükler, tüm burçları işler ve sonucu kaydeder.
+        categorized verilirse (genel metni -> kategoriler, örn. worker süreçlerinden)
+        oradaki metinler yeniden kategorize edilmez.
+        """
+        print(f"Dosya okunuyor: {self.input_file}")
+        data = self.load_input()
         
         stats = {
             'total_sources': 0,
             'total_signs': 0,
             'categorized': {'love': 0, 'money': 0, 'health': 0}
         }
+        self._categorized.clear()
+        if categorized:
+            self._categorized.update(categorized)
+        # Tekrar eden genel metinleri: kopya hücre -> asıl hücre
+        shared = content_index.shared_refs(content_index.load(str(self.input_file), 'raw', data), 'genel')
+        # asıl hücre -> kategorize sonucu (kopya hücrelere dağıtılır)
+        cell_results = {}
+        fanned = 0
+        stem_before = self.stem_cache.stats()
+        
+        if self.engine == 'vectorized':
+            # Dosyanın henüz kategorize edilmemiş tüm metinleri tek grupta (tek matris çarpımı)
+            pending = list(dict.fromkeys(
+                sign_data['genel']
+                for source_name, source_data in data.items()
+                for sign_name, sign_data in source_data.items()
+                if sign_data.get('genel') and sign_data['genel'] != 'null'
+                and (source_name, sign_name, 'genel') not in shared
+                and sign_data['genel'] not in self._categorized
+            ))
+            self._categorized.update(zip(pending, self.categorize_texts(pending)))
         
         for source_name, source_data in data.items():
             stats['total_sources'] += 1
@@ -218,8 +501,22 @@ class HoroscopeCategorizer:
             
             for sign_name, sign_data in source_data.items():
                 stats['total_signs'] += 1
+                ref = (source_name, sign_name, 'genel')
+                genel_text = sign_data.get('genel')
+                categorized = None
+                if genel_text and genel_text != 'null':
+                    canonical = shared.get(ref)
+                    # Tablo hash'e göre; sonuç ancak metin asıl hücreyle birebir aynıysa paylaşılır
+                    if canonical in cell_results and content_index.cell_text(data, canonical) == genel_text:
+                        categorized = cell_results[canonical]
+                        fanned += 1
+                    else:
+                        categorized = self._categorized.get(genel_text)
+                        if categorized is None:
+                            categorized = self.categorize_text(genel_text)
+                        cell_results[ref] = categorized
                 
-                processed_data = self.process_horoscope(sign_data)
+                processed_data = self.process_horoscope(sign_data, categorized)
                 
                 if processed_data.get('aşk') and processed_data['aşk'] != 'null':
                     stats['categorized']['love'] += 1
@@ -230,15 +527,32 @@ class HoroscopeCategorizer:
                 
                 data[source_name][sign_name] = processed_data
         
+        self.stem_cache.save()
+        stem_stats = {key: value - stem_before[key]
+                      for key, value in self.stem_cache.stats().items()}
+        
         print(f"\nSonuç kaydediliyor: {self.output_file}")
         with open(self.output_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
         
+        db_path = storage.db_path()
+        date = storage.date_from_path(str(self.input_file))
+        if db_path and date:
+            rows = storage.write_texts(db_path, 'processed', date, data)
+            print(f"Depoya yazıldı: {db_path} ({rows} satır)")
+        
+        # Kategorizasyonla oluşan metinler de skorlama / özetleme için tabloya
+        content_index.write(str(self.output_file), 'processed', data)
+        self.record_fingerprint()
+        
         print("\n" + "="*50)
         print("İşleme İstatistikleri")
         print("="*50)
         print(f"Toplam Kaynak: {stats['total_sources']}")
         print(f"Toplam Burç: {stats['total_signs']}")
+        print(f"Tekrar Eden Metin: {fanned} hücre (bir kez kategorize edildi)")
+        if stem_stats['lookups']:
+            print_stem_stats(stem_stats)
         print(f"\nKategorize Edilen:")
         print(f"  Aşk: {stats['categorized']['love']}")
         print(f"  Para: {stats['categorized']['money']}")
@@ -248,22 +562,183 @@ class HoroscopeCategorizer:
         return data
 
 
+def file_hash(path) -> str:
+    """Dosya içeriğinin kısa hash'i"""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()[:16]
+
+
+def load_manifest(manifest_path=DEFAULT_MANIFEST) -> Dict[str, dict]:
+    """Çıktı dosyası yolu -> parmak izi; manifest yoksa boş dict"""
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest_path, manifest: Dict[str, dict]):
+    """Manifest'i kaydeder (önce geçici dosyaya)"""
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(manifest.items())), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def select_inputs(data_dir: str, pattern: Optional[str] = None, date_from: Optional[str] = None,
+                  date_to: Optional[str] = None) -> List[str]:
+    """
+    Toplu işlenecek daily_raw dosyaları (tarih sırasıyla): pattern verilirse ona uyanlar,
+    yoksa data_dir'deki tüm daily_raw_*.json; date_from / date_to (dahil) ile süzülür.
+    """
+    files = glob.glob(pattern or os.path.join(data_dir, 'daily_raw_*.json'))
+    selected = []
+    for path in files:
+        date = storage.date_from_path(path)
+        if date_from and (not date or date < date_from):
+            continue
+        if date_to and (not date or date > date_to):
+            continue
+        selected.append(path)
+    return sorted(selected, key=lambda path: (storage.date_from_path(path) or '', path))
+
+
+def print_stem_stats(stem_stats: Dict[str, int], label: str = "Kök Önbelleği"):
+    """Kök önbelleği isabet oranı satırı"""
+    hits = stem_stats['memory_hits'] + stem_stats['stored_hits']
+    hit_rate = hits / stem_stats['lookups'] * 100 if stem_stats['lookups'] else 0
+    print(f"{label}: %{hit_rate:.1f} isabet ({stem_stats['lookups']} kelime, "
+          f"bellek {stem_stats['memory_hits']}, dosya {stem_stats['stored_hits']}, "
+          f"stemmer {stem_stats['stemmed']})")
+
+
+# ==================== PARALEL KATEGORİZASYON ====================
+
+# Her worker sürecinin kendi categorizer'ı (stemmer ve önbellekler süreç başına bir kez kurulur)
+_worker_categorizer = None
+
+
+def _init_worker(stem_cache_file: Optional[str], stem_cache_size: int, engine: str):
+    global _worker_categorizer
+    _worker_categorizer = HoroscopeCategorizer(stem_cache_file=stem_cache_file,
+                                               stem_cache_size=stem_cache_size, engine=engine)
+
+
+def _categorize_in_worker(genel_text: str) -> Tuple[dict, Dict[str, int], Dict[str, str]]:
+    """Worker'da bir metni kategorize eder: (kategoriler, kök istatistikleri, yeni kökler)"""
+    stem_cache = _worker_categorizer.stem_cache
+    before = stem_cache.stats()
+    categorized = _worker_categorizer.categorize_text(genel_text)
+    stem_stats = {key: value - before[key] for key, value in stem_cache.stats().items()}
+    return categorized, stem_stats, stem_cache.take_new()
+
+
+def categorize_parallel(categorizer: HoroscopeCategorizer, files: List[Tuple[str, Optional[str]]],
+                        workers: int) -> Dict[str, dict]:
+    """
+    Dosyalardaki (kaynak, burç) 'genel' metinlerini workers süreçte kategorize eder.
+    Aynı metin (farklı site/burç/gün) bir kez gönderilir. Sonuçlar metin -> kategoriler
+    olarak döner ve process_file'a verilir; dosyalar yine sırayla, aynı sırada yazılır,
+    bu yüzden çıktı tek süreçli çalıştırmayla aynıdır. Worker'larda bulunan yeni kökler
+    categorizer'ın kalıcı kök sözlüğüne eklenir.
+    """
+    texts = {}
+    for input_file, output_file in files:
+        categorizer.set_files(input_file, output_file)
+        data = categorizer.load_input()
+        # Dosyanın kopya hücreleri gönderilmez (process_file asıl hücrenin sonucunu dağıtır)
+        shared = content_index.shared_refs(content_index.load(input_file, 'raw', data), 'genel')
+        for source_name, source_data in data.items():
+            for sign_name, sign_data in source_data.items():
+                genel_text = sign_data.get('genel')
+                if genel_text and genel_text != 'null' and (source_name, sign_name, 'genel') not in shared:
+                    texts[genel_text] = None
+    
+    stem_cache = categorizer.stem_cache
+    totals = {key: 0 for key in stem_cache.stats()}
+    chunksize = max(1, len(texts) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(stem_cache.path, stem_cache.maxsize,
+                                       categorizer.engine)) as executor:
+        results = executor.map(_categorize_in_worker, texts, chunksize=chunksize)
+        for genel_text, (categorized, stem_stats, new_stems) in zip(list(texts), results):
+            texts[genel_text] = categorized
+            stem_cache.merge(new_stems)
+            for key, value in stem_stats.items():
+                totals[key] += value
+    
+    print(f"{len(files)} dosyada {len(texts)} farklı metin {workers} süreçte kategorize edildi")
+    print_stem_stats(totals, "Kök Önbelleği (worker'lar)")
+    return texts
+
+
 def main():
-    import sys
+    parser = argparse.ArgumentParser(description='Burç yorumlarını aşk / para / sağlık kategorilerine ayırır')
+    parser.add_argument('inputs', nargs='*',
+                        help='daily_raw JSON dosyaları (varsayılan: bugünün dosyası)')
+    parser.add_argument('-o', '--output', help='Çıktı dosyası (tek girdi için)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Kategorizasyon için süreç sayısı (varsayılan: 1, 0: CPU sayısı)')
+    parser.add_argument('--engine', choices=ENGINES, default='python',
+                        help='Kök eşleştirme motoru: cümle başına küme kesişimi (python) ya da '
+                             'dosyanın tüm cümleleri için tek seyrek matris çarpımı (vectorized)')
+    batch = parser.add_argument_group('toplu yeniden işleme')
+    batch.add_argument('--glob', help="İşlenecek dosyaların deseni (örn. 'data/daily_raw_2025-11-*.json')")
+    batch.add_argument('--from', dest='date_from', metavar='YYYY-MM-DD', help='Başlangıç tarihi (dahil)')
+    batch.add_argument('--to', dest='date_to', metavar='YYYY-MM-DD', help='Bitiş tarihi (dahil)')
+    batch.add_argument('--data-dir', default='data', help='--from/--to için klasör (varsayılan: data)')
+    batch.add_argument('--force', action='store_true',
+                       help='Girdisi ve keyword ayarları değişmemiş dosyaları da yeniden işle')
+    args = parser.parse_args()
     
-    if len(sys.argv) > 1:
-        input_file = sys.argv[1]
-    else:
+    inputs = args.inputs
+    is_batch = bool(args.glob or args.date_from or args.date_to)
+    if is_batch:
+        inputs = list(dict.fromkeys(
+            inputs + select_inputs(args.data_dir, args.glob, args.date_from, args.date_to)))
+        if not inputs:
+            print("Seçilen aralıkta daily_raw dosyası bulunamadı.")
+            sys.exit(1)
+    elif not inputs:
         today = datetime.now().strftime('%Y-%m-%d')
-        input_file = f"data/daily_raw_{today}.json"
+        inputs = [f"data/daily_raw_{today}.json"]
+    
+    # Eski kullanım: python categorize_horoscopes.py input.json output.json
+    if len(inputs) == 2 and not args.output and not is_batch \
+            and not os.path.basename(inputs[1]).startswith('daily_raw_'):
+        inputs, args.output = inputs[:1], inputs[1]
+    if args.output and len(inputs) > 1:
+        parser.error('-o/--output sadece tek girdi dosyasıyla kullanılabilir')
+    
+    files = [(input_file, args.output) for input_file in inputs]
+    workers = args.workers or os.cpu_count()
+    
+    categorizer = HoroscopeCategorizer(engine=args.engine)
+    if is_batch and not args.force:
+        # Son çıktıdan beri girdisi ve keyword ayarları değişmeyenleri atla
+        pending = []
+        for input_file, output_file in files:
+            categorizer.set_files(input_file, output_file)
+            if not categorizer.is_up_to_date():
+                pending.append((input_file, output_file))
+        print(f"{len(files)} dosyadan {len(files) - len(pending)} tanesi güncel, atlanıyor")
+        files = pending
     
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    categorized = None
+    if workers > 1 and files:
+        categorized = categorize_parallel(categorizer, files, workers)
     
-    categorizer = HoroscopeCategorizer(input_file, output_file)
-    categorizer.process_file()
+    output_files = []
+    for input_file, output_file in files:
+        categorizer.set_files(input_file, output_file)
+        categorizer.process_file(categorized)
+        output_files.append(categorizer.output_file)
     
     print(f"\nİşlem tamamlandı!")
-    print(f"Çıktı dosyası: {categorizer.output_file}")
+    for output_file in output_files:
+        print(f"Çıktı dosyası: {output_file}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+"""
+AIstrolog - İçerik Hash Tablosu
+Aynı burç yorumu çoğu zaman birden fazla sitede (ya da aynı sitede birden fazla
+burç/kategori hücresinde) birebir yayımlanır. Scraper günün ham verisini kaydederken
+boşlukları normalize edilmiş metnin hash'ine göre (textnorm.content_hash) tekrar eden
+hücreleri bu tabloya yazar; kategorizasyon, skorlama ve özetleme tekrar eden her metni
+bir kez işleyip sonucu tablodaki diğer hücrelere dağıtır.
+
+Dosya: data/content_index_YYYY-MM-DD.json (daily_raw dosyasının yanında, tek satır JSON)
+    {"date": "2025-12-04",
+     "raw":       {"<hash>": [["milliyet", "Koç", "genel"], ["elele", "Koç", "genel"]], ...},
+     "processed": {"<hash>": [...]}}
+
+Sadece birden fazla hücrede geçen metinler yazılır; tabloda olmayan hücre tektir. Her
+listenin ilk hücresi metnin asıl kaydıdır. 'raw' bölümünü scraper, kategorizasyonla
+yeni metinler oluştuğu için 'processed' bölümünü categorizer yazar. Tablo yoksa (eski
+günler) aynı tablo veriden bellekte üretilir.
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import storage
+from textnorm import content_hash
+
+# Hücre referansı: (site, burç, kategori)
+Ref = Tuple[str, str, str]
+
+
+def build(data: Dict) -> Dict[str, List[List[str]]]:
+    """
+    site -> burç -> kategori -> metin verisinden tekrar eden metinlerin tablosu:
+    hash -> [[site, burç, kategori], ...] (hücreler verideki sırayla)
+    """
+    refs: Dict[str, List[List[str]]] = {}
+    for site_name, site_data in data.items():
+        for burc_name, categories in (site_data or {}).items():
+            for category, text in (categories or {}).items():
+                if text and text != 'null':
+                    refs.setdefault(content_hash(text), []).append([site_name, burc_name, category])
+    return {text_hash: cells for text_hash, cells in refs.items() if len(cells) > 1}
+
+
+def index_path(data_file: str) -> Optional[str]:
+    """Veri dosyasının (daily_raw_ / processed_ ...) gününe ait tablo dosyası"""
+    date = storage.date_from_path(str(data_file))
+    if not date:
+        return None
+    return os.path.join(os.path.dirname(str(data_file)), f"content_index_{date}.json")
+
+
+def _read(path: str) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write(data_file: str, stage: str, data: Dict) -> Dict[str, List[List[str]]]:
+    """
+    Aşamanın ('raw' / 'processed') bölümünü veri dosyasının yanındaki tabloya yazar
+    ve yazılan bölümü döner (dosya adında tarih yoksa sadece döner)
+    """
+    section = build(data)
+    path = index_path(data_file)
+    if not path:
+        return section
+    index = _read(path)
+    index['date'] = storage.date_from_path(str(data_file))
+    index[stage] = section
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+    return section
+
+
+def load(data_file: str, stage: str, data: Dict) -> Dict[str, List[List[str]]]:
+    """Aşamanın tablosunu okur; dosyada yoksa veriden üretir"""
+    path = index_path(data_file)
+    section = _read(path).get(stage) if path else None
+    return build(data) if section is None else section
+
+
+def shared_refs(index: Dict[str, List[List[str]]], category: Optional[str] = None) -> Dict[Ref, Ref]:
+    """
+    Tablodaki kopya hücre -> metnin asıl hücresi (asıl hücrelerin kendisi yer almaz).
+    category verilirse sadece o kategorinin hücreleri arasında eşlenir (örn. 'genel').
+    """
+    shared = {}
+    for cells in index.values():
+        cells = [tuple(cell) for cell in cells if category is None or cell[2] == category]
+        for cell in cells[1:]:
+            shared[cell] = cells[0]
+    return shared
+
+
+def cell_text(data: Dict, ref: Ref) -> Optional[str]:
+    """Hücrenin metni (site, burç ya da kategori yoksa None)"""
+    site_name, burc_name, category = ref
+    return ((data.get(site_name) or {}).get(burc_name) or {}).get(category)
@@ -0,0 +1,966 @@
+"""
+AIstrolog - HTTP Fetch Katmanı
+Tüm scraper fonksiyonlarının ortak kullandığı istek katmanı.
+
+- Tüm isteklerin geçtiği ortak, bağlantı havuzlu requests.Session (keep-alive)
+- Host bazlı token-bucket hız limiti (aynı siteye kibar istek aralığı)
+- Host bazlı üstel geri çekilmeli (jitter'lı) tekrar deneme ve devre kesici
+  (art arda hata veren host'a çalıştırmanın geri kalanında istek atılmaz)
+- Global eş zamanlı istek sınırı
+- ETag/Last-Modified ile koşullu istek yapan, TTL'li disk cache (HttpCache)
+- İndirilen sayfaların site/anahtar/tarih bazında snapshot'lanması ve ağa
+  çıkmadan snapshot'lardan yeniden oynatılması (replay)
+- asyncio ile aynı siteye giden çoklu isteklerin (örn. 12 burç sayfası) paralel çekilmesi
+- Her isteğin aşama süreleri (bekleme, bağlantı, TLS, TTFB, indirme); response.timings
+- Akış halinde indirme: gövde parça parça artımlı parser'a verilir, hedef
+  container kapanınca indirme kesilir (stream_until)
+- Base URL yönlendirmesi: istekler sitelerin yerine replay_server.py gibi yerel
+  bir sunucuya gönderilir (hız limiti, cache ve snapshot anahtarları orijinal URL'dir)
+"""
+
+import asyncio
+import contextvars
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from snapshots import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan istek zaman aşımı (saniye)
+DEFAULT_TIMEOUT = 10
+
+# Tüm siteler toplamında aynı anda uçuşta olabilecek istek sayısı
+MAX_CONCURRENT_REQUESTS = 8
+
+# Host bazlı ayarlar
+#   rate:      saniyede dolan token (istek/sn)
+#   burst:     art arda beklemeden atılabilecek istek sayısı
+#   pool_size: host için açık tutulacak keep-alive bağlantı sayısı
+#   retries:   bağlantı hatası / 429 / 5xx durumunda tekrar deneme sayısı
+#   backoff:   ilk tekrar denemeden önceki en uzun bekleme (saniye); her denemede
+#              iki katına çıkar, gerçek bekleme 0 ile bu değer arasında rastgeledir
+#   backoff_max: tek bir beklemenin üst sınırı (Retry-After header'ı için de geçerli)
+#   breaker_threshold: host'un devre kesicisini açan ardışık hata sayısı
+#   timeout:   istek zaman aşımı (saniye)
+#   cache_ttl: cache'teki sayfanın sunucuya hiç sorulmadan kullanılacağı süre (saniye);
+#              süre dolunca ETag/Last-Modified ile koşullu istek atılır
+DEFAULT_HOST_CONFIG = {
+    'rate': 0.5,
+    'burst': 1,
+    'pool_size': 2,
+    'retries': 2,
+    'backoff': 0.5,
+    'backoff_max': 8.0,
+    'breaker_threshold': 3,
+    'timeout': DEFAULT_TIMEOUT,
+    'cache_ttl': 900,
+}
+
+HOST_CONFIG = {
+    # Burç başına ayrı sayfa çekilen siteler (12 istek)
+    'www.milliyet.com.tr': {'rate': 1.0, 'burst': 3, 'pool_size': 4},
+    'www.elele.com.tr': {'rate': 1.0, 'burst': 3, 'pool_size': 4},
+    'www.mynet.com': {'rate': 1.0, 'burst': 3, 'pool_size': 4},
+    'twitburc.com.tr': {'rate': 1.0, 'burst': 3, 'pool_size': 4},
+    'www.gunlukburc.net': {'rate': 1.0, 'burst': 3, 'pool_size': 4},
+    'www.myburc.com': {'rate': 1.0, 'burst': 3, 'pool_size': 4},
+    # Kategori başına bir sayfa (4 istek)
+    'onedio.com': {'rate': 0.5, 'burst': 2, 'pool_size': 2},
+    # Tek sayfalık siteler
+    'www.hurriyet.com.tr': {'pool_size': 1},
+    'hthayat.haberturk.com': {'pool_size': 1},
+    'vogue.com.tr': {'pool_size': 1},
+}
+
+# Retry edilecek HTTP durum kodları
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# HTTP cache klasörü ve bu süreden eski kayıtların temizlenme yaşı (saniye)
+CACHE_DIR = ".cache/http"
+CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Akış halinde indirmede parser'a verilen parça boyutu (byte)
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Cache kaydında saklanan response header'ları
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+# User agent listesi
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+]
+
+
+def get_random_headers() -> Dict[str, str]:
+    """Random user agent döner - Accept-Encoding REMOVED to avoid brotli issues"""
+    return {
+        'User-Agent': random.choice(USER_AGENTS),
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
+        # NOTE: Accept-Encoding removed - requests will handle this automatically
+        # and some sites (like elele.com.tr) return broken brotli when we set it
+        'Connection': 'keep-alive',
+    }
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    reserve() bir token ayırır ve isteğin atılabilmesi için beklenmesi gereken
+    süreyi döner. Token'lar eksiye düşebildiği için bekleyenler geliş sırasına
+    göre eşit aralıklarla sıraya girer.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def acquire(self):
+        """Token alınana kadar bloklar"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class HttpCache:
+    """
+    URL bazlı disk cache.
+
+    Her kayıt iki dosyadan oluşur: <sha1>.json (url, validator'lar, kaydedilme
+    zamanı) ve <sha1>.html.gz (sıkıştırılmış gövde). Scraper sayfanın parse
+    sonucunu da <sha1>.parsed.json olarak yanına yazar. Yazmalar geçici dosya +
+    os.replace ile atomiktir, bu yüzden paralel scraper thread'leri güvenle
+    kullanabilir.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        base = self._base(url)
+        return base + '.json', base + '.html.gz'
+
+    def _base(self, url: str) -> str:
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key)
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url: str) -> Optional[Tuple[Dict, bytes]]:
+        """Kayıt varsa (meta, gövde) döner"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with gzip.open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def put(self, url: str, response: requests.Response, partial: bool = False) -> Dict:
+        """
+        200 dönen response'u cache'e yazar. partial=True ise gövde stream_until ile
+        kesilmiştir; kayıt işaretlenir ve sadece aynı şekilde akış halinde okuyan
+        çağıranlara verilir (bkz. _usable).
+        """
+        meta_path, body_path = self._paths(url)
+        meta = {
+            'url': url,
+            'stored_at': time.time(),
+            'headers': {k: response.headers[k] for k in CACHED_HEADERS if k in response.headers},
+        }
+        if partial:
+            meta['partial'] = True
+        self._write_atomic(body_path, gzip.compress(response.content))
+        self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+        return meta
+
+    def touch(self, url: str, meta: Dict):
+        """304 sonrası kaydın tazelik süresini yeniler"""
+        meta_path, _ = self._paths(url)
+        meta = dict(meta, stored_at=time.time())
+        self._write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def get_parsed(self, url: str, fingerprint: str) -> Optional[Dict]:
+        """
+        Sayfanın kayıtlı parse sonucunu döner. fingerprint (gövde + parser sürümü)
+        eşleşmiyorsa None döner; sonuç {'result': ...} içinde saklanır.
+        """
+        try:
+            with open(self._base(url) + '.parsed.json', 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('fingerprint') == fingerprint else None
+
+    def put_parsed(self, url: str, fingerprint: str, result):
+        """Sayfanın parse sonucunu gövde fingerprint'i ile birlikte kaydeder"""
+        entry = {'fingerprint': fingerprint, 'result': result}
+        self._write_atomic(self._base(url) + '.parsed.json',
+                           json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+    def prune(self, max_age: float = CACHE_MAX_AGE) -> int:
+        """
+        max_age'den uzun süredir tazelenmemiş kayıtları siler. Kaydın yaşı meta
+        dosyasındaki stored_at'ten alınır (304 ile tazelenen kayıtta sadece meta
+        yeniden yazılır); gövde, meta ve parse sonucu birlikte silinir. Meta'sı
+        olmayan ya da okunamayan dosyalar ve geçici dosyalar kendi mtime'larına
+        göre silinir. Silinen kayıt sayısını döner.
+        """
+        removed = 0
+        cutoff = time.time() - max_age
+        entries: Dict[str, List[str]] = {}
+        for name in os.listdir(self.cache_dir):
+            entries.setdefault(name.split('.', 1)[0], []).append(os.path.join(self.cache_dir, name))
+
+        for key, paths in entries.items():
+            meta_path = os.path.join(self.cache_dir, key + '.json')
+            try:
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    stored_at = json.load(f)['stored_at']
+            except (OSError, ValueError, KeyError, TypeError):
+                stored_at = None
+            if stored_at is not None and stored_at < cutoff:
+                expired = paths
+            else:
+                # Taze kayıtta sadece yarım kalmış yazmaların eski geçici dosyaları silinir
+                expired = [path for path in paths
+                           if (stored_at is None or path.endswith('.tmp'))
+                           and os.path.getmtime(path) < cutoff]
+            for path in expired:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+            if expired:
+                removed += 1
+        return removed
+
+
+# İsteği atan thread'de bağlantı aşamalarının ölçümleri. Session.get aynı thread'de
+# çalıştığı için _send ölçümü sıfırlayıp istek bitince buradan okur.
+_timing = threading.local()
+
+
+class _TimedConnectionMixin:
+    """
+    urllib3 bağlantısının aşamalarını _timing'e yazar.
+    _new_conn DNS çözümleme + TCP bağlantısını birlikte yapar (ayrı ölçülemez);
+    connect() ile arasındaki fark HTTPS'te TLS el sıkışmasıdır. Keep-alive ile
+    yeniden kullanılan bağlantıda bu iki süre 0 kalır.
+    """
+
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _timing.connect = time.perf_counter() - start
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            elapsed = time.perf_counter() - start
+            _timing.tls = max(0.0, elapsed - getattr(_timing, 'connect', 0.0))
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        # Status satırı ve header'lar okundu: ilk byte geldi
+        _timing.headers_at = time.perf_counter()
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Bağlantı havuzlarını süre ölçen bağlantı sınıflarıyla kuran adapter"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def _network_timings(start: float, end: float) -> Dict:
+    """_timing'deki ölçümlerden isteğin aşama sürelerini (ms) hesaplar"""
+    connect = getattr(_timing, 'connect', 0.0)
+    tls = getattr(_timing, 'tls', 0.0)
+    headers_at = getattr(_timing, 'headers_at', end)
+    return {
+        'connect_ms': _ms(connect),
+        'tls_ms': _ms(tls),
+        'ttfb_ms': _ms(max(0.0, headers_at - start - connect - tls)),
+        'download_ms': _ms(max(0.0, end - headers_at)),
+        'total_ms': _ms(end - start),
+    }
+
+
+def _stream_watcher(rule: Dict) -> Callable[[bytes], bool]:
+    """
+    stream_until kuralı için, her gelen parçayı artımlı HTML parser'a veren ve
+    indirmenin durdurulabileceği anda True dönen fonksiyon oluşturur.
+
+    Kural alanları:
+        tag:      (opsiyonel) izlenecek element etiketi, örn. 'figcaption'
+        class:    (opsiyonel) elementte bulunması gereken class
+        count:    (opsiyonel) kapanması gereken eşleşen element sayısı
+        text_all: (opsiyonel) derlenmiş regex listesi; kapanan eşleşen elementlerin
+                  metinlerinde hepsi görülene kadar indirme sürer
+    """
+    parser = etree.HTMLPullParser(events=('end',), tag=rule.get('tag'), encoding='utf-8')
+    wanted_class = rule.get('class')
+    count = rule.get('count', 1)
+    pending = list(rule.get('text_all', ()))
+    matched = 0
+
+    def feed(chunk: bytes) -> bool:
+        nonlocal matched, pending
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if wanted_class and wanted_class not in (element.get('class') or '').split():
+                continue
+            matched += 1
+            if pending:
+                text = ' '.join(element.itertext())
+                pending = [pattern for pattern in pending if not pattern.search(text)]
+            if matched >= count and not pending:
+                return True
+        return False
+
+    return feed
+
+
+def _read_until(response: requests.Response, rule: Dict) -> bool:
+    """
+    stream=True ile açılmış response'un gövdesini kural sağlanana kadar okur.
+    Kural sağlanınca bağlantı kapatılır (kalan gövde indirilmez) ve okunan
+    kısım response.content olur. Kural hiç sağlanmazsa gövdenin tamamı okunur.
+
+    Returns:
+        İndirme erken kesildiyse True
+    """
+    done = _stream_watcher(rule)
+    chunks = []
+    stopped = False
+    for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+        chunks.append(chunk)
+        try:
+            stopped = done(chunk)
+        except etree.Error:
+            # Parser hata verirse sayfanın tamamı indirilir
+            done = lambda _chunk: False
+        if stopped:
+            break
+    response._content = b''.join(chunks)
+    response._content_consumed = True
+    if stopped:
+        response.close()
+    return stopped
+
+
+class CircuitBreaker:
+    """
+    Host bazlı devre kesici. Ardışık threshold kadar başarısız denemeden sonra
+    açılır ve çalıştırmanın geri kalanında o host'a istek atılmasını engeller;
+    böylece çökmüş bir site her sayfası için zaman aşımı beklemez.
+    Başarılı her yanıt ardışık hata sayacını sıfırlar.
+    """
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.consecutive_failures = 0
+        self.failures = 0
+        self.successes = 0
+        self.rejected = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """İstek atılabilir mi; açıksa reddedilen istek sayılır"""
+        with self._lock:
+            if self.is_open:
+                self.rejected += 1
+                return False
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+
+    def record_failure(self, error: str) -> bool:
+        """Başarısız denemeyi kaydeder; devre bu çağrıyla açıldıysa True döner"""
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = error
+            if not self.is_open and self.consecutive_failures >= self.threshold:
+                self.opened_at = time.time()
+                return True
+            return False
+
+    def state(self) -> Dict:
+        with self._lock:
+            return {
+                'state': 'open' if self.is_open else 'closed',
+                'successes': self.successes,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'last_error': self.last_error,
+            }
+
+
+class CircuitOpenError(requests.RequestException):
+    """Host'un devre kesicisi açık; istek atılmadan reddedildi"""
+
+
+class SnapshotMissing(Exception):
+    """Replay modunda istenen sayfanın snapshot'ı bulunamadı"""
+
+
+def _stored_response(url: str, body: bytes, headers: Optional[Dict] = None,
+                     source: str = 'cache') -> requests.Response:
+    """Diskte saklanan gövdeden (cache ya da snapshot) requests.Response oluşturur"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = body
+    response.encoding = 'utf-8'
+    response.from_cache = True
+    response.timings = {'source': source}
+    return response
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_cache: Optional[HttpCache] = None
+_snapshots: Optional[SnapshotStore] = None
+_replay = False
+_base_url: Optional[str] = None
+
+# O an scrape edilen site (snapshot anahtarı için); site thread'i içinde set edilir,
+# asyncio task'ları ve to_thread çağrıları context'i kopyaladığı için onlara da geçer
+_current_site: contextvars.ContextVar = contextvars.ContextVar('current_site', default=None)
+
+# Geçmiş gün çekilirken (backfill) snapshot'ların yazılacağı gün; boşsa deponun günü
+_current_day: contextvars.ContextVar = contextvars.ContextVar('current_day', default=None)
+_day_stores: Dict[str, SnapshotStore] = {}
+_day_stores_lock = threading.Lock()
+
+
+def configure(max_concurrent: Optional[int] = None,
+              cache_dir: Optional[str] = None,
+              snapshot_store: Optional[SnapshotStore] = None,
+              replay: bool = False,
+              base_url: Optional[str] = None):
+    """
+    Global ayarları değiştirir (scraper başlamadan önce çağrılmalı).
+
+    Args:
+        max_concurrent: Aynı anda açık olabilecek istek sayısı
+        cache_dir: HTTP cache klasörü; None verilirse cache kapalıdır
+        snapshot_store: İndirilen sayfaların kaydedileceği snapshot deposu
+        replay: True ise ağa hiç çıkılmaz, sayfalar snapshot_store'dan okunur
+        base_url: Verilirse https://host/path istekleri base_url/host/path adresine
+                  gönderilir (örn. http://127.0.0.1:8765, bkz. replay_server.py)
+    """
+    global _request_slots, _cache, _snapshots, _replay, _base_url
+    if replay and snapshot_store is None:
+        raise ValueError("Replay modu için snapshot_store gerekli")
+    if max_concurrent:
+        _request_slots = threading.BoundedSemaphore(max_concurrent)
+    _cache = HttpCache(cache_dir) if cache_dir else None
+    _snapshots = snapshot_store
+    _replay = replay
+    base_url = base_url.rstrip('/') if base_url else None
+    if base_url != _base_url:
+        # Base URL havuzu Session oluşturulurken mount edilir
+        _base_url = base_url
+        close_session()
+    # Devre kesiciler çalıştırma bazlıdır
+    with _breakers_lock:
+        _breakers.clear()
+
+
+@contextmanager
+def site_context(site: str):
+    """Blok içindeki isteklerin hangi siteye ait olduğunu işaretler"""
+    token = _current_site.set(site)
+    try:
+        yield
+    finally:
+        _current_site.reset(token)
+
+
+@contextmanager
+def snapshot_day(date: str):
+    """Blok içinde indirilen sayfaların snapshot'larını verilen günün (YYYY-MM-DD) altına yazar"""
+    token = _current_day.set(date)
+    try:
+        yield
+    finally:
+        _current_day.reset(token)
+
+
+def _active_snapshots() -> Optional[SnapshotStore]:
+    """O anki isteğin snapshot deposu (snapshot_day bloğunda o günün deposu)"""
+    day = _current_day.get()
+    if _snapshots is None or day is None or day == _snapshots.date:
+        return _snapshots
+    # Aynı günün manifest yazımları tek bir deponun kilidinden geçsin
+    with _day_stores_lock:
+        store = _day_stores.get(day)
+        if store is None or store.root != _snapshots.root:
+            store = SnapshotStore(_snapshots.root, day)
+            _day_stores[day] = store
+        return store
+
+
+def get_cache() -> Optional[HttpCache]:
+    """Aktif HTTP cache'i döner (kapalıysa None)"""
+    return _cache
+
+
+def get_host_config(host: str) -> Dict:
+    """Host için ayarları döner, tanımlı değilse varsayılanları kullanır"""
+    config = dict(DEFAULT_HOST_CONFIG)
+    config.update(HOST_CONFIG.get(host, {}))
+    return config
+
+
+def get_bucket(host: str) -> TokenBucket:
+    """Host'a ait token bucket'ı döner (yoksa oluşturur)"""
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            config = get_host_config(host)
+            bucket = TokenBucket(config['rate'], config['burst'])
+            _buckets[host] = bucket
+        return bucket
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Host'a ait devre kesiciyi döner (yoksa oluşturur)"""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(get_host_config(host)['breaker_threshold'])
+            _breakers[host] = breaker
+        return breaker
+
+
+def breaker_states() -> Dict[str, Dict]:
+    """Bu çalıştırmada istek atılan host'ların devre kesici durumları"""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {host: breaker.state() for host, breaker in sorted(breakers.items())}
+
+
+def _make_adapter(config: Dict) -> HTTPAdapter:
+    """
+    Host ayarlarına göre bağlantı havuzlu adapter oluşturur. Tekrar denemeler
+    urllib3'te değil fetch seviyesinde (_fetch_with_retry) yapılır, böylece her
+    deneme hız limitine ve devre kesiciye tabidir.
+    """
+    return TimedHTTPAdapter(pool_connections=1, pool_maxsize=config['pool_size'], max_retries=0)
+
+
+def get_session() -> requests.Session:
+    """
+    Tüm scraper'ların paylaştığı Session'ı döner (ilk çağrıda oluşturur).
+    HOST_CONFIG'teki her host için ayrı boyutlu bir bağlantı havuzu mount edilir,
+    böylece aynı siteye giden istekler sıcak keep-alive bağlantıları yeniden kullanır.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            default_adapter = _make_adapter(DEFAULT_HOST_CONFIG)
+            session.mount('https://', default_adapter)
+            session.mount('http://', default_adapter)
+            for host in HOST_CONFIG:
+                adapter = _make_adapter(get_host_config(host))
+                session.mount(f'https://{host}/', adapter)
+                session.mount(f'http://{host}/', adapter)
+            if _base_url:
+                # Tüm siteler tek sunucuya gider; havuz, sitelerin havuzlarının toplamı kadar
+                pool_size = sum(get_host_config(host)['pool_size'] for host in HOST_CONFIG)
+                session.mount(f'{_base_url}/', _make_adapter(dict(DEFAULT_HOST_CONFIG, pool_size=pool_size)))
+            _session = session
+        return _session
+
+
+def close_session():
+    """Paylaşılan Session'ı ve açık bağlantıları kapatır"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def _rewrite_url(url: str) -> str:
+    """Base URL tanımlıysa https://host/path adresini base_url/host/path'e çevirir"""
+    if not _base_url:
+        return url
+    parsed = urlparse(url)
+    rewritten = f"{_base_url}/{parsed.netloc}{parsed.path or '/'}"
+    return f"{rewritten}?{parsed.query}" if parsed.query else rewritten
+
+
+def _original_url(url: str) -> str:
+    """_rewrite_url'in tersi: yönlendirilmiş adresi sitenin https adresine çevirir"""
+    if _base_url and url.startswith(f'{_base_url}/'):
+        return 'https://' + url[len(_base_url) + 1:]
+    return url
+
+
+def _usable(cached: Optional[Tuple[Dict, bytes]],
+            stream_until: Optional[Dict]) -> Optional[Tuple[Dict, bytes]]:
+    """
+    Cache kaydı bu istek için kullanılabiliyorsa kaydı, yoksa None döner. Gövdesi
+    stream_until ile kesilmiş kayıt, sayfanın tamamını bekleyen (stream_until'siz)
+    çağırana ne doğrudan ne de 304 ile verilir.
+    """
+    if cached is None or (cached[0].get('partial') and stream_until is None):
+        return None
+    return cached
+
+
+def _fresh_from_cache(url: str, stream_until: Optional[Dict] = None) -> Optional[requests.Response]:
+    """TTL süresi dolmamış cache kaydı varsa ağa çıkmadan onu döner"""
+    if _cache is None:
+        return None
+    cached = _usable(_cache.get(url), stream_until)
+    if cached is None:
+        return None
+    meta, body = cached
+    ttl = get_host_config(urlparse(url).netloc)['cache_ttl']
+    if time.time() - meta['stored_at'] > ttl:
+        return None
+    return _stored_response(url, body, meta.get('headers'))
+
+
+def _send(url: str, timeout: Optional[float], stream_until: Optional[Dict] = None) -> requests.Response:
+    """
+    İsteği paylaşılan Session üzerinden, global eş zamanlılık sınırı içinde atar.
+    Cache'te kayıt varsa koşullu istek atılır; 304 gelirse gövde cache'ten okunur.
+    stream_until verilirse gövde akış halinde okunur ve kural sağlanınca kesilir;
+    bu durumda cache'e ve snapshot'a sayfanın okunan kısmı yazılır (cache kaydı
+    kısmi olarak işaretlenir, stream_until'siz isteklerde kullanılmaz).
+    """
+    config = get_host_config(urlparse(url).netloc)
+    headers = get_random_headers()
+
+    cached = _usable(_cache.get(url), stream_until) if _cache is not None else None
+    if cached is not None:
+        meta, body = cached
+        if 'ETag' in meta['headers']:
+            headers['If-None-Match'] = meta['headers']['ETag']
+        if 'Last-Modified' in meta['headers']:
+            headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+
+    queued_at = time.perf_counter()
+    with _request_slots:
+        _timing.__dict__.clear()
+        start = time.perf_counter()
+        response = get_session().get(_rewrite_url(url), headers=headers, timeout=timeout or config['timeout'],
+                                     stream=stream_until is not None)
+        truncated = False
+        if stream_until is not None and response.status_code == 200:
+            truncated = _read_until(response, stream_until)
+        else:
+            response.content  # stream=True ise gövdeyi burada oku
+        timings = _network_timings(start, time.perf_counter())
+    timings['slot_wait_ms'] = _ms(start - queued_at)
+
+    if response.status_code == 304 and cached is not None:
+        _cache.touch(url, meta)
+        stored = _stored_response(url, body, meta.get('headers'), source='revalidated')
+        stored.timings.update(timings, revalidated=True)
+        return stored
+
+    response.url = _original_url(response.url)
+    response.encoding = 'utf-8'
+    response.from_cache = False
+    response.timings = dict(timings, source='network')
+    if truncated:
+        response.timings['truncated'] = True
+        if 'Content-Length' in response.headers:
+            response.timings['content_length'] = int(response.headers['Content-Length'])
+    if _cache is not None and response.status_code == 200:
+        _cache.put(url, response, partial=truncated)
+    return response
+
+
+def _snapshot_key(url: str, key: Optional[str]) -> str:
+    """Snapshot anahtarı verilmemişse URL'den kısa bir hash üretir"""
+    return key or hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+
+
+def _from_snapshot(url: str, key: Optional[str]) -> requests.Response:
+    """Replay modunda sayfayı snapshot deposundan okur"""
+    site = _current_site.get() or 'misc'
+    store = _active_snapshots()
+    body = store.load(site, _snapshot_key(url, key))
+    if body is None:
+        raise SnapshotMissing(f"{store.date}/{site}/{_snapshot_key(url, key)} snapshot'ı yok ({url})")
+    return _stored_response(url, body, source='snapshot')
+
+
+def _record_snapshot(url: str, key: Optional[str], response: requests.Response):
+    """Başarılı response'un gövdesini snapshot deposuna yazar"""
+    store = _active_snapshots()
+    if store is None or response.status_code != 200:
+        return
+    site = _current_site.get() or 'misc'
+    try:
+        store.save(site, _snapshot_key(url, key), url, response.content)
+    except OSError as e:
+        logger.warning(f"Snapshot kaydedilemedi ({url}): {e}")
+
+
+def _backoff_delay(config: Dict, attempt: int, response: Optional[requests.Response] = None) -> float:
+    """
+    attempt. başarısız denemeden sonra beklenecek süre. Sunucu Retry-After
+    (saniye) gönderdiyse ona uyulur, yoksa üstel geri çekilme + tam jitter.
+    """
+    if response is not None:
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            return min(float(retry_after), config['backoff_max'])
+    return random.uniform(0, min(config['backoff_max'], config['backoff'] * 2 ** attempt))
+
+
+def _try_send(url: str, timeout: Optional[float],
+              stream_until: Optional[Dict] = None) -> Tuple[Optional[requests.Response], Optional[Exception]]:
+    """
+    Tek bir deneme yapar ve sonucu host'un devre kesicisine işler.
+    Bağlantı hatası ya da RETRY_STATUS_CODES'taki bir durum kodu başarısız
+    deneme sayılır; 404 gibi diğer yanıtlar host'un ayakta olduğunu gösterir.
+
+    Returns:
+        (response, hata); bağlantı hatasında response None'dır
+    """
+    host = urlparse(url).netloc
+    breaker = get_breaker(host)
+    try:
+        response = _send(url, timeout, stream_until)
+    except requests.RequestException as e:
+        response, error = None, e
+    else:
+        if response.status_code not in RETRY_STATUS_CODES:
+            breaker.record_success()
+            return response, None
+        error = requests.HTTPError(f"HTTP {response.status_code}", response=response)
+
+    if breaker.record_failure(f"{type(error).__name__}: {error}"):
+        logger.warning(f"🔌 {host} devre kesici açıldı: {breaker.threshold} ardışık hata ({error})")
+    return response, error
+
+
+def _finish(response: Optional[requests.Response], error: Optional[Exception],
+            attempts: int, rate_wait: float) -> requests.Response:
+    """Denemeler bitince son yanıtı döner ya da son hatayı yükseltir"""
+    if response is None:
+        raise error
+    # Tekrar denemeler tükendiyse 5xx/429 yanıtı yine de döner, scraper status'a bakar
+    response.timings.update(attempts=attempts, rate_wait_ms=_ms(rate_wait))
+    return response
+
+
+def _circuit_open(url: str) -> CircuitOpenError:
+    host = urlparse(url).netloc
+    return CircuitOpenError(f"{host} devre kesici açık, istek atılmadı ({get_breaker(host).last_error})")
+
+
+def _fetch_with_retry(url: str, timeout: Optional[float],
+                      stream_until: Optional[Dict] = None) -> requests.Response:
+    """Ağdan çeker: her deneme hız limitine uyar, hata olursa geri çekilip tekrar dener"""
+    host = urlparse(url).netloc
+    config = get_host_config(host)
+    response, error, rate_wait = None, None, 0.0
+
+    for attempt in range(config['retries'] + 1):
+        if not get_breaker(host).allow():
+            raise _circuit_open(url)
+        start = time.perf_counter()
+        get_bucket(host).acquire()
+        rate_wait += time.perf_counter() - start
+
+        response, error = _try_send(url, timeout, stream_until)
+        if error is None or attempt == config['retries']:
+            break
+        time.sleep(_backoff_delay(config, attempt, response))
+
+    return _finish(response, error, attempt + 1, rate_wait)
+
+
+async def _fetch_with_retry_async(url: str, timeout: Optional[float],
+                                  stream_until: Optional[Dict] = None) -> requests.Response:
+    """_fetch_with_retry'ın asyncio versiyonu - beklemeler event loop'u bloklamaz"""
+    host = urlparse(url).netloc
+    config = get_host_config(host)
+    response, error, rate_wait = None, None, 0.0
+
+    for attempt in range(config['retries'] + 1):
+        if not get_breaker(host).allow():
+            raise _circuit_open(url)
+        delay = get_bucket(host).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+            rate_wait += delay
+
+        response, error = await asyncio.to_thread(_try_send, url, timeout, stream_until)
+        if error is None or attempt == config['retries']:
+            break
+        await asyncio.sleep(_backoff_delay(config, attempt, response))
+
+    return _finish(response, error, attempt + 1, rate_wait)
+
+
+def fetch(url: str, key: Optional[str] = None, timeout: Optional[float] = None,
+          stream_until: Optional[Dict] = None) -> requests.Response:
+    """
+    URL'i çeker. Host hız limitine, global eş zamanlılık sınırına ve host'un
+    devre kesicisine uyar; geçici hatalarda geri çekilerek tekrar dener.
+    Dönen response'un encoding'i utf-8 olarak ayarlanır; from_cache alanı
+    gövdenin diskten (cache ya da snapshot) gelip gelmediğini gösterir.
+    timings alanı gövdenin kaynağını (network / revalidated / cache / snapshot)
+    ve ağa çıkıldıysa aşama sürelerini (ms) ve deneme sayısını içerir.
+
+    Args:
+        url: İstenecek adres
+        key: Sayfanın site içindeki snapshot anahtarı (örn. burç adı, 'index')
+        timeout: Host ayarındaki zaman aşımının yerine kullanılacak süre
+        stream_until: Verilirse gövde akış halinde indirilir ve kural sağlanınca
+                      kesilir (bkz. _stream_watcher)
+
+    Raises:
+        CircuitOpenError: Host'un devre kesicisi açıksa
+        requests.RequestException: Tüm denemeler bağlantı hatasıyla biterse
+    """
+    if _replay:
+        return _from_snapshot(url, key)
+
+    response = _fresh_from_cache(url, stream_until)
+    if response is None:
+        response = _fetch_with_retry(url, timeout, stream_until)
+
+    _record_snapshot(url, key, response)
+    return response
+
+
+async def fetch_async(url: str, key: Optional[str] = None, timeout: Optional[float] = None,
+                      stream_until: Optional[Dict] = None) -> requests.Response:
+    """fetch()'in asyncio versiyonu - hız limiti ve geri çekilme event loop'u bloklamadan beklenir"""
+    if _replay:
+        return _from_snapshot(url, key)
+
+    response = _fresh_from_cache(url, stream_until)
+    if response is None:
+        response = await _fetch_with_retry_async(url, timeout, stream_until)
+
+    await asyncio.to_thread(_record_snapshot, url, key, response)
+    return response
+
+
+async def _gather(urls: Dict[str, str],
+                  stream_until: Optional[Dict] = None) -> Dict[str, Union[requests.Response, Exception]]:
+    keys = list(urls)
+    responses = await asyncio.gather(
+        *(fetch_async(urls[key], key=key, stream_until=stream_until) for key in keys),
+        return_exceptions=True
+    )
+    return dict(zip(keys, responses))
+
+
+def fetch_all(urls: Dict[str, str],
+              stream_until: Optional[Dict] = None) -> Dict[str, Union[requests.Response, Exception]]:
+    """
+    Birden fazla URL'i eş zamanlı çeker.
+
+    Args:
+        urls: anahtar -> URL (örn. burç adı -> burç sayfası); anahtar aynı
+              zamanda sayfanın snapshot anahtarıdır
+        stream_until: Tüm sayfalar için akış halinde indirme kuralı (bkz. fetch)
+
+    Returns:
+        Aynı anahtar sırasıyla anahtar -> Response. Başarısız istekler için
+        değer, yükseltilen Exception nesnesidir.
+    """
+    return asyncio.run(_gather(urls, stream_until))
@@ -10,10 +10,35 @@ if (fs.existsSync(destDir)) {
 }
 fs.mkdirSync(destDir, { recursive: true });
 
-// Copy rankings_history.json
+// Build rankings_history.json from the monthly segments (data/rankings_history/*.jsonl,
+// see history_store.py): newest date first, the last line of a date wins
 const rankingsFile = 'rankings_history.json';
+const historyDir = path.join(sourceDir, 'rankings_history');
 const rankingsSource = path.join(sourceDir, rankingsFile);
-if (fs.existsSync(rankingsSource)) {
+if (fs.existsSync(path.join(historyDir, 'index.json'))) {
+  const { months } = JSON.parse(fs.readFileSync(path.join(historyDir, 'index.json'), 'utf-8'));
+  const history = {};
+  Object.keys(months).forEach(month => {
+    const segment = path.join(historyDir, `${month}.jsonl`);
+    if (!fs.existsSync(segment)) return;
+    fs.readFileSync(segment, 'utf-8').split('\n').forEach(line => {
+      if (!line.trim()) return;
+      try {
+        const entry = JSON.parse(line);
+        history[entry.date] = entry.rankings;
+      } catch (e) {
+        // Line cut off by an interrupted write
+        console.warn(`⚠️  Skipping unreadable line in ${month}.jsonl`);
+      }
+    });
+  });
+  const sorted = {};
+  Object.keys(history).sort().reverse().forEach(date => {
+    sorted[date] = history[date];
+  });
+  fs.writeFileSync(path.join(destDir, rankingsFile), JSON.stringify(sorted, null, 2));
+  console.log(`✅ Built ${rankingsFile} (${Object.keys(sorted).length} days)`);
+} else if (fs.existsSync(rankingsSource)) {
   fs.copyFileSync(rankingsSource, path.join(destDir, rankingsFile));
   console.log(`✅ Copied ${rankingsFile}`);
 }
@@ -0,0 +1,201 @@
+"""
+AIstrolog - Sıralama Geçmişi Deposu
+Günlük sıralamalar tek bir rankings_history.json yerine aylık, sadece sona eklenen
+JSON Lines parçalarında tutulur. Yeni bir gün eklemek geçmişin boyutundan bağımsızdır
+(tek satır ekleme + küçük index yazımı); okuyucular sadece ihtiyaç duydukları ayları okur.
+
+Klasör yapısı:
+    data/rankings_history/
+        index.json        # ay -> o ayın günleri (yeniden eskiye); geçici dosya + os.replace ile yazılır
+        2025-11.jsonl     # her satır: {"date": "2025-11-23", "rankings": {...}}
+        2025-12.jsonl
+
+Aynı gün aynı sıralamayla yeniden işlenirse (workflow günde iki kez çalışır) hiçbir şey
+yazılmaz; sıralaması değişmişse ayın parçası o gün güncellenmiş olarak yeniden yazılır,
+böylece parçalarda geçersiz kalmış satır birikmez. Okurken aynı gün için son satır
+geçerlidir. Yazma sırasında kesilen (yarım kalmış) son satır okunurken atlanır.
+
+Eski tek dosya biçimi (frontend'in okuduğu rankings_history.json) için:
+    python ranker.py --export data/rankings_history.json
+"""
+
+import json
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Varsayılan geçmiş klasörü ve eski tek dosya
+HISTORY_DIR = os.path.join("data", "rankings_history")
+LEGACY_FILE = os.path.join("data", "rankings_history.json")
+
+INDEX_FILE = "index.json"
+
+
+def exists(history_dir: str = HISTORY_DIR) -> bool:
+    """Klasörde parçalı geçmiş var mı"""
+    return os.path.exists(os.path.join(history_dir, INDEX_FILE))
+
+
+def segment_path(history_dir: str, month: str) -> str:
+    """Ayın (YYYY-MM) parça dosyasının yolu"""
+    return os.path.join(history_dir, f"{month}.jsonl")
+
+
+def _write_atomic(path: str, data) -> None:
+    """JSON'u önce geçici dosyaya yazıp yerine taşır (yarım kalan yazma dosyayı bozmaz)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_segment(path: str) -> Dict[str, Dict]:
+    """Parça dosyasını okur: tarih -> sıralama (aynı gün birden fazlaysa son satır)"""
+    days = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # Yazılırken kesilmiş satır; sonraki ekleme yeni satırdan başlar
+                logger.warning(f"{path}:{line_no} okunamadı, atlanıyor")
+                continue
+            days[entry['date']] = entry['rankings']
+    return days
+
+
+def load_index(history_dir: str = HISTORY_DIR) -> Dict[str, List[str]]:
+    """ay -> o ayın günleri (yeniden eskiye); geçmiş yoksa boş dict"""
+    index_path = os.path.join(history_dir, INDEX_FILE)
+    if not os.path.exists(index_path):
+        return {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        return json.load(f)['months']
+
+
+def dates(history_dir: str = HISTORY_DIR) -> List[str]:
+    """Geçmişteki tüm günler, en yeni önce (parçalar okunmadan, index'ten)"""
+    index = load_index(history_dir)
+    return [date for month in sorted(index, reverse=True) for date in index[month]]
+
+
+def span(months: Dict[str, List[str]]) -> Tuple[Optional[str], Optional[str]]:
+    """load_index sonucundan geçmişin en eski ve en yeni günü (günler tek tek gezilmez)"""
+    if not months:
+        return None, None
+    return months[min(months)][-1], months[max(months)][0]
+
+
+def _write_segment(path: str, days: Dict[str, Dict]) -> None:
+    """Ayın parçasını günler eskiden yeniye, her gün tek satır olacak şekilde yeniden yazar"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for date in sorted(days):
+            f.write(json.dumps({'date': date, 'rankings': days[date]}, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def append_day(date: str, ranking_data: Dict, history_dir: str = HISTORY_DIR) -> bool:
+    """
+    Günün sıralamasını ayın parçasının sonuna ekler ve index'i günceller.
+    Gün parçada aynı sıralamayla zaten varsa hiçbir şey yazılmaz; farklı bir
+    sıralamayla varsa parça bu günü güncellenmiş olarak yeniden yazılır (eski
+    satır sonda geçersiz olarak kalmaz). Satır diske yazılmadan (fsync) index
+    güncellenmez; index'teki ay listesi parçanın kendisinden yeniden çıkarıldığı
+    için önceki yarım kalmış bir çalıştırma da burada düzelir.
+
+    Returns:
+        Parça yazıldıysa True, gün zaten aynıysa False
+    """
+    os.makedirs(history_dir, exist_ok=True)
+    month = date[:7]
+    path = segment_path(history_dir, month)
+    days = read_segment(path) if os.path.exists(path) else {}
+
+    changed = days.get(date) != ranking_data
+    if date in days and changed:
+        days[date] = ranking_data
+        _write_segment(path, days)
+    elif changed:
+        line = json.dumps({'date': date, 'rankings': ranking_data}, ensure_ascii=False)
+        with open(path, 'ab+') as f:
+            # Önceki yazma yarım kaldıysa yeni kayıt o satıra yapışmasın
+            size = f.seek(0, os.SEEK_END)
+            if size:
+                f.seek(size - 1)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+            f.write(line.encode('utf-8') + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        days[date] = ranking_data
+
+    index = load_index(history_dir)
+    month_dates = sorted(days, reverse=True)
+    if index.get(month) != month_dates:
+        index[month] = month_dates
+        _write_atomic(os.path.join(history_dir, INDEX_FILE),
+                      {'months': dict(sorted(index.items(), reverse=True))})
+    return changed
+
+
+def load_range(start: Optional[str] = None, end: Optional[str] = None,
+               history_dir: str = HISTORY_DIR,
+               reader: Callable[[str], Dict[str, Dict]] = read_segment) -> Dict[str, Dict]:
+    """
+    Verilen gün aralığındaki (uçlar dahil) sıralamaları rankings_history.json
+    biçiminde döner (en yeni gün önce). Sadece aralıkla kesişen aylar okunur.
+    reader parça okuyucusudur (örn. API'de önbellekli okuma).
+    """
+    start = start or '0000-00-00'
+    end = end or '9999-99-99'
+    history = {}
+    for month in load_index(history_dir):
+        if start[:7] <= month <= end[:7]:
+            for date, ranking_data in reader(segment_path(history_dir, month)).items():
+                if start <= date <= end:
+                    history[date] = ranking_data
+    return dict(sorted(history.items(), reverse=True))
+
+
+def migrate_legacy(legacy_path: str = LEGACY_FILE, history_dir: str = HISTORY_DIR) -> int:
+    """
+    Eski tek dosyalık rankings_history.json'ı parçalara aktarır (geçmiş henüz
+    yoksa; tek seferlik). Aktarılan gün sayısını döner.
+    """
+    if exists(history_dir) or not os.path.exists(legacy_path):
+        return 0
+    with open(legacy_path, 'r', encoding='utf-8') as f:
+        legacy = json.load(f)
+
+    os.makedirs(history_dir, exist_ok=True)
+    by_month: Dict[str, List[str]] = {}
+    for date in sorted(legacy):
+        by_month.setdefault(date[:7], []).append(date)
+    for month, month_dates in by_month.items():
+        with open(segment_path(history_dir, month), 'w', encoding='utf-8') as f:
+            for date in month_dates:
+                f.write(json.dumps({'date': date, 'rankings': legacy[date]}, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+    _write_atomic(os.path.join(history_dir, INDEX_FILE), {'months': {
+        month: sorted(month_dates, reverse=True)
+        for month, month_dates in sorted(by_month.items(), reverse=True)
+    }})
+    logger.info(f"{legacy_path} -> {history_dir}: {len(legacy)} gün aktarıldı")
+    return len(legacy)
+
+
+def export_json(path: str, history_dir: str = HISTORY_DIR) -> int:
+    """Tüm geçmişi eski rankings_history.json biçiminde (en yeni gün önce) yazar; gün sayısını döner"""
+    history = load_range(history_dir=history_dir)
+    _write_atomic(path, history)
+    return len(history)
@@ -8,10 +8,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime, timedelta
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import glob
 
+import history_store
+import storage
+
 app = FastAPI(
     title="AIstrolog API",
     description="Turkish Horoscope API with AI-powered summaries and rankings",
@@ -30,6 +34,15 @@ app.add_middleware(
 # Data directory
 DATA_DIR = Path(__file__).parent / "data"
 
+# SQLite store written by the pipeline (see storage.py); JSON files are the fallback
+DB_PATH = storage.db_path() or str(DATA_DIR / "aistrolog.db")
+
+# Number of daily rankings averaged per period
+PERIOD_DAYS = {"weekly": 7, "monthly": 30}
+
+# Parsed JSON files kept in memory (a few days of summaries + rankings history months)
+JSON_CACHE_SIZE = 32
+
 # Zodiac sign mappings (Turkish to English slug)
 ZODIAC_SIGNS = {
     "Koç": "koc",
@@ -59,32 +72,197 @@ CATEGORY_MAPPING = {
 
 
 def get_latest_file(pattern: str) -> Optional[Path]:
-    """Get the most recent file matching the pattern"""
+    """Get the file of the most recent day matching the pattern (file names end with YYYY-MM-DD)"""
     files = list(DATA_DIR.glob(pattern))
     if not files:
         return None
-    return max(files, key=lambda p: p.stat().st_mtime)
+    return max(files, key=lambda p: p.name)
+
+
+def store_path() -> Optional[str]:
+    """Path of the SQLite store if the pipeline has created it"""
+    return DB_PATH if os.path.exists(DB_PATH) else None
+
+
+def load_sign_data(turkish_name: str, date_str: str) -> Optional[Dict]:
+    """
+    Summarized data of one sign for a date, falling back to the latest available day.
+    Uses one indexed store lookup; the JSON files are read only if the store lacks the day.
+    The store can be older than the JSON files (the daily workflow only writes JSON),
+    so the fallback uses whichever source has the newer day.
+    """
+    db = store_path()
+    file_date = to_iso_date(date_str)
+    if db and file_date:
+        sign_data = storage.load_sign(db, "summarized", file_date, turkish_name)
+        if sign_data:
+            return sign_data
+    
+    data_file = get_file_for_date(date_str, "summarized")
+    
+    if not data_file:
+        # Try to get the latest available data
+        data_file = get_latest_file("summarized_processed_daily_raw_*.json")
+        file_latest = storage.date_from_path(str(data_file)) if data_file else None
+        store_latest = storage.latest_date(db, "summarized") if db else None
+        if store_latest and (not file_latest or store_latest >= file_latest):
+            return storage.load_sign(db, "summarized", store_latest, turkish_name)
+        if not data_file:
+            raise HTTPException(status_code=404, detail="No horoscope data available")
+    
+    return load_json_file(data_file).get(turkish_name)
+
+
+def load_period_rankings(search_date: str, period: str) -> Tuple[str, Dict[str, Dict]]:
+    """
+    Daily rankings needed for a period ending at search_date (newest first).
+    Daily requests fall back to the latest day and weekly/monthly requests to
+    the most recent days when nothing is found. The store answers only windows it
+    covers up to the newest day of the history files (checked with two indexed
+    MIN/MAX lookups); otherwise the files are read.
+    
+    Returns:
+        (date of the response, {YYYY-MM-DD: daily rankings})
+    """
+    db = store_path()
+    files_first, files_last = history_span()
+    store_first, store_last = storage.ranking_span(db) if db else (None, None)
+    
+    def store_covers(start: str, end: str) -> bool:
+        # The store can be behind the history files (e.g. a stage run without AISTROLOG_DB)
+        if store_last is None:
+            return False
+        if files_last is None:
+            return True
+        return store_first <= max(start, files_first) and store_last >= min(end, files_last)
+    
+    def load_range(start: str, end: str) -> Dict[str, Dict]:
+        if store_covers(start, end):
+            return storage.load_rankings_history(db, start, end)
+        return load_history_range(start, end) if files_last else {}
+    
+    def recent_dates(limit: int) -> List[str]:
+        if store_covers(files_last or store_last or "", "9999-99-99"):
+            return storage.ranking_dates(db, limit=limit)
+        return history_dates()[:limit]
+    
+    days = PERIOD_DAYS.get(period)
+    if days:
+        # Last 7 / 30 days of data (or as many as available)
+        target_date = datetime.strptime(search_date, "%Y-%m-%d")
+        start = (target_date - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        history = load_range(start, search_date)
+        # If we don't have any data, use whatever we have
+        if not history:
+            recent = recent_dates(days)
+            history = load_range(recent[-1], recent[0]) if recent else {}
+    else:  # daily
+        history = load_range(search_date, search_date)
+        # If requested date not found, use latest
+        if not history:
+            recent = recent_dates(1)
+            if recent:
+                search_date = recent[0]
+                history = load_range(search_date, search_date)
+    return search_date, history
+
+
+def load_ranking_aggregate(period: str, search_date: str) -> Optional[Dict]:
+    """
+    Precomputed daily scores of the period ending at search_date (see ranker.py), if any.
+    Entries of the older sum/count format are ignored (the days are read instead).
+    """
+    aggregates_file = DATA_DIR / "rankings_aggregates.json"
+    if not aggregates_file.exists():
+        return None
+    aggregate = load_json_file(aggregates_file).get(period, {}).get(search_date)
+    if aggregate and any('scores' not in entry
+                         for key in aggregate if key != "days"
+                         for entry in aggregate[key].values()):
+        return None
+    return aggregate
+
+
+def history_dates() -> List[str]:
+    """Days in the rankings history files (newest first); empty if there are none"""
+    history_dir = str(DATA_DIR / "rankings_history")
+    if history_store.exists(history_dir):
+        return history_store.dates(history_dir)
+    if (DATA_DIR / "rankings_history.json").exists():
+        return list(load_rankings_history())
+    return []
+
+
+def history_span() -> Tuple[Optional[str], Optional[str]]:
+    """Oldest and newest day of the rankings history files, from the (cached) segment index"""
+    history_dir = DATA_DIR / "rankings_history"
+    if history_store.exists(str(history_dir)):
+        return history_store.span(load_json_file(history_dir / history_store.INDEX_FILE)["months"])
+    if (DATA_DIR / "rankings_history.json").exists():
+        history_data = load_rankings_history()
+        return (min(history_data), max(history_data)) if history_data else (None, None)
+    return None, None
+
+
+def load_history_range(start: str, end: str) -> Dict[str, Dict]:
+    """Daily rankings between start and end (newest first) from the rankings history files"""
+    history_dir = str(DATA_DIR / "rankings_history")
+    if history_store.exists(history_dir):
+        # Only the monthly segments overlapping the window are read
+        return history_store.load_range(start, end, history_dir, reader=load_json_file)
+    return {
+        date_str: rankings for date_str, rankings in load_rankings_history().items()
+        if start <= date_str <= end
+    }
+
+
+def load_rankings_history() -> Dict:
+    """Load all daily rankings (newest first) from the legacy single-file rankings_history.json"""
+    history_file = DATA_DIR / "rankings_history.json"
+    
+    if not history_file.exists():
+        raise HTTPException(status_code=404, detail="Rankings history not found")
+    
+    return load_json_file(history_file)
 
 
 def load_json_file(file_path: Path) -> Dict:
-    """Load and parse JSON file"""
+    """
+    Load and parse JSON file. Parsed files are cached by path, mtime and size, so
+    repeat requests skip reading and parsing while files rewritten by the pipeline
+    are picked up. The returned data is shared between requests and must not be modified.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        stat = os.stat(file_path)
+        return _parse_json_file(str(file_path), stat.st_mtime_ns, stat.st_size)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error loading data: {str(e)}")
 
 
+@lru_cache(maxsize=JSON_CACHE_SIZE)
+def _parse_json_file(path: str, mtime_ns: int, size: int) -> Dict:
+    """Read and parse a JSON (or rankings history .jsonl) file; mtime_ns and size are only part of the cache key"""
+    if path.endswith(".jsonl"):
+        return history_store.read_segment(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def to_iso_date(date_str: str) -> Optional[str]:
+    """Convert DD-MM-YYYY (or YYYY-MM-DD) to YYYY-MM-DD"""
+    parts = date_str.split('-')
+    if len(parts) != 3:
+        return None
+    if len(parts[0]) == 4:  # Already YYYY-MM-DD
+        return date_str
+    return f"{parts[2]}-{parts[1]}-{parts[0]}"
+
+
 def get_file_for_date(date_str: str, file_type: str = "summarized") -> Optional[Path]:
     """Get data file for specific date (format: DD-MM-YYYY or YYYY-MM-DD)"""
     # Convert DD-MM-YYYY to YYYY-MM-DD for file matching
-    parts = date_str.split('-')
-    if len(parts) == 3:
-        if len(parts[0]) == 4:  # Already YYYY-MM-DD
-            file_date = date_str
-        else:  # DD-MM-YYYY format
-            file_date = f"{parts[2]}-{parts[1]}-{parts[0]}"
-    else:
+    file_date = to_iso_date(date_str)
+    if not file_date:
         return None
     
     # Try to find the file
@@ -97,6 +275,21 @@ def get_file_for_date(date_str: str, file_type: str = "summarized") -> Optional[
     return None
 
 
+@app.on_event("startup")
+def sync_store():
+    """
+    Build the SQLite store from the JSON files, or add the days it is missing.
+    The data folder is updated by git (the daily workflow commits JSON only), so
+    the store is brought up to date wherever the API runs.
+    """
+    if not DATA_DIR.is_dir():
+        return
+    counts = storage.import_json(DB_PATH, str(DATA_DIR), only_new=True)
+    imported = {stage: count for stage, count in counts.items() if count}
+    if imported:
+        print(f"SQLite store {DB_PATH} updated from JSON: {imported}")
+
+
 @app.get("/")
 async def root():
     """API root endpoint"""
@@ -107,7 +300,8 @@ async def root():
             "burclar": "/api/burclar",
             "gunluk": "/api/gunluk/{sign}/{date}",
             "rankings": "/api/rankings/{date}",
-            "available_dates": "/api/available-dates"
+            "available_dates": "/api/available-dates",
+            "cache_stats": "/api/cache-stats"
         }
     }
 
@@ -139,20 +333,8 @@ async def get_daily_horoscope(sign: str, date: str):
     if not turkish_name:
         raise HTTPException(status_code=404, detail="Zodiac sign not found")
     
-    # Get data file for date
-    data_file = get_file_for_date(date, "summarized")
-    
-    if not data_file:
-        # Try to get the latest available data
-        data_file = get_latest_file("summarized_processed_daily_raw_*.json")
-        if not data_file:
-            raise HTTPException(status_code=404, detail="No horoscope data available")
-    
-    # Load data
-    data = load_json_file(data_file)
-    
-    # Get sign data
-    sign_data = data.get(turkish_name)
+    # Get sign data for date (or the latest available day)
+    sign_data = load_sign_data(turkish_name, date)
     if not sign_data:
         raise HTTPException(status_code=404, detail="Sign data not found")
     
@@ -172,76 +354,34 @@ async def get_daily_horoscope(sign: str, date: str):
 @app.get("/api/rankings/{date}")
 async def get_rankings(date: str, period: str = "daily"):
     """
-    Get zodiac sign rankings for a specific date from rankings_history.json
+    Get zodiac sign rankings for a specific date from the store (or rankings_history.json)
     
     Parameters:
     - date: date in DD-MM-YYYY format (e.g., "23-11-2025")
     - period: "daily", "weekly", or "monthly" (query parameter)
     """
-    # Load rankings history file
-    history_file = DATA_DIR / "rankings_history.json"
-    
-    if not history_file.exists():
-        raise HTTPException(status_code=404, detail="Rankings history not found")
-    
-    history_data = load_json_file(history_file)
-    
     # Convert DD-MM-YYYY to YYYY-MM-DD for matching
-    parts = date.split('-')
-    if len(parts) == 3:
-        if len(parts[0]) == 4:  # Already YYYY-MM-DD
-            search_date = date
-        else:  # DD-MM-YYYY format
-            search_date = f"{parts[2]}-{parts[1]}-{parts[0]}"
-    else:
+    search_date = to_iso_date(date)
+    if not search_date:
         raise HTTPException(status_code=400, detail="Invalid date format. Use DD-MM-YYYY")
     
-    # Get dates to process based on period
-    if period == "weekly":
-        # Get last 7 days of data (or as many as available)
-        target_date = datetime.strptime(search_date, "%Y-%m-%d")
-        dates_to_process = []
-        
-        for i in range(7):
-            check_date = target_date - timedelta(days=i)
-            date_str = check_date.strftime("%Y-%m-%d")
-            if date_str in history_data:
-                dates_to_process.append(date_str)
-        
-        # If we don't have any data, use whatever we have
-        if not dates_to_process and history_data:
-            dates_to_process = list(history_data.keys())[:7]
-            
-    elif period == "monthly":
-        # Get last 30 days of data (or as many as available)
-        target_date = datetime.strptime(search_date, "%Y-%m-%d")
-        dates_to_process = []
-        
-        for i in range(30):
-            check_date = target_date - timedelta(days=i)
-            date_str = check_date.strftime("%Y-%m-%d")
-            if date_str in history_data:
-                dates_to_process.append(date_str)
-        
-        # If we don't have any data, use whatever we have
-        if not dates_to_process and history_data:
-            dates_to_process = list(history_data.keys())[:30]
-            
-    else:  # daily
-        dates_to_process = [search_date] if search_date in history_data else []
-        
-        # If requested date not found, use latest
-        if not dates_to_process and history_data:
-            latest_date = next(iter(history_data))
-            dates_to_process = [latest_date]
-            search_date = latest_date
+    # Weekly / monthly totals of days in the history are precomputed by ranker.py
+    aggregate = load_ranking_aggregate(period, search_date) if period in PERIOD_DAYS else None
     
-    if not dates_to_process:
-        raise HTTPException(status_code=404, detail="No ranking data available")
+    if aggregate:
+        history_data = {}
+        days_analyzed = aggregate["days"]
+    else:
+        # Get the daily rankings of the period
+        search_date, history_data = load_period_rankings(search_date, period)
+        days_analyzed = len(history_data)
+        
+        if not history_data:
+            raise HTTPException(status_code=404, detail="No ranking data available")
     
     # Calculate rankings based on period
     if period in ["weekly", "monthly"]:
-        # Average scores across multiple days
+        # Average scores across multiple days (daily scores per sign, newest day first)
         sign_scores = {
             "general": {},
             "love": {},
@@ -256,19 +396,17 @@ async def get_rankings(date: str, period: str = "daily"):
             "sağlık_ranking": "health"
         }
         
+        if aggregate:
+            for file_key, api_key in ranking_map.items():
+                for burc, totals in aggregate.get(file_key, {}).items():
+                    sign_scores[api_key][burc] = list(totals['scores'])
+        
         # Collect all scores
-        for date_str in dates_to_process:
-            date_rankings = history_data[date_str]
-            
+        for date_str, date_rankings in history_data.items():
             for file_key, api_key in ranking_map.items():
                 if file_key in date_rankings:
                     for item in date_rankings[file_key]:
-                        burc = item['burc']
-                        score = item['score']
-                        
-                        if burc not in sign_scores[api_key]:
-                            sign_scores[api_key][burc] = []
-                        sign_scores[api_key][burc].append(score)
+                        sign_scores[api_key].setdefault(item['burc'], []).append(item['score'])
         
         # Calculate averages and create rankings
         rankings = {
@@ -293,7 +431,7 @@ async def get_rankings(date: str, period: str = "daily"):
     
     else:
         # Single day ranking
-        date_rankings = history_data[dates_to_process[0]]
+        date_rankings = next(iter(history_data.values()))
         
         rankings = {
             "general": [],
@@ -326,7 +464,7 @@ async def get_rankings(date: str, period: str = "daily"):
     return {
         "date": display_date,
         "period": period,
-        "days_analyzed": len(dates_to_process),
+        "days_analyzed": days_analyzed,
         "rankings": rankings
     }
 
@@ -334,31 +472,44 @@ async def get_rankings(date: str, period: str = "daily"):
 @app.get("/api/available-dates")
 async def get_available_dates():
     """Get list of available dates for horoscope data"""
-    summarized_files = list(DATA_DIR.glob("summarized_processed_daily_raw_*.json"))
+    # Dates come from the store only if it is as new as the JSON files (the store may be behind)
+    db = store_path()
+    summarized_files = sorted(DATA_DIR.glob("summarized_processed_daily_raw_*.json"))
+    files_latest = storage.date_from_path(summarized_files[-1].name) if summarized_files else None
+    store_latest = storage.latest_date(db, "summarized") if db else None
+    if store_latest and (not files_latest or store_latest >= files_latest):
+        summarized_dates = storage.available_dates(db, "summarized")
+    else:
+        # Extract date from filename: summarized_processed_daily_raw_YYYY-MM-DD.json
+        summarized_dates = [
+            file.stem.replace("summarized_processed_daily_raw_", "")
+            for file in summarized_files
+        ]
     
-    # Also get dates from rankings_history.json
+    # Also get dates from rankings history
     rankings_dates = []
-    history_file = DATA_DIR / "rankings_history.json"
-    if history_file.exists():
-        try:
-            history_data = load_json_file(history_file)
-            for date_key in history_data.keys():
-                # Convert YYYY-MM-DD to DD-MM-YYYY
-                parts = date_key.split('-')
-                if len(parts) == 3:
-                    dd_mm_yyyy = f"{parts[2]}-{parts[1]}-{parts[0]}"
-                    rankings_dates.append(dd_mm_yyyy)
-        except:
-            pass
+    try:
+        files_first, files_last = history_span()
+        store_first, store_last = storage.ranking_span(db) if db else (None, None)
+        if store_last and (not files_last or (store_first <= files_first and store_last >= files_last)):
+            ranking_keys = storage.ranking_dates(db)
+        else:
+            ranking_keys = history_dates()
+    except HTTPException:
+        ranking_keys = []
+    for date_key in ranking_keys:
+        # Convert YYYY-MM-DD to DD-MM-YYYY
+        parts = date_key.split('-')
+        if len(parts) == 3:
+            dd_mm_yyyy = f"{parts[2]}-{parts[1]}-{parts[0]}"
+            rankings_dates.append(dd_mm_yyyy)
     
     dates = {
         "summarized": [],
         "rankings": rankings_dates
     }
     
-    for file in summarized_files:
-        # Extract date from filename: summarized_processed_daily_raw_YYYY-MM-DD.json
-        date_part = file.stem.replace("summarized_processed_daily_raw_", "")
+    for date_part in summarized_dates:
         # Convert YYYY-MM-DD to DD-MM-YYYY
         parts = date_part.split('-')
         if len(parts) == 3:
@@ -372,6 +523,20 @@ async def get_available_dates():
     return dates
 
 
+@app.get("/api/cache-stats")
+async def get_cache_stats():
+    """Hit/miss counters of the parsed JSON file cache"""
+    info = _parse_json_file.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": round(info.hits / lookups, 3) if lookups else 0.0,
+        "size": info.currsize,
+        "max_size": info.maxsize
+    }
+
+
 def get_zodiac_symbol(slug: str) -> str:
     """Get zodiac symbol for slug"""
     symbols = {
@@ -0,0 +1,128 @@
+"""
+AIstrolog - Çoklu Kelime/İfade Eşleştirici
+Kategorizasyondaki ifade listeleri ve scorer'ın sentiment/kategori kelime listeleri
+için ortak eşleştirici. Her kelime için metni ayrı ayrı taramak (`in`, str.count)
+yerine tüm liste tek bir trie'ye ve ondan üretilen tek bir regex'e derlenir:
+
+  1. Regex, metinde herhangi bir kelimenin başladığı konumları soldan sağa bulur
+     (regex motoru trie yapısı sayesinde her konumda sadece ortak önekleri dener).
+  2. Sadece bu konumlarda trie'de ilerlenerek orada başlayan tüm kelimeler toplanır.
+
+Böylece maliyet metin uzunluğu ve bulunan eşleşme sayısıyla büyür, kelime listesinin
+boyutuyla büyümez. Sonuçlar eski kontrollerle aynıdır: varlık `kelime in metin`,
+sayılar `metin.count(kelime)` (her kelime için kendi içinde çakışmayan eşleşmeler;
+farklı kelimeler, örn. 'güç' ve 'güçlü', aynı yerde ayrı ayrı sayılır).
+
+Eşleştirme büyük/küçük harfe duyarlıdır; çağıranlar metni önceden küçük harfe çevirir.
+
+Ölçüm: python benchmarks/phrasematch_benchmark.py
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+# Trie düğümünde, o düğümde biten kelimeyi tutan anahtar (karakterlerle çakışmaz)
+_END = ''
+
+
+class PhraseMatcher:
+    """Kelime/ifade listesini derleyip metindeki tüm eşleşmeleri tek geçişte bulur"""
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases = [phrase for phrase in dict.fromkeys(phrases) if phrase]
+        self._trie: Dict = {}
+        for phrase in self.phrases:
+            node = self._trie
+            for char in phrase:
+                node = node.setdefault(char, {})
+            node[_END] = phrase
+        self._max_len = max((len(phrase) for phrase in self.phrases), default=0)
+        # En kısa kelimelerin trie'si; her aramada bir sonraki başlangıç konumunu bulur
+        self._first = re.compile(_trie_regex(self._trie)) if self.phrases else None
+
+    def _matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Metindeki eşleşmeler, başlangıç konumu sırasıyla (konum, kelime)"""
+        if self._first is None:
+            return
+        search = self._first.search
+        match = search(text)
+        while match:
+            start = match.start()
+            node = self._trie
+            for char in text[start:start + self._max_len]:
+                node = node.get(char)
+                if node is None:
+                    break
+                if _END in node:
+                    yield start, node[_END]
+            # Bir sonraki kelime bu eşleşmenin içinde de başlayabilir
+            match = search(text, start + 1)
+
+    def matches(self, text: str) -> List[Tuple[int, str]]:
+        """Metindeki tüm eşleşmeler (konum, kelime); counts_of / joined_matches ile kullanılır"""
+        return list(self._matches(text))
+
+    def joined_matches(self, parts: List[str], part_matches: List[List[Tuple[int, str]]],
+                       sep: str = ' ') -> List[Tuple[int, str]]:
+        """
+        sep.join(parts) metnindeki eşleşmeler. Parçaların kendi eşleşmeleri (part_matches,
+        matches(part) sonucu) yeniden aranmaz; sadece birleşim yerlerini kesen eşleşmeler
+        için her ayırıcının etrafındaki kısa pencereye bakılır.
+        """
+        joined = sep.join(parts)
+        result = []
+        crossing = set()
+        offset = 0
+        for i, (part, found) in enumerate(zip(parts, part_matches)):
+            result.extend((offset + start, phrase) for start, phrase in found)
+            offset += len(part)
+            if i == len(parts) - 1:
+                break
+            # Ayırıcıyla ([offset, offset + len(sep))) kesişen eşleşmeler
+            low = max(0, offset - self._max_len + 1)
+            window = joined[low:offset + len(sep) + self._max_len - 1]
+            for start, phrase in self._matches(window):
+                start += low
+                if start < offset + len(sep) and start + len(phrase) > offset:
+                    crossing.add((start, phrase))
+            offset += len(sep)
+        result.extend(crossing)
+        result.sort()
+        return result
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """
+        Metinde geçen kelimeler -> geçme sayısı (text.count(kelime) ile aynı).
+        Geçmeyen kelimeler sonuçta yer almaz.
+        """
+        return self.counts_of(self._matches(text))
+
+    @staticmethod
+    def counts_of(matches: Iterable[Tuple[int, str]]) -> Dict[str, int]:
+        """Konum sırasındaki eşleşmelerden counts sonucu"""
+        counts: Dict[str, int] = {}
+        next_start: Dict[str, int] = {}
+        for start, phrase in matches:
+            # str.count gibi: aynı kelimenin bir önceki eşleşmesiyle çakışanı sayma
+            if start >= next_start.get(phrase, 0):
+                counts[phrase] = counts.get(phrase, 0) + 1
+                next_start[phrase] = start + len(phrase)
+        return counts
+
+    def found(self, text: str) -> Set[str]:
+        """Metinde geçen kelimeler (her biri için `kelime in text` True olanlar)"""
+        return {phrase for _, phrase in self._matches(text)}
+
+
+def _trie_regex(node: Dict) -> str:
+    """
+    Trie'den regex üretir. Bir kelimenin bittiği düğümde durulur: başlangıç konumunu
+    bulmak için en kısa kelime yeterlidir, uzunları trie üzerinde ayrıca toplanır.
+    """
+    if _END in node:
+        return ''
+    branches: List[str] = [re.escape(char) + _trie_regex(child)
+                           for char, child in sorted(node.items())]
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
@@ -1,13 +1,19 @@
 """
 AIstrolog - Burç Ranking Sistemi
-Skorlanmış burç verilerinden ranking oluşturur ve rankings_history.json'a ekler.
+Skorlanmış burç verilerinden ranking oluşturur ve aylık parçalı sıralama geçmişinin
+(data/rankings_history/, bkz. history_store.py) sonuna ekler.
+Haftalık / aylık sıralamalar için son 7 ve 30 günün burç/kategori skorları
+rankings_aggregates.json'da tutulur ve her yeni günde artımlı güncellenir.
 """
 
+import argparse
 import json
 import logging
 import os
-from datetime import datetime
-from typing import Dict, List
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import history_store
 
 # Logging konfigürasyonu
 logging.basicConfig(
@@ -20,6 +26,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Toplamı tutulan dönemler ve gün sayıları (API'deki weekly / monthly)
+AGGREGATE_PERIODS = {'weekly': 7, 'monthly': 30}
+
+RANKING_CATEGORIES = ['genel_ranking', 'aşk_ranking', 'para_ranking', 'sağlık_ranking']
+
 
 def load_scored_data(filepath: str) -> Dict:
     """Scored JSON dosyasını yükler"""
@@ -32,28 +43,171 @@ def load_scored_data(filepath: str) -> Dict:
     return data
 
 
-def load_rankings_history(filepath: str = "data/rankings_history.json") -> Dict:
-    """Rankings history dosyasını yükler, yoksa boş dict döner"""
-    if os.path.exists(filepath):
-        logger.info(f"Rankings history yükleniyor: {filepath}")
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        logger.info(f"Rankings history yüklendi: {len(data)} tarih")
-        return data
-    else:
-        logger.info("Rankings history dosyası bulunamadı, yeni oluşturulacak")
-        return {}
+def load_rankings_history(history_dir: str = history_store.HISTORY_DIR) -> Dict:
+    """Tüm sıralama geçmişini (en yeni gün önce) parçalardan yükler, yoksa boş dict döner"""
+    history = history_store.load_range(history_dir=history_dir)
+    logger.info(f"Rankings history yüklendi: {len(history)} tarih")
+    return history
 
 
-def save_rankings_history(data: Dict, filepath: str = "data/rankings_history.json"):
-    """Rankings history dosyasını kaydeder"""
-    # Tarihleri sıralı tut (en yeni en üstte)
-    sorted_data = dict(sorted(data.items(), key=lambda x: x[0], reverse=True))
-    
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(sorted_data, f, ensure_ascii=False, indent=2)
-    
-    logger.info(f"Rankings history kaydedildi: {filepath}")
+def save_rankings_history(filepath: str = history_store.LEGACY_FILE,
+                          history_dir: str = history_store.HISTORY_DIR):
+    """Parçalı geçmişi eski tek dosya biçiminde (rankings_history.json) dışa aktarır"""
+    count = history_store.export_json(filepath, history_dir)
+    logger.info(f"Rankings history kaydedildi: {filepath} ({count} tarih)")
+
+
+def load_aggregates(filepath: str = "data/rankings_aggregates.json") -> Optional[Dict]:
+    """
+    Dönem toplamları dosyasını yükler, yoksa None döner. Skor listesi yerine
+    sum/count tutan eski biçimdeki dosya için de None döner (yeniden hesaplanır).
+    """
+    if not os.path.exists(filepath):
+        return None
+    with open(filepath, 'r', encoding='utf-8') as f:
+        aggregates = json.load(f)
+    for period_data in aggregates.values():
+        for aggregate in period_data.values():
+            for category in RANKING_CATEGORIES:
+                if any('scores' not in entry for entry in aggregate.get(category, {}).values()):
+                    logger.info(f"{filepath} eski biçimde (sum/count), yeniden hesaplanacak")
+                    return None
+    return aggregates
+
+
+def save_aggregates(data: Dict, filepath: str = "data/rankings_aggregates.json"):
+    """Dönem toplamları dosyasını kaydeder (yarım kalan yazma dosyayı bozmasın diye önce geçici dosyaya)"""
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, filepath)
+    logger.info(f"Dönem toplamları kaydedildi: {filepath}")
+
+
+def window_dates(history: Dict, end_date: str, days: int) -> List[str]:
+    """end_date dahil son `days` günden history'de olanlar (en yeni önce)"""
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    dates = [(end - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+    return [date for date in dates if date in history]
+
+
+def _add_day(aggregate: Dict, ranking_data: Dict, newest: bool = False):
+    """
+    Bir günün skorlarını burçların skor listelerine ekler: pencerenin en eski günü
+    olarak sona, newest=True ise en yeni günü olarak başa. Listeler en yeni gün önce
+    tutulur; ortalama API'de sum(scores) / len(scores) ile, günlük skorların
+    gün gün toplandığı hesapla birebir aynı çıkar (çalışan float toplamında
+    ekleme/çıkarma hatası birikirdi).
+    """
+    for category in RANKING_CATEGORIES:
+        totals = aggregate.setdefault(category, {})
+        for item in ranking_data.get(category, []):
+            scores = totals.setdefault(item['burc'], {'scores': []})['scores']
+            if newest:
+                scores.insert(0, item['score'])
+            else:
+                scores.append(item['score'])
+
+
+def _drop_day(aggregate: Dict, ranking_data: Dict):
+    """
+    Pencereden düşen (pencerenin en eski) günün skorlarını listelerin sonundan çıkarır;
+    skoru kalmayan burç silinir
+    """
+    for category in RANKING_CATEGORIES:
+        totals = aggregate.get(category, {})
+        for item in ranking_data.get(category, []):
+            entry = totals.get(item['burc'])
+            if entry is None:
+                continue
+            entry['scores'].pop()
+            if not entry['scores']:
+                del totals[item['burc']]
+
+
+def build_aggregate(history: Dict, end_date: str, days: int) -> Dict:
+    """
+    end_date'te biten dönemin toplamlarını pencere günlerinden sıfırdan hesaplar.
+    Burçlar, en yeni günden geriye ilk göründükleri sırayla tutulur (API'deki sıralamayla aynı).
+    """
+    dates = window_dates(history, end_date, days)
+    aggregate = {'days': len(dates)}
+    for date in dates:
+        _add_day(aggregate, history[date])
+    return aggregate
+
+
+def roll_aggregate(previous: Dict, previous_date: str, history: Dict,
+                   end_date: str, days: int) -> Dict:
+    """
+    Önceki günün dönem toplamlarından end_date'inkini üretir: yeni gün eklenir,
+    pencereden düşen günler çıkarılır. Yeni günün burçları öne alınır.
+    """
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    window_start = (end - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    previous_start = (datetime.strptime(previous_date, "%Y-%m-%d")
+                      - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+
+    aggregate = {'days': previous['days']}
+    # Yeni günün burçları önce, sonra önceki sıradaki diğerleri
+    for category in RANKING_CATEGORIES:
+        totals = previous.get(category, {})
+        ordered = {item['burc']: None for item in history[end_date].get(category, [])}
+        ordered.update({burc: None for burc in totals})
+        aggregate[category] = {
+            burc: {'scores': list(totals.get(burc, {}).get('scores', []))} for burc in ordered
+        }
+
+    for date in history:
+        if previous_start <= date < window_start:
+            _drop_day(aggregate, history[date])
+            aggregate['days'] -= 1
+    _add_day(aggregate, history[end_date], newest=True)
+    aggregate['days'] += 1
+
+    # Henüz hiç skoru eklenmemiş (yeni gün eklenmeden önce boş açılmış) burçlar kalmasın
+    for category in RANKING_CATEGORIES:
+        aggregate[category] = {burc: entry for burc, entry in aggregate[category].items()
+                               if entry['scores']}
+    return aggregate
+
+
+def update_aggregates(history: Dict, date: str, aggregates: Optional[Dict]) -> Dict:
+    """
+    history'e `date` günü eklendikten/güncellendikten sonra dönem toplamlarını günceller.
+
+    - Dosya yoksa tüm günler için sıfırdan hesaplanır.
+    - Normal günlük çalıştırmada (en yeni gün eklenmiş) yeni günün toplamı bir önceki
+      günün toplamından ilerletilir: yeni gün eklenir, pencereden düşen günler çıkarılır.
+    - Geçmiş bir gün eklenir ya da güncellenirse, o günü içeren dönemler pencere
+      günlerinden yeniden hesaplanır.
+    """
+    if aggregates is None:
+        logger.info("Dönem toplamları dosyası yok, tüm günler için hesaplanıyor")
+        return {
+            period: {end: build_aggregate(history, end, days) for end in sorted(history)}
+            for period, days in AGGREGATE_PERIODS.items()
+        }
+
+    for period, days in AGGREGATE_PERIODS.items():
+        period_data = aggregates.setdefault(period, {})
+        earlier = sorted(d for d in period_data if d < date)
+        is_latest = all(d < date for d in history if d != date)
+
+        if is_latest and date not in period_data and earlier:
+            period_data[date] = roll_aggregate(period_data[earlier[-1]], earlier[-1],
+                                               history, date, days)
+            continue
+
+        # Günü içeren dönemler: date .. date + days - 1 arasında biten günler
+        start = datetime.strptime(date, "%Y-%m-%d")
+        last = (start + timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        for end in sorted(history):
+            if date <= end <= last:
+                period_data[end] = build_aggregate(history, end, days)
+        aggregates[period] = dict(sorted(period_data.items()))
+
+    return aggregates
 
 
 def create_ranking_for_date(scored_data: Dict) -> Dict:
@@ -87,9 +241,11 @@ def create_ranking_for_date(scored_data: Dict) -> Dict:
     return result
 
 
-def update_rankings_history(scored_filepath: str, history_filepath: str = "data/rankings_history.json"):
+def update_rankings_history(scored_filepath: str, history_dir: str = history_store.HISTORY_DIR,
+                            aggregates_filepath: str = "data/rankings_aggregates.json"):
     """
-    Scored dosyadan ranking oluşturur ve history'e ekler.
+    Scored dosyadan ranking oluşturur, geçmişin sonuna ekler ve dönem toplamlarını günceller.
+    Geçmişin tamamı okunmaz: toplamlar için sadece değişen dönemlerin günleri yüklenir.
     """
     # Scored veriyi yükle
     scored_data = load_scored_data(scored_filepath)
@@ -101,22 +257,41 @@ def update_rankings_history(scored_filepath: str, history_filepath: str = "data/
     # Ranking oluştur
     ranking_data = create_ranking_for_date(scored_data)
     
-    # History'yi yükle
-    history = load_rankings_history(history_filepath)
+    # Eski tek dosyalık geçmiş varsa bir kereliğine parçalara aktar
+    if not history_store.exists(history_dir):
+        history_store.migrate_legacy(history_dir=history_dir)
     
-    # Yeni ranking'i ekle
-    if date in history:
+    known_dates = history_store.dates(history_dir)
+    if date in known_dates:
         logger.warning(f"{date} tarihi zaten mevcut, güncelleniyor...")
     
-    history[date] = ranking_data
+    # Yeni ranking'i ekle (gün aynı sıralamayla zaten varsa yazılmaz)
+    changed = history_store.append_day(date, ranking_data, history_dir)
     
-    # Kaydet
-    save_rankings_history(history, history_filepath)
+    # Haftalık / aylık toplamları güncelle
+    aggregates = load_aggregates(aggregates_filepath)
+    if aggregates is not None and not changed:
+        logger.info(f"{date} sıralaması değişmedi, geçmiş ve dönem toplamları olduğu gibi kaldı")
+        print_ranking_summary(ranking_data, date)
+        return ranking_data
+    if aggregates is None:
+        history = history_store.load_range(history_dir=history_dir)
+    else:
+        # Önceki günün penceresinden düşenler ile bu günü içeren dönemler
+        longest = max(AGGREGATE_PERIODS.values())
+        earlier = [d for d in known_dates if d < date]
+        start = datetime.strptime(earlier[0] if earlier else date, "%Y-%m-%d")
+        end = datetime.strptime(date, "%Y-%m-%d") + timedelta(days=longest - 1)
+        history = history_store.load_range(
+            (start - timedelta(days=longest - 1)).strftime("%Y-%m-%d"),
+            end.strftime("%Y-%m-%d"), history_dir)
+    aggregates = update_aggregates(history, date, aggregates)
+    save_aggregates(aggregates, aggregates_filepath)
     
     logger.info(f"✅ {date} tarihi için ranking eklendi")
     print_ranking_summary(ranking_data, date)
     
-    return history
+    return ranking_data
 
 
 def print_ranking_summary(ranking_data: Dict, date: str):
@@ -147,14 +322,24 @@ def print_ranking_summary(ranking_data: Dict, date: str):
 
 def main():
     """Ana fonksiyon"""
-    import sys
+    parser = argparse.ArgumentParser(description='AIstrolog burç ranking oluşturucu')
+    parser.add_argument('scored_file', nargs='?',
+                        help='Scored JSON dosyası (varsayılan: bugünün ya da en son dosya)')
+    parser.add_argument('--export', nargs='?', const=history_store.LEGACY_FILE, metavar='PATH',
+                        help='Geçmişi eski tek dosya biçiminde dışa aktar '
+                             f'(varsayılan: {history_store.LEGACY_FILE})')
+    args = parser.parse_args()
     
     logger.info("AIstrolog Ranker başlatılıyor...")
     logger.info(f"Tarih: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     try:
+        if args.export:
+            save_rankings_history(args.export)
+            return
+        
         # Dosya parametresi kontrol et
-        if len(sys.argv) < 2:
+        if not args.scored_file:
             # Bugünün dosyasını otomatik bul
             today = datetime.now().strftime("%Y-%m-%d")
             input_file = f"data/scored_processed_daily_raw_{today}.json"
@@ -171,7 +356,7 @@ def main():
                     print("Kullanım: python ranker.py [scored_file.json]")
                     return
         else:
-            input_file = sys.argv[1]
+            input_file = args.scored_file
         
         # Rankings history'yi güncelle
         update_rankings_history(input_file)
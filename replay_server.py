@@ -0,0 +1,263 @@
+"""
+AIstrolog - Replay Sunucusu
+Kayıtlı HTML snapshot'larını (snapshots/) yerel bir HTTP sunucusundan, sitelerin
+yerine geçecek şekilde sunar. Scraper `--base-url` ile bu sunucuya yönlendirilince
+canlı sitelere çıkmadan uçtan uca çalışır; hız limiti, eş zamanlılık, tekrar
+deneme ve devre kesici davranışı gerçek HTTP üzerinden ölçülebilir.
+
+Adres şeması (scraper'ın --base-url yeniden yazımıyla aynı):
+    https://www.milliyet.com.tr/pembenar/...  ->  http://127.0.0.1:8765/www.milliyet.com.tr/pembenar/...
+
+URL'lerdeki tarih ('04-aralik-2025') eşleştirmede yok sayılır; böylece scraper
+bugünün tarihiyle istese de snapshot gününün sayfası döner.
+
+Gecikme ve hata enjeksiyonu --seed ile deterministiktir: her istek için kullanılan
+rastgele sayı (seed, sayfa, sayfanın kaçıncı isteği) üçlüsünden türetilir, yani
+thread sırası sonucu değiştirmez.
+
+Kullanım:
+    python replay_server.py                                  # en son snapshot günü, :8765
+    python replay_server.py --date 2025-12-04 --latency 200 --jitter 100
+    python replay_server.py --error-rate 0.1 --drop-rate 0.05 --seed 42
+    python scraper.py --base-url http://127.0.0.1:8765 --no-snapshots
+
+    curl http://127.0.0.1:8765/_stats                        # sunulan istek sayıları
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from sites import AY_ISIMLERI
+from snapshots import SNAPSHOT_DIR, SnapshotStore, available_dates
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+
+# URL'lerdeki '04-aralik-2025' / '4-aralik-2025' biçimli tarihler
+URL_DATE_PATTERN = re.compile(
+    r'\d{1,2}-(?:' + '|'.join(AY_ISIMLERI.values()) + r')-\d{4}'
+)
+
+# Gövde gönderilirken bant genişliği sınırı için parça boyutu (byte)
+CHUNK_SIZE = 8 * 1024
+
+
+def route_key(host: str, path: str) -> str:
+    """Host + path'ten tarihi yok sayan eşleştirme anahtarı üretir"""
+    return URL_DATE_PATTERN.sub('{date}', f"{host}{path or '/'}")
+
+
+def load_routes(store: SnapshotStore) -> Dict[str, Tuple[str, str]]:
+    """
+    Günün tüm sitelerinin manifest'lerini okuyup eşleştirme anahtarı ->
+    (site, snapshot anahtarı) tablosu oluşturur.
+    """
+    routes = {}
+    day_dir = os.path.join(store.root, store.date)
+    for site in sorted(os.listdir(day_dir)):
+        for key, url in store.manifest(site).items():
+            parsed = urlparse(url)
+            routes[route_key(parsed.netloc, parsed.path)] = (site, key)
+    return routes
+
+
+class ReplayConfig:
+    """Sunucunun sayfa tablosu, enjeksiyon ayarları ve istek sayaçları"""
+
+    def __init__(self, store: SnapshotStore, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503,
+                 retry_after: Optional[int] = None, drop_rate: float = 0.0,
+                 bandwidth: Optional[float] = None, seed: int = 0):
+        self.store = store
+        self.routes = load_routes(store)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.drop_rate = drop_rate
+        self.bandwidth = bandwidth
+        self.seed = seed
+        self.stats = Counter()
+        self._hits = Counter()
+        self._bodies: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def next_rng(self, route: str) -> random.Random:
+        """Sayfanın bir sonraki isteği için deterministik rastgele sayı üreteci"""
+        with self._lock:
+            self._hits[route] += 1
+            count = self._hits[route]
+        return random.Random(f"{self.seed}:{route}:{count}")
+
+    def body(self, route: str) -> Optional[bytes]:
+        """Sayfanın gövdesini döner (ilk okumadan sonra bellekten)"""
+        with self._lock:
+            body = self._bodies.get(route)
+        if body is None and route in self.routes:
+            body = self.store.load(*self.routes[route])
+            with self._lock:
+                self._bodies[route] = body
+        return body
+
+    def count(self, outcome: str):
+        with self._lock:
+            self.stats[outcome] += 1
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """/<host>/<path> isteklerini snapshot'lardan yanıtlar"""
+
+    protocol_version = 'HTTP/1.1'
+    config: ReplayConfig = None
+
+    def do_GET(self):
+        config = self.config
+        if self.path == '/_stats':
+            with config._lock:
+                payload = dict(config.stats)
+            return self._send(200, json.dumps(payload).encode('utf-8'), 'application/json')
+
+        path = unquote(urlparse(self.path).path)
+        host, _, rest = path.lstrip('/').partition('/')
+        route = route_key(host, '/' + rest)
+        rng = config.next_rng(route)
+
+        delay = config.latency + rng.uniform(0, config.jitter)
+        if delay:
+            time.sleep(delay / 1000)
+
+        if rng.random() < config.drop_rate:
+            # Bağlantıyı yanıt vermeden kapat (connection reset benzeri)
+            config.count('dropped')
+            self.close_connection = True
+            return
+        if rng.random() < config.error_rate:
+            config.count(str(config.error_status))
+            headers = {'Retry-After': str(config.retry_after)} if config.retry_after is not None else {}
+            return self._send(config.error_status, b'injected error', 'text/plain', headers)
+
+        body = config.body(route)
+        if body is None:
+            config.count('404')
+            logger.warning(f"Snapshot yok: {host}{'/' + rest}")
+            return self._send(404, b'not found', 'text/plain')
+
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            config.count('304')
+            return self._send(304, b'', None, {'ETag': etag})
+
+        config.count('200')
+        self._send(200, body, 'text/html; charset=utf-8', {'ETag': etag}, config.bandwidth)
+
+    def _send(self, status: int, body: bytes, content_type: Optional[str],
+              headers: Optional[Dict[str, str]] = None, bandwidth: Optional[float] = None):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not body:
+            return
+        try:
+            if not bandwidth:
+                self.wfile.write(body)
+                return
+            # KB/sn sınırı: gövde parça parça, aralarında bekleyerek gönderilir
+            for start in range(0, len(body), CHUNK_SIZE):
+                self.wfile.write(body[start:start + CHUNK_SIZE])
+                time.sleep(CHUNK_SIZE / (bandwidth * 1024))
+        except (BrokenPipeError, ConnectionResetError):
+            # İstemci gövdenin tamamını beklemeden bağlantıyı kapattı (örn. stream_until)
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # İstemcinin keep-alive bağlantıyı kapatması hata değildir
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+
+def make_server(config: ReplayConfig, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> ReplayServer:
+    """Verilen ayarlarla replay sunucusunu oluşturur (port=0 ise boş port seçilir)"""
+    handler = type('Handler', (ReplayHandler,), {'config': config})
+    return ReplayServer((host, port), handler)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Komut satırı argümanlarını okur"""
+    parser = argparse.ArgumentParser(description="Snapshot'ları siteler yerine sunan yerel HTTP sunucusu")
+    parser.add_argument('--date', help="Snapshot günü (varsayılan: en son gün)")
+    parser.add_argument('--snapshot-dir', default=SNAPSHOT_DIR)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--latency', type=float, default=0.0, help="Her yanıttan önceki sabit gecikme (ms)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Gecikmeye eklenen 0..jitter ms rastgele süre")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Hata dönülecek istek oranı (0-1)")
+    parser.add_argument('--error-status', type=int, default=503, help="Enjekte edilen hata kodu (varsayılan: 503)")
+    parser.add_argument('--retry-after', type=int, help="Hata yanıtlarına eklenecek Retry-After (sn)")
+    parser.add_argument('--drop-rate', type=float, default=0.0,
+                        help="Yanıt vermeden bağlantısı kapatılacak istek oranı (0-1)")
+    parser.add_argument('--bandwidth', type=float, help="Bağlantı başına gönderim hızı sınırı (KB/sn)")
+    parser.add_argument('--seed', type=int, default=0, help="Gecikme/hata enjeksiyonu için seed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    dates = available_dates(args.snapshot_dir)
+    date = args.date or (dates[-1] if dates else None)
+    if not date or date not in dates:
+        logger.error(f"{args.snapshot_dir} içinde {date or 'hiç'} snapshot yok. Önce 'python scraper.py' çalıştırın.")
+        raise SystemExit(1)
+
+    config = ReplayConfig(
+        SnapshotStore(args.snapshot_dir, date),
+        latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, error_status=args.error_status,
+        retry_after=args.retry_after, drop_rate=args.drop_rate,
+        bandwidth=args.bandwidth, seed=args.seed,
+    )
+    server = make_server(config, args.host, args.port)
+    base_url = f"http://{args.host}:{server.server_port}"
+    logger.info(f"🎞 {date} snapshot'larından {len(config.routes)} sayfa sunuluyor: {base_url}")
+    logger.info(f"   python scraper.py --base-url {base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Sunulan istekler: {dict(config.stats)}")
+
+
+if __name__ == "__main__":
+    main()
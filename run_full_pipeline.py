@@ -16,6 +16,9 @@ import sys
 import os
 from datetime import datetime
 
+import categorize_horoscopes
+import storage
+
 def run_command(cmd, description):
     """Run a shell command and handle errors."""
     print(f"\n{'='*60}")
@@ -40,6 +43,12 @@ def main():
     print("Steps: Scrape → Categorize → Summarize → Score → Rank → Test")
     print("="*60)
     
+    # Every step also writes to the SQLite store the API reads from (see storage.py)
+    os.environ.setdefault(storage.DB_ENV, storage.DEFAULT_DB)
+    # Word stems found by the categorizer are reused across daily runs
+    os.environ.setdefault(categorize_horoscopes.STEM_CACHE_ENV,
+                          categorize_horoscopes.DEFAULT_STEM_CACHE)
+    
     # Get today's date for filenames
     today = datetime.now().strftime('%Y-%m-%d')
     
@@ -112,7 +121,8 @@ def main():
     print(f"   Categorized:     {processed_file}")
     print(f"   Summarized:      {summary_file}")
     print(f"   Scored:          {scored_file}")
-    print(f"   Rankings:        data/rankings_history.json")
+    print(f"   Rankings:        data/rankings_history/")
+    print(f"   Store:           {os.environ[storage.DB_ENV]}")
     
     # Show file sizes
     if os.path.exists(raw_file):
@@ -7,10 +7,14 @@ import json
 import logging
 import os
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from difflib import SequenceMatcher
 from collections import defaultdict
 
+import content_index
+import storage
+from phrasematch import PhraseMatcher
+
 # Logging konfigürasyonu
 logging.basicConfig(
     level=logging.INFO,
@@ -154,6 +158,16 @@ CATEGORY_KEYWORDS = {
     }
 }
 
+# Tüm listelerdeki kelimeler tek eşleştiricide: metin başına tek tarama (bkz. phrasematch.py)
+LEXICON_MATCHER = PhraseMatcher(
+    list(POSITIVE_WORDS) + list(NEGATIVE_WORDS) + [
+        word
+        for lists in CATEGORY_KEYWORDS.values()
+        for words in lists.values()
+        for word in words
+    ]
+)
+
 # ==================== YARDIMCI FONKSİYONLAR ====================
 
 def clean_text(text: str) -> str:
@@ -175,9 +189,10 @@ def is_duplicate(text1: str, text2: str, threshold: float = 0.95) -> bool:
     return text_similarity(text1, text2) >= threshold
 
 
-def validate_category_keywords(text: str, category: str) -> bool:
+def validate_category_keywords(text: str, category: str, found: Optional[Set[str]] = None) -> bool:
     """
     Bir metnin belirtilen kategori için uygun keyword içerip içermediğini kontrol eder.
+    found verilirse (metinde geçen liste kelimeleri) metin yeniden taranmaz.
     """
     if category == 'genel':
         return True
@@ -185,18 +200,21 @@ def validate_category_keywords(text: str, category: str) -> bool:
     if category not in CATEGORY_KEYWORDS:
         return False
     
-    text_lower = text.lower()
+    if found is None:
+        found = LEXICON_MATCHER.found(text.lower())
     keywords = CATEGORY_KEYWORDS[category]['keywords']
     
     # En az 1 keyword bulunmalı
-    return any(kw in text_lower for kw in keywords)
+    return any(kw in found for kw in keywords)
 
 
 # ==================== SENTIMENT ANALİZİ ====================
 
-def calculate_sentiment_score(text: str, category: str = 'genel') -> Dict:
+def calculate_sentiment_score(text: str, category: str = 'genel',
+                              hits: Optional[Dict[str, int]] = None) -> Dict:
     """
-    Metinden sentiment skoru hesaplar.
+    Metinden sentiment skoru hesaplar. hits verilirse (LEXICON_MATCHER.counts sonucu)
+    metin yeniden taranmaz.
     
     Returns:
         {
@@ -214,7 +232,9 @@ def calculate_sentiment_score(text: str, category: str = 'genel') -> Dict:
     if not text or text == 'null':
         return None
     
-    text_lower = text.lower()
+    # Metinde geçen tüm liste kelimeleri ve sayıları (text_lower.count ile aynı)
+    if hits is None:
+        hits = LEXICON_MATCHER.counts(text.lower())
     
     # Pozitif ve negatif kelime sayıları
     positive_score = 0
@@ -222,17 +242,16 @@ def calculate_sentiment_score(text: str, category: str = 'genel') -> Dict:
     positive_count = 0
     negative_count = 0
     
-    # Pozitif kelimeleri say
-    for word, weight in POSITIVE_WORDS.items():
-        if word in text_lower:
-            count = text_lower.count(word)
+    for word, count in hits.items():
+        # Pozitif kelimeleri say
+        weight = POSITIVE_WORDS.get(word)
+        if weight:
             positive_score += weight * count
             positive_count += count
-    
-    # Negatif kelimeleri say
-    for word, weight in NEGATIVE_WORDS.items():
-        if word in text_lower:
-            count = text_lower.count(word)
+        
+        # Negatif kelimeleri say
+        weight = NEGATIVE_WORDS.get(word)
+        if weight:
             negative_score += abs(weight) * count  # Negatif değerleri pozitife çevir
             negative_count += count
     
@@ -241,12 +260,12 @@ def calculate_sentiment_score(text: str, category: str = 'genel') -> Dict:
     if category in CATEGORY_KEYWORDS:
         # Pozitif boost kelimeleri
         for boost_word in CATEGORY_KEYWORDS[category]['positive_boost']:
-            if boost_word in text_lower:
+            if boost_word in hits:
                 category_boost += 5  # Her boost kelimesi +5 puan
         
         # Negatif kelimeler (kategori spesifik)
         for neg_word in CATEGORY_KEYWORDS[category]['negative_words']:
-            if neg_word in text_lower:
+            if neg_word in hits:
                 category_boost -= 5  # Her negatif kelime -5 puan
     
     # Net skor hesapla
@@ -284,10 +303,13 @@ def calculate_sentiment_score(text: str, category: str = 'genel') -> Dict:
 
 # ==================== BURC SKORLAMA ====================
 
-def score_burc_category(texts: List[str], category: str, burc_name: str) -> Optional[Dict]:
+def score_burc_category(texts: List[str], category: str, burc_name: str,
+                        part_matches: Optional[List[List[Tuple[int, str]]]] = None) -> Optional[Dict]:
     """
     Bir burç kategorisi için skorlama yapar.
     Birden fazla kaynaktan gelen metinleri birleştirir ve skorlar.
+    part_matches verilirse (metinlerle aynı sırada LEXICON_MATCHER.matches(metin.lower())
+    sonuçları) birleşik metin baştan taranmaz, sadece birleşim yerlerine bakılır.
     """
     if not texts:
         return None
@@ -297,6 +319,8 @@ def score_burc_category(texts: List[str], category: str, burc_name: str) -> Opti
         texts = [texts]
     
     # Boş metinleri filtrele
+    if part_matches is not None:
+        part_matches = [found for t, found in zip(texts, part_matches) if t and t != 'null']
     texts = [t for t in texts if t and t != 'null']
     
     if not texts:
@@ -304,15 +328,20 @@ def score_burc_category(texts: List[str], category: str, burc_name: str) -> Opti
     
     # Tüm metinleri birleştir
     combined_text = ' '.join(texts)
+    hits = None
+    if part_matches is not None:
+        hits = PhraseMatcher.counts_of(LEXICON_MATCHER.joined_matches(
+            [t.lower() for t in texts], part_matches))
     
     # Kategori keyword kontrolü (genel hariç)
     if category != 'genel':
-        if not validate_category_keywords(combined_text, category):
+        if not validate_category_keywords(combined_text, category,
+                                          None if hits is None else set(hits)):
             logger.warning(f"{burc_name} - '{category}' kategorisinde uygun keyword bulunamadı")
             return None
     
     # Sentiment analizi yap
-    sentiment_result = calculate_sentiment_score(combined_text, category)
+    sentiment_result = calculate_sentiment_score(combined_text, category, hits)
     
     if sentiment_result:
         return {
@@ -325,10 +354,11 @@ def score_burc_category(texts: List[str], category: str, burc_name: str) -> Opti
     return None
 
 
-def score_burc(burc_name: str, burc_data: Dict) -> Dict:
+def score_burc(burc_name: str, burc_data: Dict, matches: Optional[Dict] = None) -> Dict:
     """
     Bir burç için tüm kategorilerde skorlama yapar.
     Duplikasyon kontrolü yapar.
+    matches: kategori -> metinlerin eşleşmeleri (bkz. score_burc_category, score_all_burcs)
     """
     scores = {
         'genel': None,
@@ -384,7 +414,7 @@ def score_burc(burc_name: str, burc_data: Dict) -> Dict:
             texts = burc_data.get(cat, [])
             if not isinstance(texts, list):
                 texts = [texts]
-            scores[cat] = score_burc_category(texts, cat, burc_name)
+            scores[cat] = score_burc_category(texts, cat, burc_name, (matches or {}).get(cat))
     
     # Toplam skor hesapla (ağırlıklı ortalama)
     valid_scores = {}
@@ -406,11 +436,15 @@ def score_burc(burc_name: str, burc_data: Dict) -> Dict:
 
 # ==================== GENEL SKORLAMA VE SIRALAMA ====================
 
-def score_all_burcs(processed_data: Dict) -> Dict:
+def score_all_burcs(processed_data: Dict, index: Optional[Dict] = None) -> Dict:
     """
     Tüm burçlar için skorlama yapar.
     processed_data formatı: {"site": {"Koç": {"genel": [...], "aşk": [...], ...}, ...}, ...}
     Veya: {"Koç": {"genel": [...], "aşk": [...], ...}, ...}
+    
+    Site bazlı veride birden fazla hücrede geçen metinler (index: içerik tablosunun
+    'processed' bölümü, verilmezse veriden üretilir; bkz. content_index.py) bir kez
+    taranır, eşleşmeleri kopya hücrelerde de kullanılır.
     """
     logger.info("Tüm burçlar için skorlama başlıyor...")
     
@@ -422,6 +456,11 @@ def score_all_burcs(processed_data: Dict) -> Dict:
         # Site bazlı format: {"milliyet": {"Koç": {...}}, "hurriyet": {"Koç": {...}}}
         logger.info("Site bazlı format tespit edildi, burç verileri birleştiriliyor...")
         merged_data = {}
+        shared = content_index.shared_refs(
+            content_index.build(processed_data) if index is None else index)
+        # asıl hücre -> eşleşmeler; burç -> kategori -> metinlerin eşleşmeleri
+        cell_matches = {}
+        merged_matches = {}
         
         for site_name, site_data in processed_data.items():
             for burc_name, burc_data in site_data.items():
@@ -432,6 +471,7 @@ def score_all_burcs(processed_data: Dict) -> Dict:
                         'para': [],
                         'sağlık': []
                     }
+                    merged_matches[burc_name] = {cat: [] for cat in merged_data[burc_name]}
                 
                 # Her kategoriyi birleştir
                 for cat in ['genel', 'aşk', 'para', 'sağlık']:
@@ -439,10 +479,23 @@ def score_all_burcs(processed_data: Dict) -> Dict:
                     if content and content != 'null' and content is not None:
                         if isinstance(content, list):
                             merged_data[burc_name][cat].extend(content)
+                            merged_matches[burc_name][cat].extend(
+                                LEXICON_MATCHER.matches(text.lower()) if text else [] for text in content)
+                            continue
+                        merged_data[burc_name][cat].append(content)
+                        ref = (site_name, burc_name, cat)
+                        canonical = shared.get(ref)
+                        if canonical in cell_matches and \
+                                content_index.cell_text(processed_data, canonical) == content:
+                            found = cell_matches[canonical]
                         else:
-                            merged_data[burc_name][cat].append(content)
+                            found = cell_matches[ref] = LEXICON_MATCHER.matches(content.lower())
+                        merged_matches[burc_name][cat].append(found)
         
         processed_data = merged_data
+        logger.info(f"{len(processed_data)} burç verisi birleştirildi ({len(cell_matches)} farklı metin tarandı)")
+    else:
+        merged_matches = {}
         logger.info(f"{len(processed_data)} burç verisi birleştirildi")
     
     all_scores = {}
@@ -453,7 +506,7 @@ def score_all_burcs(processed_data: Dict) -> Dict:
             continue
         
         logger.info(f"{burc} skorlanıyor...")
-        burc_score = score_burc(burc, processed_data[burc])
+        burc_score = score_burc(burc, processed_data[burc], merged_matches.get(burc))
         all_scores[burc] = burc_score
         
         # Issue varsa logla
@@ -568,6 +621,11 @@ def save_scored_data(scores: Dict, rankings: Dict, output_dir: str = "data"):
         json.dump(output_data, f, ensure_ascii=False, indent=2)
     
     logger.info(f"Skorlar kaydedildi: {filepath}")
+    
+    db_path = storage.db_path()
+    if db_path:
+        rows = storage.write_scores(db_path, today, scores, rankings)
+        logger.info(f"🗄 {rows} skor satırı {db_path} deposuna yazıldı")
     return filepath
 
 
@@ -676,8 +734,9 @@ def main():
         # Veriyi yükle
         processed_data = load_processed_data(input_file)
         
-        # Skorlama yap
-        scores = score_all_burcs(processed_data)
+        # Skorlama yap (tekrar eden metinler içerik tablosundan, bir kez)
+        scores = score_all_burcs(processed_data,
+                                 content_index.load(input_file, 'processed', processed_data))
         
         # Sıralama yap
         rankings = rank_burcs(scores)
@@ -1,18 +1,32 @@
 """
 AIstrolog - Profesyonel Web Scraping Sistemi
 Çeşitli haber/burç sitelerinden günlük burç yorumlarını toplar.
+
+Siteler sites.py'deki SITES kayıtlarıyla tanımlanır; bu modül tüm siteleri
+aynı motorla (scrape_site) çeker, parse eder, zamanlar ve kaydeder.
 """
 
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+import argparse
+import hashlib
 import json
 import logging
 import os
-import random
-import re
+import threading
 import time
-from datetime import datetime
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import content_index
+import fetcher
+import sites
+import storage
+import textnorm
+from fetcher import fetch, fetch_all
+from sites import BURCLAR, SITES, date_addressable, missing_pages, page_urls
+from snapshots import SNAPSHOT_DIR, SnapshotStore, available_dates
 
 # Logging konfigürasyonu
 logging.basicConfig(
@@ -25,825 +39,310 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Sabit burç listesi
-BURCLAR = [
-    "Koç", "Boğa", "İkizler", "Yengeç", "Aslan", "Başak",
-    "Terazi", "Akrep", "Yay", "Oğlak", "Kova", "Balık"
-]
-
-# Burç URL slug'ları
-BURC_SLUGS = {
-    "Koç": "koc",
-    "Boğa": "boga",
-    "İkizler": "ikizler",
-    "Yengeç": "yengec",
-    "Aslan": "aslan",
-    "Başak": "basak",
-    "Terazi": "terazi",
-    "Akrep": "akrep",
-    "Yay": "yay",
-    "Oğlak": "oglak",
-    "Kova": "kova",
-    "Balık": "balik"
-}
-
-# Burç isim normalizasyonu için mapping
-BURC_NORMALIZATION = {
-    "koc": "Koç", "koç": "Koç", "aries": "Koç",
-    "boga": "Boğa", "boğa": "Boğa", "taurus": "Boğa",
-    "ikizler": "İkizler", "gemini": "İkizler",
-    "yengec": "Yengeç", "yengeç": "Yengeç", "cancer": "Yengeç",
-    "aslan": "Aslan", "leo": "Aslan",
-    "basak": "Başak", "başak": "Başak", "virgo": "Başak",
-    "terazi": "Terazi", "libra": "Terazi",
-    "akrep": "Akrep", "scorpio": "Akrep",
-    "yay": "Yay", "sagittarius": "Yay",
-    "oglak": "Oğlak", "oğlak": "Oğlak", "capricorn": "Oğlak",
-    "kova": "Kova", "aquarius": "Kova",
-    "balik": "Balık", "balık": "Balık", "pisces": "Balık"
-}
-
-# User agent listesi
-USER_AGENTS = [
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
-    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-]
-
-
-def clean_text(text: str) -> str:
-    """Metni temizler: whitespace, satır sonu vb."""
-    if not text:
-        return ""
-    return ' '.join(text.strip().split())
-
-
-def normalize_burc_name(name: str) -> Optional[str]:
-    """Burç ismini normalize eder"""
-    if not name:
-        return None
-    
-    # Özel durumlar için direkt mapping (Hurriyet'te büyük harf sorunları için)
-    special_cases = {
-        "İKİZLER": "İkizler",
-        "IKIZLER": "İkizler",
-        "TERAZİ": "Terazi",
-        "TERAZI": "Terazi",
-    }
-    
-    clean_name_upper = name.strip().upper()
-    if clean_name_upper in special_cases:
-        return special_cases[clean_name_upper]
-    
-    clean_name = name.strip().lower()
-    normalized = BURC_NORMALIZATION.get(clean_name)
-    if normalized:
-        return normalized
-    # Direkt eşleşme kontrolü
-    for burc in BURCLAR:
-        if burc.lower() == clean_name:
-            return burc
-    return None
-
-
-def get_random_headers() -> Dict[str, str]:
-    """Random user agent döner - Accept-Encoding REMOVED to avoid brotli issues"""
-    return {
-        'User-Agent': random.choice(USER_AGENTS),
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
-        # NOTE: Accept-Encoding removed - requests will handle this automatically
-        # and some sites (like elele.com.tr) return broken brotli when we set it
-        'Connection': 'keep-alive',
-    }
-
-
-def random_sleep():
-    """1-3 saniye arası random bekler"""
-    time.sleep(random.uniform(1, 3))
+# Paylaşılan sabitler ve yardımcılar sites.py'de tanımlı
+CATEGORIES = ["genel", "aşk", "para", "sağlık"]
 
+# False yapılırsa tüm sayfalar eskisi gibi tam ağaç olarak parse edilir
+FAST_PARSE = True
 
-def create_empty_burc_dict() -> Dict:
-    """Boş burç dictionary'si oluşturur - SADECE sonuç initialize için kullanılır"""
-    return {burc: {"genel": None, "aşk": None, "para": None, "sağlık": None} for burc in BURCLAR}
+# False yapılırsa stream_until tanımlı sayfalar da sonuna kadar indirilir
+STREAMING = True
 
+# Ham veri ayrıca bu SQLite deposuna yazılır (None ise sadece JSON; bkz. storage.py)
+DB_PATH = storage.db_path()
 
-# SCRAPING FONKSİYONLARI - HER SİTE İÇİN AYRI
+# Değişmemiş (cache'ten gelen) sayfaların parse sonucu yeniden kullanılsın mı
+REUSE_PARSED = True
 
-def scrape_milliyet() -> Optional[Dict]:
-    """Milliyet.com.tr'den burç yorumlarını çeker"""
-    logger.info("Milliyet scrape başladı...")
-    results = create_empty_burc_dict()
-    
-    try:
-        for burc_name, slug in BURC_SLUGS.items():
-            try:
-                url = f"https://www.milliyet.com.tr/pembenar/astroloji/{slug}-burcu-gunluk-yorum/"
-                response = requests.get(url, headers=get_random_headers(), timeout=10)
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.content, 'lxml')
-                
-                # HTML yapısına göre içeriği çek
-                content_div = soup.select_one('.horoscope-tabs__content__main-inner')
-                
-                if content_div:
-                    # Tüm p etiketlerini al
-                    paragraphs = content_div.find_all('p')
-                    
-                    yorum_dict = {"genel": None, "aşk": None, "para": None, "sağlık": None}
-                    
-                    # Tüm paragrafları birleştir - hepsini genel'e ekle (etiketleri temizleyerek)
-                    all_texts = []
-                    
-                    # Kategori etiketleri (temizlemek için)
-                    category_labels = ['iş:', 'aşk:', 'para:', 'kariyer:', 'sağlık:', 'ilişkiler:']
-                    
-                    for p in paragraphs:
-                        text = clean_text(p.get_text())
-                        if text and len(text) > 5:
-                            # Kategori etiketlerini temizle
-                            text_clean = text
-                            for label in category_labels:
-                                # Case-insensitive replace
-                                if text_clean.lower().startswith(label):
-                                    text_clean = text_clean[len(label):].strip()
-                                    break
-                                # Etiket cümle içinde de olabilir
-                                text_clean = re.sub(rf'\b{label}\s*', '', text_clean, flags=re.IGNORECASE)
-                            
-                            all_texts.append(text_clean)
-                        
-                        text_lower = text.lower()
-                        
-                        # Ayrıca kategorilere göre de ayır
-                        if text_lower.startswith('para:'):
-                            yorum_dict["para"] = text.split(':', 1)[1].strip() if ':' in text else text
-                        elif text_lower.startswith('sağlık:'):
-                            yorum_dict["sağlık"] = text.split(':', 1)[1].strip() if ':' in text else text
-                        elif 'aşk' in text_lower and ('ilişki' in text_lower or 'i̇lişki' in text_lower):
-                            yorum_dict["aşk"] = text.split(':', 1)[1].strip() if ':' in text else text
-                    
-                    # Tüm metni genel'e ekle (etiketler temizlenmiş haliyle)
-                    if all_texts:
-                        yorum_dict["genel"] = ' '.join(all_texts)
-                    
-                    results[burc_name] = yorum_dict
-                    logger.info(f"Milliyet - {burc_name} tamamlandı")
-                
-                random_sleep()
-                
-            except Exception as e:
-                logger.error(f"Milliyet - {burc_name} error: {e}")
-                continue
-        
-        logger.info("Milliyet scrape tamamlandı")
-        return results
-        
-    except Exception as e:
-        logger.error(f"Milliyet scraping error: {e}")
-        return None
+# Çalıştırma boyunca toplanan (gün, kayıt) çiftleri (write_metrics ile yazılır);
+# gün, kaydın ait olduğu veri günüdür (backfill) ya da None (çalıştırmanın günü)
+_metrics: List[Tuple[Optional[str], Dict]] = []
+_metrics_lock = threading.Lock()
 
 
-def scrape_hurriyet() -> Optional[Dict]:
-    """Hurriyet.com.tr'den burç yorumlarını çeker - Ana sayfadaki widget'tan tüm burçları alır"""
-    logger.info("Hurriyet scrape başladı...")
-    results = create_empty_burc_dict()
-    
-    try:
-        # Ana astroloji sayfasını çek - tüm burçlar burada
-        url = "https://www.hurriyet.com.tr/mahmure/astroloji/"
-        response = requests.get(url, headers=get_random_headers(), timeout=10)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # Zodiac widget içindeki tüm burç açıklamalarını al
-        widget_descriptions = soup.select('.zodiac-widget-description-wrapper')
-        
-        if not widget_descriptions:
-            logger.warning("Hurriyet - Zodiac widget bulunamadı")
-            return results
-        
-        # Her bir burç açıklamasını işle
-        for desc_wrapper in widget_descriptions:
-            try:
-                # Burç ismini al (link içinden)
-                title_elem = desc_wrapper.select_one('.zodiac-widget-description-wrapper-title a')
-                if not title_elem:
-                    continue
-                
-                title_text = clean_text(title_elem.get_text())
-                # "KOÇ BURCU" -> "Koç" gibi normalize et
-                burc_name_raw = title_text.replace('BURCU', '').replace('BURÇ', '').strip()
-                burc_name = normalize_burc_name(burc_name_raw)
-                
-                if not burc_name:
-                    logger.warning(f"Hurriyet - Burç ismi normalize edilemedi: {burc_name_raw}")
-                    continue
-                
-                # Burç yorumunu al
-                text_elem = desc_wrapper.select_one('.zodiac-widget-description-wrapper-text .truncate')
-                if text_elem:
-                    yorum = clean_text(text_elem.get_text())
-                    
-                    if yorum and len(yorum) > 20:
-                        results[burc_name]["genel"] = yorum
-                        logger.info(f"Hurriyet - {burc_name} tamamlandı")
-                
-            except Exception as e:
-                logger.error(f"Hurriyet - Burç işleme hatası: {e}")
-                continue
-        
-        logger.info("Hurriyet scrape tamamlandı")
-        return results
-        
-    except Exception as e:
-        logger.error(f"Hurriyet scraping error: {e}")
-        return None
-
-def scrape_haberturk() -> Optional[Dict]:
-    """Haberturk Hayat'tan burç yorumlarını çeker - gunun-yorumu sayfasından günlük link bulur"""
-    logger.info("Haberturk scrape başladı...")
-    results = create_empty_burc_dict()
-    
-    try:
-        # Günün yorumu sayfasından günlük burç yorumları linkini bul
-        main_url = "https://hthayat.haberturk.com/astroloji/gunun-yorumu"
-        response = requests.get(main_url, headers=get_random_headers(), timeout=10)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # Günlük burç yorumu linkini ara - figcaption içinde title içeren bağlantıyı bul
-        daily_link = None
-        today = datetime.now()
-        
-        # figcaption içindeki bağlantıları ara
-        figcaptions = soup.find_all('figcaption')
-        for figcaption in figcaptions:
-            # h2.title içinde "Günlük burç yorumları" içeren linki ara
-            title_heading = figcaption.find('h2', class_='title')
-            if title_heading and 'günlük burç yorumları' in title_heading.get_text().lower():
-                # Parent <a> tag'ini bul
-                parent_link = figcaption.find_parent('a', href=True)
-                if parent_link:
-                    href = parent_link['href']
-                    daily_link = href if href.startswith('http') else f"https://hthayat.haberturk.com{href}"
-                    break
-        
-        # Alternatif yöntem: link içinde 'gunluk-burc-yorumlari' içeren bağlantıyı ara
-        if not daily_link:
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if 'gunluk-burc-yorumlari' in href.lower():
-                    daily_link = href if href.startswith('http') else f"https://hthayat.haberturk.com{href}"
-                    break
-        
-        if not daily_link:
-            logger.warning("Haberturk - Günlük burç yorumları linki bulunamadı")
-            return results
-        
-        logger.info(f"Haberturk - Günlük link bulundu: {daily_link}")
-        
-        # Günlük sayfayı çek
-        response = requests.get(daily_link, headers=get_random_headers(), timeout=10)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # Sayfadaki tüm burç yorumlarını çek
-        figcaptions = soup.find_all('figcaption')
-        
-        for fig in figcaptions:
-            text = clean_text(fig.get_text())
-            text_upper = text.upper()  # Türkçe büyük harfe çevir
-            
-            # Burç ismini bul - hem Türkçe hem İngilizce büyük harf versiyonları
-            for burc_name in BURCLAR:
-                burc_upper_tr = burc_name.upper()  # İKİZLER, TERAZİ (Türkçe)
-                burc_upper_en = burc_name.replace('İ', 'I').replace('i', 'I').upper()  # IKIZLER, TERAZI (İngilizce)
-                
-                # Her iki versiyonu da kontrol et
-                found = False
-                search_term = None
-                
-                if burc_upper_tr in text_upper[:200]:  # 100'den 200'e çıkardık
-                    found = True
-                    search_term = burc_upper_tr
-                elif burc_upper_en in text_upper[:200]:
-                    found = True
-                    search_term = burc_upper_en
-                
-                if found and search_term:
-                    # Orijinal text'te arama yap (case-insensitive)
-                    # İlk önce Türkçe versiyonu dene
-                    if search_term in text_upper:
-                        idx = text_upper.index(search_term)
-                        burc_text = text[idx + len(search_term):].replace('GÜNLÜK BURÇ YORUMU', '').replace('Günlük Burç Yorumu', '').strip()
-                        
-                        if burc_text and len(burc_text) > 20:
-                            results[burc_name]["genel"] = burc_text
-                            logger.info(f"Haberturk - {burc_name} tamamlandı")
-                    break
-        
-        random_sleep()
-        logger.info("Haberturk scrape tamamlandı")
-        return results
-        
-    except Exception as e:
-        logger.error(f"Haberturk scraping error: {e}")
-        return None
+def make_soup(response, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Response'u parse eder; hızlı modda sadece parse_only container'ını ağaca alır"""
+    if FAST_PARSE and parse_only is not None:
+        return BeautifulSoup(response.content, 'lxml', parse_only=parse_only)
+    return BeautifulSoup(response.content, 'lxml')
 
 
-def scrape_elele() -> Optional[Dict]:
-    """Elele.com.tr'den burç yorumlarını çeker"""
-    logger.info("Elele scrape başladı...")
+def create_empty_burc_dict() -> Dict:
+    """Boş burç dictionary'si oluşturur - SADECE sonuç initialize için kullanılır"""
+    return {burc: {category: None for category in CATEGORIES} for burc in BURCLAR}
+
+
+@lru_cache(maxsize=None)
+def _parser_fingerprint() -> str:
+    """Parse kodunun sürümü: sites.py / textnorm.py değişince cache'teki parse sonuçları geçersizleşir"""
+    source = b''
+    for module in (sites, textnorm):
+        with open(module.__file__, 'rb') as f:
+            source += f.read()
+    return hashlib.sha1(source + str(FAST_PARSE).encode()).hexdigest()
+
+
+def parse_page(site: Dict, key: str, response):
+    """
+    Sayfayı sitenin parse fonksiyonuyla işler.
+
+    Sayfa HTTP cache'ten geldiyse (TTL içinde ya da 304) gövde bir önceki
+    çalıştırmadakiyle aynıdır; o gövdenin parse sonucu cache'te varsa sayfa
+    yeniden parse edilmez.
+    """
+    cache = fetcher.get_cache()
+    if cache is None:
+        return site['parse'](make_soup(response, site.get('parse_only')), key, site)
+
+    fingerprint = hashlib.sha1(response.content + _parser_fingerprint().encode()).hexdigest()
+    if REUSE_PARSED and getattr(response, 'from_cache', False):
+        cached = cache.get_parsed(response.url, fingerprint)
+        if cached is not None:
+            return cached['result']
+
+    result = site['parse'](make_soup(response, site.get('parse_only')), key, site)
+    cache.put_parsed(response.url, fingerprint, result)
+    return result
+
+
+def count_cells(data: Optional[Dict]) -> int:
+    """Dolu (None olmayan) kategori hücrelerini sayar; per_sign parse sonucu da kabul edilir"""
+    if not data:
+        return 0
+    if all(isinstance(v, dict) for v in data.values()):
+        return sum(count_cells(v) for v in data.values())
+    return sum(v is not None for v in data.values())
+
+
+def record_metric(record: Dict, date: Optional[str] = None):
+    """
+    Metrik kaydını çalıştırmanın metrik listesine ekler (thread-safe). date, kaydın
+    ait olduğu veri günüdür (YYYY-MM-DD); verilmezse kayıt çalıştırmanın tamamına aittir.
+    """
+    with _metrics_lock:
+        _metrics.append((date, record))
+
+
+def _request_metric(site_name: str, key: str, url: Optional[str], response=None) -> Dict:
+    """Sayfa isteği için metrik kaydı; response varsa fetcher'ın ölçtüğü süreler eklenir"""
+    record = {'type': 'request', 'site': site_name, 'key': key, 'url': url}
+    if response is not None:
+        # Süreler önce eklenir; url/status/bytes her zaman response'tan gelir
+        record.update(getattr(response, 'timings', {}))
+        record.update(
+            url=response.url or url,
+            status=response.status_code,
+            bytes=len(response.content),
+        )
+    return record
+
+
+def write_metrics(run_id: str, output_dir: str = "data", date: Optional[str] = None) -> List[str]:
+    """
+    Toplanan metrikleri daily_raw dosyasının yanına scrape_metrics_YYYY-MM-DD.jsonl
+    olarak ekler (her satır bir JSON kaydı; aynı gün birden fazla çalıştırma
+    run alanıyla ayrılır).
+
+    Günü verilen kayıtlar (backfill) o günün dosyasına yazılır; günü olmayan kayıtlar
+    (çalıştırma özeti) kayıt yazılan her güne, hiç günlü kayıt yoksa date'e
+    (varsayılan: bugün) yazılır.
+
+    Returns:
+        Yazılan dosya yolları (gün sırasıyla)
+    """
+    with _metrics_lock:
+        records = list(_metrics)
+        _metrics.clear()
+    if not records:
+        return []
+
+    by_day: Dict[str, List[Dict]] = {}
+    for day, record in records:
+        if day:
+            by_day.setdefault(day, []).append(record)
+    shared = [record for day, record in records if not day]
+    if not by_day:
+        by_day[date or datetime.now().strftime("%Y-%m-%d")] = []
+
+    os.makedirs(output_dir, exist_ok=True)
+    filepaths = []
+    for day in sorted(by_day):
+        filepath = os.path.join(output_dir, f"scrape_metrics_{day}.jsonl")
+        day_records = by_day[day] + shared
+        with open(filepath, 'a', encoding='utf-8') as f:
+            for record in day_records:
+                f.write(json.dumps(dict(record, run=run_id), ensure_ascii=False) + '\n')
+        logger.info(f"{len(day_records)} metrik kaydı {filepath} dosyasına yazıldı")
+        filepaths.append(filepath)
+    return filepaths
+
+
+def scrape_site(site_name: str, date: Optional[datetime] = None,
+                keys: Optional[List[str]] = None) -> Optional[Dict]:
+    """
+    SITES'taki kayda göre bir sitenin sayfalarını çeker ve parse eder.
+    Her sayfa için bir 'request', site için bir 'site' metrik kaydı üretir.
+
+    Args:
+        site_name: SITES anahtarı
+        date: URL şablonlarındaki {date} için kullanılacak gün (varsayılan: bugün)
+        keys: Sadece bu sayfaları çek (burç / kategori adı); varsayılan tüm sayfalar
+
+    Returns:
+        burç -> kategori -> metin; site tamamen başarısız olursa None
+    """
+    site = SITES[site_name]
+    label = site['label']
+    logger.info(f"{label} scrape başladı...")
     results = create_empty_burc_dict()
-    
+    site_start = time.perf_counter()
+    # Geçmiş gün çekilirken metrikler o günün dosyasına yazılır
+    day = date.strftime("%Y-%m-%d") if date else None
+    summary = {'type': 'site', 'site': site_name, 'pages': 0, 'failed_pages': 0,
+               'bytes': 0, 'parse_ms': 0.0}
+
+    def finish(data: Optional[Dict], error: Optional[str] = None) -> Optional[Dict]:
+        summary.update(
+            cells=count_cells(data),
+            parse_ms=round(summary['parse_ms'], 1),
+            elapsed_ms=round((time.perf_counter() - site_start) * 1000, 1),
+        )
+        if error:
+            summary['error'] = error
+        record_metric(summary, day)
+        return data
+
+    def track(record: Dict):
+        summary['pages'] += 1
+        summary['bytes'] += record.get('bytes', 0)
+        summary['parse_ms'] += record.get('parse_ms', 0.0)
+        if 'error' in record or record.get('status') != 200:
+            summary['failed_pages'] += 1
+        record_metric(record, day)
+
     try:
-        for burc_name, slug in BURC_SLUGS.items():
+        urls = page_urls(site, date, keys)
+
+        # Asıl sayfanın linki index sayfasından bulunur (örn. Haberturk)
+        if 'follow' in site:
+            index = fetch(urls['index'], key='index')
+            record = _request_metric(site_name, 'index', urls['index'], index)
+            parse_start = time.perf_counter()
+            daily_link = site['follow'](make_soup(index))
+            record['parse_ms'] = round((time.perf_counter() - parse_start) * 1000, 1)
+            track(record)
+            if not daily_link:
+                logger.warning(f"{label} - Günlük sayfa linki bulunamadı")
+                return finish(results)
+            logger.info(f"{label} - Günlük link bulundu: {daily_link}")
+            urls = {'daily': daily_link}
+
+        responses = fetch_all(urls, stream_until=site.get('stream_until') if STREAMING else None)
+
+        for key, response in responses.items():
+            record = _request_metric(site_name, key, urls[key])
             try:
-                url = f"https://www.elele.com.tr/astroloji/burclar/{slug}"
-                response = requests.get(url, headers=get_random_headers(), timeout=10)
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.content, 'lxml')
-                
-                # .news-content div'i içindeki içeriği al
-                content_div = soup.select_one('.news-content')
-                
-                if content_div:
-                    # p etiketini al
-                    p_tag = content_div.find('p')
-                    
-                    if p_tag:
-                        # Metni al ve temizle
-                        text = clean_text(p_tag.get_text())
-                        
-                        # "14 Kasım 2025 Günlük Burç Yorumu:" gibi prefix'leri kaldır
-                        if text and ':' in text:
-                            parts = text.split(':', 1)
-                            if len(parts) > 1 and len(parts[1].strip()) > 20:
-                                text = parts[1].strip()
-                        
-                        # En az 20 karakter olmalı
-                        if text and len(text) > 20:
-                            results[burc_name]["genel"] = text
-                            logger.info(f"Elele - {burc_name} tamamlandı")
-                
-                random_sleep()
-                
-            except Exception as e:
-                logger.error(f"Elele - {burc_name} error: {e}")
-                continue
-        
-        logger.info("Elele scrape tamamlandı")
-        return results
-        
-    except Exception as e:
-        logger.error(f"Elele scraping error: {e}")
-        return None
+                if isinstance(response, Exception):
+                    raise response
+                record = _request_metric(site_name, key, urls[key], response)
+                if response.status_code != 200:
+                    logger.warning(f"{label} - {key} HTTP {response.status_code}")
+                    continue
 
+                parse_start = time.perf_counter()
+                parsed = parse_page(site, key, response)
+                record['parse_ms'] = round((time.perf_counter() - parse_start) * 1000, 1)
+                record['cells'] = count_cells(parsed)
 
-def scrape_onedio() -> Optional[Dict]:
-    """Onedio.com'dan burç yorumlarını çeker - Her kategoride 12 figcaption var (her burç için bir tane)"""
-    logger.info("Onedio scrape başladı...")
-    results = create_empty_burc_dict()
-    
-    try:
-        today = datetime.now()
-        date_str = today.strftime("%d-%B-%Y").lower()  # 21-kasim-2025 formatı
-        
-        # Türkçe ay isimleri
-        ay_map = {
-            'january': 'ocak', 'february': 'subat', 'march': 'mart', 'april': 'nisan',
-            'may': 'mayis', 'june': 'haziran', 'july': 'temmuz', 'august': 'agustos',
-            'september': 'eylul', 'october': 'ekim', 'november': 'kasim', 'december': 'aralik'
-        }
-        
-        for eng, tr in ay_map.items():
-            date_str = date_str.replace(eng, tr)
-        
-        # Kategoriler: genel, aşk, para, sağlık
-        categories = {
-            'genel': f"https://onedio.com/astroloji/gunluk-burc-yorumuna-gore-{date_str}-gunun-nasil-gececek",
-            'aşk': f'https://onedio.com/astroloji/gunluk-ask-burc-yorumuna-gore-{date_str}-gunun-nasil-gececek',
-            'para': f'https://onedio.com/astroloji/gunluk-para-burc-yorumuna-gore-{date_str}-gunun-nasil-gececek',
-            'sağlık': f'https://onedio.com/astroloji/gunluk-saglik-burc-yorumuna-gore-{date_str}-gunun-nasil-gececek'
-        }
-        
-        # Her kategori için tüm burçları al
-        for category_name, category_url in categories.items():
-            try:
-                response = requests.get(category_url, headers=get_random_headers(), timeout=10)
-                response.encoding = 'utf-8'
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'lxml')
-                    
-                    # Tüm figcaption'ları al (her biri bir burç için)
-                    figcaptions = soup.find_all('figcaption')
-                    
-                    for figcaption in figcaptions:
-                        paragraphs = figcaption.find_all('p')
-                        full_text = ' '.join([clean_text(p.get_text()) for p in paragraphs])
-                        
-                        # Hangi burç için olduğunu bul
-                        for burc_name in BURCLAR:
-                            if f'Sevgili {burc_name}' in full_text:
-                                # "Sevgili Burç," kısmından sonrasını al
-                                burc_yorum = full_text.split(f'Sevgili {burc_name}', 1)[1].strip()
-                                # Virgül varsa kaldır
-                                if burc_yorum.startswith(','):
-                                    burc_yorum = burc_yorum[1:].strip()
-                                
-                                results[burc_name][category_name] = burc_yorum
-                                break
-                    
-                    logger.info(f"Onedio - {category_name} kategorisi tamamlandı")
-                
-                random_sleep()
-            
-            except Exception as e:
-                logger.error(f"Onedio - {category_name} kategori hatası: {e}")
+                if site['pages'] == 'per_sign':
+                    if parsed is not None:
+                        results[key].update(parsed)
+                        logger.info(f"{label} - {key} tamamlandı")
+                else:
+                    for burc_name, categories in parsed.items():
+                        results[burc_name].update(categories)
+                    logger.info(f"{label} - {key} tamamlandı ({len(parsed)} burç)")
+
+            except fetcher.CircuitOpenError as e:
+                # Host çökmüş, kalan sayfalar istek atılmadan atlanır
+                logger.warning(f"{label} - {key} atlandı: {e}")
+                record['error'] = f"{type(e).__name__}: {e}"
                 continue
-        
-        logger.info("Onedio scrape tamamlandı")
-        return results
-        
-    except Exception as e:
-        logger.error(f"Onedio scraping error: {e}")
-        return None
-
 
-def scrape_mynet() -> Optional[Dict]:
-    """Mynet.com'dan burç yorumlarını çeker"""
-    logger.info("Mynet scrape başladı...")
-    results = create_empty_burc_dict()
-    
-    try:
-        for burc_name, slug in BURC_SLUGS.items():
-            try:
-                url = f"https://www.mynet.com/kadin/burclar-astroloji/{slug}-burcu-gunluk-yorumu.html"
-                response = requests.get(url, headers=get_random_headers(), timeout=10)
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.content, 'lxml')
-                
-                # #contextual div içindeki .detail-content-inner'ı bul
-                content_div = soup.select_one('#contextual .detail-content-inner')
-                
-                if content_div:
-                    # p etiketini al
-                    p_tag = content_div.find('p')
-                    
-                    if p_tag:
-                        text = clean_text(p_tag.get_text())
-                        
-                        if text and len(text) > 20:
-                            results[burc_name]["genel"] = text
-                            logger.info(f"Mynet - {burc_name} tamamlandı")
-                
-                random_sleep()
-                
             except Exception as e:
-                logger.error(f"Mynet - {burc_name} error: {e}")
+                logger.error(f"{label} - {key} error: {e}")
+                record['error'] = f"{type(e).__name__}: {e}"
                 continue
-        
-        logger.info("Mynet scrape tamamlandı")
-        return results
-        
-    except Exception as e:
-        logger.error(f"Mynet scraping error: {e}")
-        return None
 
+            finally:
+                track(record)
+
+        logger.info(f"{label} scrape tamamlandı")
+        return finish(results)
 
-def scrape_twitburc() -> Optional[Dict]:
-    """Twitburc.com.tr'den burç yorumlarını çeker"""
-    logger.info("Twitburc scrape başladı...")
-    results = create_empty_burc_dict()
-    
-    try:
-        for burc_name, slug in BURC_SLUGS.items():
-            try:
-                url = f"https://twitburc.com.tr/burclar/{slug}"
-                response = requests.get(url, headers=get_random_headers(), timeout=10)
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.content, 'lxml')
-                
-                # Tüm tab-pane'leri bul
-                # Sıralama: 1. Hakkında, 2. Dün, 3. Günlük, 4. Haftalık, 5. Aylık, 6. Yıllık
-                tab_panes = soup.find_all('div', class_='tab-pane')
-                
-                target_pane = None
-                if len(tab_panes) >= 3:
-                    # 3. pane (index 2) Günlük yorumdur
-                    target_pane = tab_panes[2]
-                elif tab_panes:
-                    # Eğer 3 tane yoksa, active olanı veya ilkini dene (fallback)
-                    target_pane = soup.find('div', class_='tab-pane active') or tab_panes[0]
-                
-                if target_pane:
-                    # "Günlük Yorumu" veya "Günün Ruh Hali" içeren bölümü bul
-                    # Bazen h2 içinde olmayabilir, direkt p'leri alalım
-                    
-                    paragraphs = target_pane.find_all('p')
-                    
-                    # Başlıkları filtrele ve sadece yorum metnini al
-                    text_parts = []
-                    for p in paragraphs:
-                        text = clean_text(p.get_text())
-                        
-                        # Burç özellikleri gibi uzun metinleri atla
-                        if 'BURCU ÖZELLİKLERİ' in text or 'Grubun:' in text or 'Şanslı' in text:
-                            continue
-                        
-                        # Başlıkları temizle
-                        if text.startswith('Günün Ruh Hali:'):
-                            text = text.replace('Günün Ruh Hali:', '').strip()
-                        
-                        if text and len(text) > 20:
-                            text_parts.append(text)
-                    
-                    if text_parts:
-                        full_text = ' '.join(text_parts)
-                        results[burc_name]["genel"] = full_text
-                        logger.info(f"Twitburc - {burc_name} tamamlandı")
-                    else:
-                        logger.warning(f"Twitburc - {burc_name} metin bulunamadı")
-                else:
-                    logger.warning(f"Twitburc - {burc_name} için tab-pane bulunamadı")
-                
-                random_sleep()
-                
-            except Exception as e:
-                logger.error(f"Twitburc - {burc_name} error: {e}")
-                continue
-        
-        logger.info("Twitburc scrape tamamlandı")
-        return results
-        
     except Exception as e:
-        logger.error(f"Twitburc scraping error: {e}")
-        return None
+        logger.error(f"{label} scraping error: {e}")
+        return finish(None, error=f"{type(e).__name__}: {e}")
 
 
-def scrape_vogue() -> Optional[Dict]:
-    """Vogue.com.tr'den burç yorumlarını çeker - Günlük burç yorumları sayfasından"""
-    logger.info("Vogue scrape başladı...")
-    results = create_empty_burc_dict()
-    
+# ANA FONKSİYONLAR
+
+def run_scraper(site_name: str, date: Optional[datetime] = None,
+                keys: Optional[List[str]] = None) -> Optional[Dict]:
+    """Tek bir siteyi scrape eder, beklenmeyen hataları None'a çevirir"""
     try:
-        # Bugünkü tarih için URL oluştur
-        today = datetime.now()
-        date_str = today.strftime("%d-%B-%Y").lower()  # 14-kasim-2025 formatı
-        
-        # Türkçe ay isimlerine çevir
-        ay_map = {
-            'january': 'ocak', 'february': 'subat', 'march': 'mart', 'april': 'nisan',
-            'may': 'mayis', 'june': 'haziran', 'july': 'temmuz', 'august': 'agustos',
-            'september': 'eylul', 'october': 'ekim', 'november': 'kasim', 'december': 'aralik'
-        }
-        
-        for eng, tr in ay_map.items():
-            date_str = date_str.replace(eng, tr)
-        
-        url = f"https://vogue.com.tr/astroloji/gunluk-burc-yorumlari-{date_str}"
-        response = requests.get(url, headers=get_random_headers(), timeout=10)
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.content, 'lxml')
-        
-        # category-detail__content div'ini bul
-        content_div = soup.select_one('.category-detail__content')
-        
-        if content_div:
-            # Tüm h2 ve p etiketlerini sırayla al
-            current_burc = None
-            
-            for element in content_div.find_all(['h2', 'p']):
-                if element.name == 'h2':
-                    # Burç ismini bul
-                    h2_text = element.get_text(strip=True)
-                    
-                    # "ve yükselen" kısmını temizle
-                    if ' ve yükselen' in h2_text:
-                        burc_text = h2_text.split(' ve yükselen')[0].strip()
-                    else:
-                        burc_text = h2_text
-                    
-                    # Burç ismini normalize et
-                    current_burc = normalize_burc_name(burc_text)
-                
-                elif element.name == 'p' and current_burc:
-                    # Görsel içeren p etiketlerini atla
-                    if element.find('img'):
-                        continue
-                    
-                    text = clean_text(element.get_text())
-                    
-                    if text and len(text) > 20:
-                        results[current_burc]["genel"] = text
-                        logger.info(f"Vogue - {current_burc} tamamlandı")
-                        current_burc = None  # Bir sonraki burca geç
-        
-        random_sleep()
-        logger.info("Vogue scrape tamamlandı")
-        return results
-        
+        with fetcher.site_context(site_name):
+            return scrape_site(site_name, date, keys)
     except Exception as e:
-        logger.error(f"Vogue scraping error: {e}")
+        logger.error(f"{site_name} beklenmeyen hata: {e}", exc_info=True)
         return None
 
 
-def scrape_gunlukburc() -> Optional[Dict]:
-    """Gunlukburc.net'den burç yorumlarını çeker"""
-    logger.info("Gunlukburc scrape başladı...")
-    results = create_empty_burc_dict()
-    
-    try:
-        for burc_name, slug in BURC_SLUGS.items():
-            try:
-                url = f"https://www.gunlukburc.net/gunluk-burc-yorumlari/{slug}.html"
-                response = requests.get(url, headers=get_random_headers(), timeout=10)
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.content, 'lxml')
-                
-                # div#agplay içindeki başlıkları ve paragrafları çek
-                content_div = soup.select_one('#agplay')
-                
-                if content_div:
-                    yorum_dict = {"genel": None, "aşk": None, "para": None, "sağlık": None}
-                    current_category = None
-                    
-                    # H2 ve p etiketlerini sırayla işle
-                    for element in content_div.find_all(['h2', 'p']):
-                        if element.name == 'h2':
-                            heading_text = clean_text(element.get_text()).lower()
-                            
-                            # Kategoriyi belirle
-                            if 'genel durum' in heading_text:
-                                current_category = "genel"
-                            elif 'aşk' in heading_text or 'ilişki' in heading_text:  # AND yerine OR
-                                current_category = "aşk"
-                            elif 'iş' in heading_text or 'kariyer' in heading_text:  # AND yerine OR
-                                current_category = "iş"
-                            elif 'maddi durum' in heading_text or 'para' in heading_text:
-                                current_category = "para"
-                            else:
-                                current_category = None
-                        
-                        elif element.name == 'p' and current_category:
-                            text = clean_text(element.get_text())
-                            text_lower = text.lower()
-                            
-                            # Tanıtım metinlerini filtrele
-                            skip_phrases = [
-                                'günlük yıldız falınız',
-                                'yıldız falınızı okuyun',
-                                'gününe özel',
-                                'gezegenler ve yıldızların',
-                                'burcu günlük yorumu'
-                            ]
-                            
-                            # Eğer tanıtım metni içeriyorsa atla
-                            if any(phrase in text_lower for phrase in skip_phrases):
-                                continue
-                            
-                            # Burç ismi içeren başlık metinlerini atla (örn: "Koç Burcu 17 Kasım...")
-                            if any(burc.lower() in text_lower for burc in BURCLAR) and len(text) < 150:
-                                continue
-                            
-                            # Yeterli uzunlukta metinleri al
-                            if text and len(text) > 50:
-                                # İş ve para kategorilerini birleştir
-                                if current_category == "iş":
-                                    if yorum_dict["para"]:
-                                        yorum_dict["para"] += " " + text
-                                    else:
-                                        yorum_dict["para"] = text
-                                else:
-                                    if yorum_dict[current_category]:
-                                        yorum_dict[current_category] += " " + text
-                                    else:
-                                        yorum_dict[current_category] = text
-                    
-                    results[burc_name] = yorum_dict
-                    logger.info(f"Gunlukburc - {burc_name} tamamlandı")
-                
-                random_sleep()
-                
-            except Exception as e:
-                logger.error(f"Gunlukburc - {burc_name} error: {e}")
-                continue
-        
-        logger.info("Gunlukburc scrape tamamlandı")
-        return results
-        
-    except Exception as e:
-        logger.error(f"Gunlukburc scraping error: {e}")
-        return None
+def _timed_run(site_name: str, timings: Dict[str, float],
+               keys: Optional[List[str]] = None) -> Optional[Dict]:
+    """run_scraper'ı çalıştırır ve sitenin süresini timings'e yazar"""
+    start = time.perf_counter()
+    result = run_scraper(site_name, keys=keys)
+    timings[site_name] = time.perf_counter() - start
+    return result
 
 
-def scrape_myburc() -> Optional[Dict]:
-    """Myburc.com'dan burç yorumlarını çeker"""
-    logger.info("Myburc scrape başladı...")
-    results = create_empty_burc_dict()
-    
-    try:
-        for burc_name, slug in BURC_SLUGS.items():
-            try:
-                url = f"https://www.myburc.com/gunluk-burc-yorumu/{slug}-burcu.htm"
-                response = requests.get(url, headers=get_random_headers(), timeout=10)
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.content, 'lxml')
-                
-                yorum_dict = {"genel": None, "aşk": None, "para": None, "sağlık": None}
-                
-                # Tab içeriklerini çek
-                tab_content = soup.select_one('#myTabContent')
-                
-                if tab_content:
-                    # Genel Durum - p.d-block.px-4 class'ına sahip paragrafı al
-                    genel_p = soup.select_one('p.d-block.px-4')
-                    if genel_p:
-                        yorum_dict["genel"] = clean_text(genel_p.get_text())
-                    else:
-                        # Alternatif: İlk tab içindeki ilk p
-                        genel_div = tab_content.select_one('#gununburcu')
-                        if not genel_div:
-                            genel_div = tab_content.find('div', class_='tab-pane')
-                        
-                        if genel_div:
-                            paragraphs = genel_div.find_all('p')
-                            if paragraphs:
-                                yorum_dict["genel"] = clean_text(paragraphs[0].get_text())
-                    
-                    # Aşk falı
-                    ask_div = tab_content.select_one('#gununaskfali')
-                    if ask_div:
-                        paragraphs = ask_div.find_all('p')
-                        if paragraphs:
-                            yorum_dict["aşk"] = clean_text(paragraphs[0].get_text())
-                    
-                    # İş & Kariyer falı
-                    is_div = tab_content.select_one('#gununisfali')
-                    if is_div:
-                        paragraphs = is_div.find_all('p')
-                        if paragraphs:
-                            is_text = clean_text(paragraphs[0].get_text())
-                            yorum_dict["para"] = is_text  # İş ve kariyeri para kategorisine ekle
-                    
-                    # Para falı - İki içeriği birleştir
-                    para_div = tab_content.select_one('#gununparafali')
-                    if para_div:
-                        # Tüm p etiketlerini al ve birleştir
-                        paragraphs = para_div.find_all('p')
-                        para_texts = []
-                        for p in paragraphs:
-                            para_text = clean_text(p.get_text())
-                            if para_text and len(para_text) > 20:
-                                para_texts.append(para_text)
-                        
-                        if para_texts:
-                            combined_para_text = ' '.join(para_texts)
-                            # İş falı varsa üzerine ekle, yoksa sadece para falını yaz
-                            if yorum_dict["para"]:
-                                yorum_dict["para"] += " " + combined_para_text
-                            else:
-                                yorum_dict["para"] = combined_para_text
-                    
-                    results[burc_name] = yorum_dict
-                    logger.info(f"Myburc - {burc_name} tamamlandı")
-                
-                random_sleep()
-                
-            except Exception as e:
-                logger.error(f"Myburc - {burc_name} error: {e}")
-                continue
-        
-        logger.info("Myburc scrape tamamlandı")
-        return results
-        
-    except Exception as e:
-        logger.error(f"Myburc scraping error: {e}")
-        return None
+def collect_all_data(workers: int = 1, site_names: Optional[List[str]] = None,
+                     pages: Optional[Dict[str, List[str]]] = None) -> Dict:
+    """
+    Sitelerden veri toplar.
 
-# ANA FONKSİYONLAR
+    workers > 1 ise farklı siteler paralel thread'lerde scrape edilir. Aynı host'a
+    giden istekler fetcher'daki host bazlı hız limitine tabi olduğu için siteler
+    paralel çalışsa da her siteye kibar aralıklarla istek atılır.
+
+    Args:
+        workers: Aynı anda scrape edilecek site sayısı
+        site_names: Sadece bu siteleri çalıştır (varsayılan: SITES'taki tüm siteler)
+        pages: site -> çekilecek sayfa anahtarları; verilmeyen sitelerin tüm sayfaları çekilir
+    """
+    site_names = site_names or list(SITES)
+    pages = pages or {}
+    timings: Dict[str, float] = {}
 
-def collect_all_data() -> Dict:
-    """Tüm sitelerden veri toplar"""
     logger.info("=" * 60)
-    logger.info("Tüm sitelerde scraping başlatılıyor...")
+    logger.info(f"Scraping başlatılıyor: {len(site_names)} site")
     logger.info("=" * 60)
     
-    all_results = {
-        "milliyet": scrape_milliyet(),
-        "hurriyet": scrape_hurriyet(),
-        "haberturk": scrape_haberturk(),
-        "elele": scrape_elele(),
-        "onedio": scrape_onedio(),
-        "mynet": scrape_mynet(),
-        "twitburc": scrape_twitburc(),
-        "vogue": scrape_vogue(),
-        "gunlukburc": scrape_gunlukburc(),
-        "myburc": scrape_myburc(),
-    }
+    if workers > 1:
+        workers = min(workers, len(site_names))
+        logger.info(f"Paralel mod: {workers} worker")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                name: executor.submit(_timed_run, name, timings, pages.get(name))
+                for name in site_names
+            }
+            all_results = {name: future.result() for name, future in futures.items()}
+    else:
+        all_results = {name: _timed_run(name, timings, pages.get(name)) for name in site_names}
+    
+    for site_name in site_names:
+        logger.info(f"⏱  {site_name:12} {timings[site_name]:6.2f} sn")
     
     # None olan siteleri kontrol et
     failed_sites = []
@@ -863,8 +362,13 @@ def collect_all_data() -> Dict:
     return all_results
 
 
-def save_to_json(data: Dict, output_dir: str = "data"):
-    """Verileri JSON dosyasına kaydeder"""
+def save_to_json(data: Dict, output_dir: str = "data", date: Optional[str] = None,
+                 merge: bool = False):
+    """
+    Verileri JSON dosyasına kaydeder (date verilmezse bugünün dosyasına).
+    merge=True ise dosyada zaten olan diğer sitelerin verisi korunur
+    (sadece bazı siteler çalıştırıldığında).
+    """
     # None olan siteleri filtrele
     filtered_data = {}
     failed_count = 0
@@ -888,33 +392,330 @@ def save_to_json(data: Dict, output_dir: str = "data"):
         logger.info(f"{output_dir} klasörü oluşturuldu")
     
     # Dosya adı: daily_raw_YYYY-MM-DD.json
-    today = datetime.now().strftime("%Y-%m-%d")
-    filename = f"daily_raw_{today}.json"
+    date = date or datetime.now().strftime("%Y-%m-%d")
+    filename = f"daily_raw_{date}.json"
     filepath = os.path.join(output_dir, filename)
     
-    # JSON'a kaydet
-    with open(filepath, 'w', encoding='utf-8') as f:
+    if merge and os.path.exists(filepath):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+        existing.update(filtered_data)
+        filtered_data = existing
+    
+    # JSON'a kaydet (yarım kalan yazma günün dosyasını bozmasın diye önce geçici dosyaya)
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(filtered_data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, filepath)
     
     logger.info(f"Veriler {filepath} dosyasına kaydedildi")
     logger.info(f"✅ {len(filtered_data)} site verisi kaydedildi")
     
+    write_content_index(filepath, filtered_data)
+    if DB_PATH:
+        rows = storage.write_texts(DB_PATH, 'raw', date, filtered_data)
+        logger.info(f"🗄 {rows} satır {DB_PATH} deposuna yazıldı")
     return filepath
 
 
-def main():
+def write_content_index(filepath: str, data: Dict):
+    """
+    Ham verideki tekrar eden metinlerin hash tablosunu (content_index.py) günün
+    dosyasının yanına yazar; sonraki aşamalar her metni bir kez işler.
+    """
+    index = content_index.write(filepath, 'raw', data)
+    copies = sum(len(cells) - 1 for cells in index.values())
+    if copies:
+        logger.info(f"🔁 {copies} hücre tekrar ({len(index)} farklı metin), tablo: {content_index.index_path(filepath)}")
+
+
+def merge_missing(existing: Dict, new_data: Dict) -> int:
+    """
+    Yeni çekilen verideki değerleri sadece mevcut verideki boş (None) hücrelere
+    yazar; dolu hücreler değiştirilmez. Doldurulan hücre sayısını döner.
+    """
+    filled = 0
+    for site_name, site_data in new_data.items():
+        if site_data is None:
+            continue
+        if not existing.get(site_name):
+            existing[site_name] = site_data
+            filled += sum(v is not None for cats in site_data.values() for v in cats.values())
+            continue
+        for burc_name, categories in site_data.items():
+            current = existing[site_name].setdefault(burc_name, {})
+            for category, text in categories.items():
+                if text is not None and current.get(category) is None:
+                    current[category] = text
+                    filled += 1
+    return filled
+
+
+def resume_day(workers: int = 1, output_dir: str = "data",
+               site_names: Optional[List[str]] = None):
+    """
+    Günün ham dosyasını okuyup sadece eksik kalan sayfaları yeniden çeker.
+
+    Her site için beklenen alanlardan (sites.py'deki fields) biri boş olan
+    burç/kategori sayfaları bulunur, yalnızca bunlar çekilir ve sonuç mevcut
+    dosyadaki boş hücrelere yazılır.
+
+    Returns:
+        (yeni çekilen veri, dosya yolu); eksik yoksa veri boş dict'tir
+    """
+    date = datetime.now().strftime("%Y-%m-%d")
+    filepath = os.path.join(output_dir, f"daily_raw_{date}.json")
+
+    existing = {}
+    if os.path.exists(filepath):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+    else:
+        logger.info(f"{filepath} bulunamadı, tüm siteler çekilecek")
+
+    pages = {}
+    for site_name in site_names or SITES:
+        keys = missing_pages(SITES[site_name], existing.get(site_name))
+        if keys:
+            pages[site_name] = keys
+            logger.info(f"Eksik: {site_name} -> {len(keys)} sayfa ({', '.join(keys)})")
+
+    if not pages:
+        logger.info("✅ Günün dosyasında eksik hücre yok, çekilecek sayfa kalmadı")
+        return {}, filepath
+
+    new_data = collect_all_data(workers=workers, site_names=list(pages), pages=pages)
+    filled = merge_missing(existing, new_data)
+    logger.info(f"{filled} boş hücre dolduruldu")
+
+    # Site sırası SITES'taki sırayı izlesin (eski dosyalardaki diğer siteler sona)
+    ordered = {name: existing[name] for name in SITES if name in existing}
+    ordered.update((name, data) for name, data in existing.items() if name not in ordered)
+    filepath = save_to_json(ordered, output_dir, date=date)
+    return new_data, filepath
+
+
+def backfill_days(start: datetime, end: datetime, workers: int = 1,
+                  output_dir: str = "data", site_names: Optional[List[str]] = None) -> List[str]:
+    """
+    Geçmiş günleri, adresleri tarihten üretilebilen sitelerden (sites.date_addressable:
+    onedio, vogue) çeker ve her gün için daily_raw_YYYY-MM-DD.json dosyasını yazar.
+
+    Günler en fazla workers kadarı aynı anda olacak şekilde paralel çekilir; aynı
+    host'a giden istekler yine host'un hız limitini paylaşır. Günün dosyası zaten
+    varsa sadece boş hücreleri doldurulur (diğer siteler ve dolu hücreler korunur).
+
+    Returns:
+        Yazılan dosya yolları (gün sırasıyla)
+    """
+    names = [name for name in (site_names or SITES) if date_addressable(SITES[name])]
+    skipped = [name for name in (site_names or SITES) if name not in names]
+    if skipped:
+        logger.info(f"Geçmiş günü çekilemeyen siteler atlanıyor: {', '.join(skipped)}")
+    if not names:
+        raise ValueError("Seçilen sitelerin hiçbirinin adresi tarihten üretilemiyor")
+
+    days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+    logger.info(f"Backfill: {len(days)} gün x {len(names)} site ({', '.join(names)})")
+
+    def run_day(day: datetime) -> Optional[str]:
+        date = day.strftime("%Y-%m-%d")
+        with fetcher.snapshot_day(date):
+            new_data = {name: run_scraper(name, date=day) for name in names}
+
+        cells = sum(count_cells(v) for v in new_data.values())
+        if not cells:
+            logger.warning(f"{date}: hiçbir siteden veri alınamadı, dosya yazılmadı")
+            return None
+
+        filepath = os.path.join(output_dir, f"daily_raw_{date}.json")
+        if not os.path.exists(filepath):
+            logger.info(f"{date}: {cells} hücre")
+            return save_to_json(new_data, output_dir, date=date)
+
+        with open(filepath, 'r', encoding='utf-8') as f:
+            existing = json.load(f)
+        filled = merge_missing(existing, new_data)
+        logger.info(f"{date}: mevcut dosyada {filled} boş hücre dolduruldu")
+        ordered = {name: existing[name] for name in SITES if name in existing}
+        ordered.update((name, data) for name, data in existing.items() if name not in ordered)
+        return save_to_json(ordered, output_dir, date=date)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        filepaths = list(executor.map(run_day, days))
+    return [path for path in filepaths if path]
+
+
+def reparse_snapshots(dates: List[str], snapshot_dir: str = SNAPSHOT_DIR,
+                      workers: int = 1, output_dir: str = "data",
+                      site_names: Optional[List[str]] = None) -> List[str]:
+    """
+    Kayıtlı snapshot'ları ağa çıkmadan yeniden parse eder ve her gün için
+    daily_raw_YYYY-MM-DD.json dosyasını yeniden yazar.
+
+    Args:
+        dates: İşlenecek günler; boşsa snapshot'ı olan tüm günler
+        site_names: Sadece bu siteleri yeniden parse et (diğerleri dosyada korunur)
+    """
+    dates = dates or available_dates(snapshot_dir)
+    if not dates:
+        raise ValueError(f"{snapshot_dir} içinde snapshot bulunamadı")
+    
+    filepaths = []
+    for date in dates:
+        logger.info(f"Snapshot'lardan yeniden parse ediliyor: {date}")
+        fetcher.configure(snapshot_store=SnapshotStore(snapshot_dir, date), replay=True)
+        all_data = collect_all_data(workers=workers, site_names=site_names)
+        try:
+            filepaths.append(save_to_json(all_data, output_dir, date=date, merge=bool(site_names)))
+        except ValueError as e:
+            logger.error(f"{date}: {e}")
+    
+    return filepaths
+
+
+def log_breakers():
+    """Hata gören host'ların devre kesici durumlarını özet olarak loglar"""
+    for host, state in fetcher.breaker_states().items():
+        if not state['failures']:
+            continue
+        status = "AÇIK" if state['state'] == 'open' else "kapalı"
+        message = (f"🔌 {host}: devre kesici {status} - {state['failures']} hata, "
+                   f"{state['successes']} başarılı, {state['rejected']} istek atlandı")
+        if state['state'] == 'open':
+            logger.warning(f"{message} (son hata: {state['last_error']})")
+        else:
+            logger.info(message)
+
+
+def parse_day(value: str) -> datetime:
+    """YYYY-MM-DD biçimindeki gün argümanını okur"""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Geçersiz gün: {value} (beklenen: YYYY-MM-DD)")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Komut satırı argümanlarını okur"""
+    parser = argparse.ArgumentParser(description="AIstrolog günlük burç yorumu scraper'ı")
+    parser.add_argument(
+        '--site', nargs='+', choices=list(SITES), metavar='SITE',
+        help="Sadece verilen siteleri çalıştır; günün dosyasındaki diğer siteler korunur "
+             f"({', '.join(SITES)})"
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help="Günün ham dosyasını okuyup sadece boş kalan site/burç/kategori "
+             "hücrelerinin sayfalarını yeniden çek"
+    )
+    parser.add_argument(
+        '--backfill', nargs=2, metavar=('BAŞLANGIÇ', 'BİTİŞ'), type=parse_day,
+        help="Verilen gün aralığını (YYYY-MM-DD, iki uç dahil) adresi tarihten üretilebilen "
+             "sitelerden (onedio, vogue) çekip her gün için daily_raw dosyası yaz; "
+             "--workers aynı anda çekilen gün sayısıdır"
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help="Aynı anda scrape edilecek site sayısı (varsayılan: 1, sıralı)"
+    )
+    parser.add_argument(
+        '--max-concurrent', type=int, default=fetcher.MAX_CONCURRENT_REQUESTS,
+        help="Tüm siteler toplamında aynı anda açık olabilecek istek sayısı"
+    )
+    parser.add_argument(
+        '--cache-dir', default=fetcher.CACHE_DIR,
+        help=f"HTTP cache klasörü (varsayılan: {fetcher.CACHE_DIR})"
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help="HTTP cache'i kullanma, tüm sayfaları yeniden indir"
+    )
+    parser.add_argument(
+        '--snapshot-dir', default=SNAPSHOT_DIR,
+        help=f"Ham HTML snapshot klasörü (varsayılan: {SNAPSHOT_DIR})"
+    )
+    parser.add_argument(
+        '--no-snapshots', action='store_true',
+        help="İndirilen sayfaların snapshot'ını kaydetme"
+    )
+    parser.add_argument(
+        '--base-url', metavar='URL',
+        help="İstekleri siteler yerine bu sunucuya gönder (https://host/path -> URL/host/path); "
+             "örn. replay_server.py ile http://127.0.0.1:8765"
+    )
+    parser.add_argument(
+        '--no-stream', action='store_true',
+        help="Tek container'lı sayfaları (hurriyet, haberturk, onedio, vogue) da "
+             "container kapanınca kesmeden sonuna kadar indir"
+    )
+    parser.add_argument(
+        '--db', metavar='YOL', default=storage.db_path(),
+        help=f"Ham veriyi JSON'un yanında bu SQLite deposuna da yaz "
+             f"(varsayılan: ${storage.DB_ENV}, örn. {storage.DEFAULT_DB})"
+    )
+    parser.add_argument(
+        '--no-metrics', action='store_true',
+        help="İstek/site metriklerini data/scrape_metrics_YYYY-MM-DD.jsonl dosyasına yazma"
+    )
+    parser.add_argument(
+        '--from-snapshots', nargs='*', metavar='YYYY-MM-DD',
+        help="Ağa çıkmadan kayıtlı snapshot'ları yeniden parse et "
+             "(gün verilmezse snapshot'ı olan tüm günler)"
+    )
+    args = parser.parse_args(argv)
+    if args.backfill and args.backfill[0] > args.backfill[1]:
+        parser.error("--backfill: başlangıç günü bitiş gününden sonra olamaz")
+    return args
+
+
+def main(argv=None):
     """Ana fonksiyon: Tüm işlemleri yönetir"""
+    args = parse_args(argv)
+    
+    global DB_PATH
+    DB_PATH = args.db
+    
+    if args.from_snapshots is not None:
+        filepaths = reparse_snapshots(args.from_snapshots, args.snapshot_dir, args.workers,
+                                      site_names=args.site)
+        logger.info(f"✅ {len(filepaths)} gün snapshot'lardan yeniden üretildi")
+        return
+    
+    global STREAMING
+    STREAMING = not args.no_stream
+    fetcher.configure(
+        max_concurrent=args.max_concurrent,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        snapshot_store=None if args.no_snapshots else SnapshotStore(args.snapshot_dir),
+        base_url=args.base_url
+    )
     start_time = time.time()
+    run_id = datetime.now().isoformat(timespec='seconds')
+    all_data = {}
     
     logger.info("AIstrolog Scraper başlatılıyor...")
     logger.info(f"Tarih: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
     try:
-        # Tüm siteleri scrape et
-        all_data = collect_all_data()
-        
-        # JSON'a kaydet
-        filepath = save_to_json(all_data)
+        if args.backfill:
+            # Geçmiş günleri çek; her gün kendi dosyasına yazılır
+            filepaths = backfill_days(*args.backfill, workers=args.workers,
+                                      site_names=args.site)
+            logger.info(f"✅ {len(filepaths)} günün dosyası yazıldı")
+            log_breakers()
+            return
+        if args.resume:
+            # Sadece eksik sayfaları çek, mevcut dosyayla birleştir
+            all_data, filepath = resume_day(workers=args.workers, site_names=args.site)
+            if not all_data:
+                return
+        else:
+            # Siteleri scrape et
+            all_data = collect_all_data(workers=args.workers, site_names=args.site)
+            
+            # JSON'a kaydet
+            filepath = save_to_json(all_data, merge=bool(args.site))
         
         # İstatistikler
         elapsed = time.time() - start_time
@@ -932,6 +733,7 @@ def main():
         if failed_sites > 0:
             logger.warning(f"❌ Başarısız siteler: {failed_sites}")
         
+        log_breakers()
         logger.info(f"Toplam süre: {elapsed:.2f} saniye")
         logger.info(f"Çıktı dosyası: {filepath}")
         logger.info("=" * 60)
@@ -945,6 +747,24 @@ def main():
     except Exception as e:
         logger.error(f"Ana işlem sırasında hata: {e}", exc_info=True)
         raise
+    
+    finally:
+        fetcher.close_session()
+        cache = fetcher.get_cache()
+        if cache is not None:
+            cache.prune()
+        
+        if not args.no_metrics:
+            record_metric({
+                'type': 'run',
+                'mode': 'backfill' if args.backfill else 'resume' if args.resume else 'full',
+                'sites': len(all_data),
+                'failed_sites': sum(1 for v in all_data.values() if v is None),
+                'cells': sum(count_cells(v) for v in all_data.values()),
+                'elapsed_ms': round((time.time() - start_time) * 1000, 1),
+                'breakers': fetcher.breaker_states(),
+            })
+            write_metrics(run_id)
 
 
 if __name__ == "__main__":
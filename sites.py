@@ -0,0 +1,593 @@
+"""
+AIstrolog - Site Tanımları
+Scraper'ın topladığı her site burada tek bir kayıtla tanımlanır; scraper.py'deki
+motor (scrape_site) bu kayıtları okuyup sayfaları çeker, parse eder ve sonuçları
+birleştirir. Yeni bir site eklemek için SITES'a kayıt eklemek yeterlidir.
+
+Kayıt alanları:
+    label:      Loglarda görünen site adı
+    pages:      'per_sign'     -> burç başına bir sayfa, url şablonunda {slug}
+                'single'       -> tek sayfa (snapshot anahtarı 'index')
+                'per_category' -> kategori başına bir sayfa, urls: kategori -> şablon
+    url / urls: Sayfa adres(ler)i; {date} yer tutucusu '04-aralik-2025' biçiminde doldurulur
+    follow:     (opsiyonel) index sayfasından asıl sayfanın linkini bulan fonksiyon;
+                bulunan sayfa 'daily' anahtarıyla çekilir
+    parse_only: (opsiyonel) hızlı parse modunda ağaca alınacak container (SoupStrainer)
+    stream_until: (opsiyonel) tek container'lı sayfalarda indirmenin kesilebileceği
+                kural (fetcher._stream_watcher); follow olan sitede sadece asıl
+                sayfaya uygulanır
+    selector:   Yorumun bulunduğu container'ın CSS selector'ı
+    parse:      Parse fonksiyonu, parse(soup, key, site) imzasıyla çağrılır
+                  per_sign  -> o burcun {kategori: metin} dict'i ya da None
+                  diğerleri -> {burç: {kategori: metin}}
+    fields:     Sitenin her burç için doldurması beklenen kategoriler; --resume
+                modunda bunlardan biri boş kalan sayfalar yeniden çekilir
+
+Siteye özgü diğer alanlar (kategori eşlemeleri, atlanacak ifadeler vb.) ilgili
+parse fonksiyonu tarafından okunur.
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bs4 import SoupStrainer
+
+from textnorm import (BURCLAR, BURCLAR_LOWER, LabelSet, clean_text, find_upper_sign,
+                      normalize_burc_name, sign_patterns)
+
+logger = logging.getLogger(__name__)
+
+# Burç URL slug'ları
+BURC_SLUGS = {
+    "Koç": "koc",
+    "Boğa": "boga",
+    "İkizler": "ikizler",
+    "Yengeç": "yengec",
+    "Aslan": "aslan",
+    "Başak": "basak",
+    "Terazi": "terazi",
+    "Akrep": "akrep",
+    "Yay": "yay",
+    "Oğlak": "oglak",
+    "Kova": "kova",
+    "Balık": "balik"
+}
+
+# URL'lerdeki Türkçe ay isimleri (21-kasim-2025 formatı)
+AY_ISIMLERI = {
+    1: 'ocak', 2: 'subat', 3: 'mart', 4: 'nisan', 5: 'mayis', 6: 'haziran',
+    7: 'temmuz', 8: 'agustos', 9: 'eylul', 10: 'ekim', 11: 'kasim', 12: 'aralik'
+}
+
+
+def url_date(date: datetime) -> str:
+    """Tarihi URL'lerde kullanılan '04-aralik-2025' biçimine çevirir"""
+    return f"{date.day:02d}-{AY_ISIMLERI[date.month]}-{date.year}"
+
+
+# Akış halinde indirmede "tüm burçlar geldi" kontrolü için burç adı desenleri.
+# IGNORECASE ile İKİZLER / IKIZLER gibi büyük harf yazımlar da eşleşir.
+SIGN_PATTERNS = sign_patterns(r'\b{name}\b', re.IGNORECASE)
+
+
+def _class_token(name: str):
+    """Çok sınıflı elementlerle de eşleşen class filtresi.
+    Parse sırasında SoupStrainer class değerini ham string ("tab-pane active")
+    olarak görür, düz string verilirse sadece tek sınıflı elementler eşleşir."""
+    return re.compile(rf'(?:^|\s){re.escape(name)}(?:\s|$)')
+
+
+# PARSE FONKSİYONLARI - BURÇ BAŞINA SAYFA
+
+def parse_milliyet(soup, burc_name: str, site: Dict) -> Optional[Dict]:
+    """Milliyet burç sayfası: tüm paragraflar genel'e, etiketli olanlar kategorilerine"""
+    content_div = soup.select_one(site['selector'])
+    if not content_div:
+        return None
+
+    # Tüm p etiketlerini al
+    paragraphs = content_div.find_all('p')
+
+    yorum_dict = {"genel": None, "aşk": None, "para": None, "sağlık": None}
+
+    # Tüm paragrafları birleştir - hepsini genel'e ekle (etiketleri temizleyerek)
+    all_texts = []
+
+    for p in paragraphs:
+        text = clean_text(p.get_text())
+        if text and len(text) > 5:
+            # Kategori etiketlerini temizle (başta ya da cümle içinde)
+            all_texts.append(site['category_labels'].strip(text))
+
+        text_lower = text.lower()
+
+        # Ayrıca kategorilere göre de ayır
+        if text_lower.startswith('para:'):
+            yorum_dict["para"] = text.split(':', 1)[1].strip() if ':' in text else text
+        elif text_lower.startswith('sağlık:'):
+            yorum_dict["sağlık"] = text.split(':', 1)[1].strip() if ':' in text else text
+        elif 'aşk' in text_lower and ('ilişki' in text_lower or 'i̇lişki' in text_lower):
+            yorum_dict["aşk"] = text.split(':', 1)[1].strip() if ':' in text else text
+
+    # Tüm metni genel'e ekle (etiketler temizlenmiş haliyle)
+    if all_texts:
+        yorum_dict["genel"] = ' '.join(all_texts)
+
+    return yorum_dict
+
+
+def parse_first_paragraph(soup, burc_name: str, site: Dict) -> Optional[Dict]:
+    """Container içindeki ilk paragrafı genel yorum olarak alır (Elele, Mynet)"""
+    content_div = soup.select_one(site['selector'])
+    if not content_div:
+        return None
+
+    p_tag = content_div.find('p')
+    if not p_tag:
+        return None
+
+    text = clean_text(p_tag.get_text())
+
+    # "14 Kasım 2025 Günlük Burç Yorumu:" gibi prefix'leri kaldır
+    if site.get('strip_prefix') and text and ':' in text:
+        parts = text.split(':', 1)
+        if len(parts) > 1 and len(parts[1].strip()) > 20:
+            text = parts[1].strip()
+
+    # En az 20 karakter olmalı
+    if text and len(text) > 20:
+        return {"genel": text}
+    return None
+
+
+def parse_twitburc(soup, burc_name: str, site: Dict) -> Optional[Dict]:
+    """Twitburc burç sayfası: günlük yorum sekmesindeki paragraflar"""
+    # Tüm tab-pane'leri bul
+    # Sıralama: 1. Hakkında, 2. Dün, 3. Günlük, 4. Haftalık, 5. Aylık, 6. Yıllık
+    tab_panes = soup.find_all('div', class_='tab-pane')
+
+    target_pane = None
+    if len(tab_panes) >= 3:
+        # 3. pane (index 2) Günlük yorumdur
+        target_pane = tab_panes[2]
+    elif tab_panes:
+        # Eğer 3 tane yoksa, active olanı veya ilkini dene (fallback)
+        target_pane = soup.find('div', class_='tab-pane active') or tab_panes[0]
+
+    if not target_pane:
+        logger.warning(f"Twitburc - {burc_name} için tab-pane bulunamadı")
+        return None
+
+    # Başlıkları filtrele ve sadece yorum metnini al
+    text_parts = []
+    for p in target_pane.find_all('p'):
+        text = clean_text(p.get_text())
+
+        # Burç özellikleri gibi uzun metinleri atla
+        if any(phrase in text for phrase in site['skip_phrases']):
+            continue
+
+        # Başlıkları temizle
+        if text.startswith('Günün Ruh Hali:'):
+            text = text.replace('Günün Ruh Hali:', '').strip()
+
+        if text and len(text) > 20:
+            text_parts.append(text)
+
+    if not text_parts:
+        logger.warning(f"Twitburc - {burc_name} metin bulunamadı")
+        return None
+
+    return {"genel": ' '.join(text_parts)}
+
+
+def parse_gunlukburc(soup, burc_name: str, site: Dict) -> Optional[Dict]:
+    """Gunlukburc burç sayfası: h2 başlıklarına göre kategorilere ayrılmış paragraflar"""
+    content_div = soup.select_one(site['selector'])
+    if not content_div:
+        return None
+
+    yorum_dict = {"genel": None, "aşk": None, "para": None, "sağlık": None}
+    current_category = None
+
+    # H2 ve p etiketlerini sırayla işle
+    for element in content_div.find_all(['h2', 'p']):
+        if element.name == 'h2':
+            heading_text = clean_text(element.get_text()).lower()
+
+            # Kategoriyi başlıktaki ilk eşleşen ifadeye göre belirle
+            current_category = None
+            for phrases, category in site['headings']:
+                if any(phrase in heading_text for phrase in phrases):
+                    current_category = category
+                    break
+
+        elif element.name == 'p' and current_category:
+            text = clean_text(element.get_text())
+            text_lower = text.lower()
+
+            # Tanıtım metinlerini atla
+            if any(phrase in text_lower for phrase in site['skip_phrases']):
+                continue
+
+            # Burç ismi içeren başlık metinlerini atla (örn: "Koç Burcu 17 Kasım...")
+            if any(burc in text_lower for burc in BURCLAR_LOWER) and len(text) < 150:
+                continue
+
+            # Yeterli uzunlukta metinleri al
+            if text and len(text) > 50:
+                if yorum_dict[current_category]:
+                    yorum_dict[current_category] += " " + text
+                else:
+                    yorum_dict[current_category] = text
+
+    return yorum_dict
+
+
+def parse_myburc(soup, burc_name: str, site: Dict) -> Optional[Dict]:
+    """Myburc burç sayfası: her kategori ayrı bir sekmede"""
+    tab_content = soup.select_one(site['selector'])
+    if not tab_content:
+        return None
+
+    yorum_dict = {"genel": None, "aşk": None, "para": None, "sağlık": None}
+
+    # Genel Durum - p.d-block.px-4 class'ına sahip paragrafı al
+    genel_p = soup.select_one('p.d-block.px-4')
+    if genel_p:
+        yorum_dict["genel"] = clean_text(genel_p.get_text())
+    else:
+        # Alternatif: İlk tab içindeki ilk p
+        genel_div = tab_content.select_one('#gununburcu')
+        if not genel_div:
+            genel_div = tab_content.find('div', class_='tab-pane')
+
+        if genel_div:
+            paragraphs = genel_div.find_all('p')
+            if paragraphs:
+                yorum_dict["genel"] = clean_text(paragraphs[0].get_text())
+
+    # Aşk falı
+    ask_div = tab_content.select_one('#gununaskfali')
+    if ask_div:
+        paragraphs = ask_div.find_all('p')
+        if paragraphs:
+            yorum_dict["aşk"] = clean_text(paragraphs[0].get_text())
+
+    # İş & Kariyer falı - para kategorisine eklenir
+    is_div = tab_content.select_one('#gununisfali')
+    if is_div:
+        paragraphs = is_div.find_all('p')
+        if paragraphs:
+            yorum_dict["para"] = clean_text(paragraphs[0].get_text())
+
+    # Para falı - İki içeriği birleştir
+    para_div = tab_content.select_one('#gununparafali')
+    if para_div:
+        para_texts = []
+        for p in para_div.find_all('p'):
+            para_text = clean_text(p.get_text())
+            if para_text and len(para_text) > 20:
+                para_texts.append(para_text)
+
+        if para_texts:
+            combined_para_text = ' '.join(para_texts)
+            # İş falı varsa üzerine ekle, yoksa sadece para falını yaz
+            if yorum_dict["para"]:
+                yorum_dict["para"] += " " + combined_para_text
+            else:
+                yorum_dict["para"] = combined_para_text
+
+    return yorum_dict
+
+
+# PARSE FONKSİYONLARI - TÜM BURÇLAR TEK SAYFADA
+
+def parse_hurriyet(soup, key: str, site: Dict) -> Dict:
+    """Hurriyet astroloji ana sayfasındaki zodiac widget'ından tüm burçlar"""
+    results = {}
+    widget_descriptions = soup.select(site['selector'])
+
+    if not widget_descriptions:
+        logger.warning("Hurriyet - Zodiac widget bulunamadı")
+        return results
+
+    for desc_wrapper in widget_descriptions:
+        # Burç ismini al (link içinden)
+        title_elem = desc_wrapper.select_one('.zodiac-widget-description-wrapper-title a')
+        if not title_elem:
+            continue
+
+        title_text = clean_text(title_elem.get_text())
+        # "KOÇ BURCU" -> "Koç" gibi normalize et
+        burc_name_raw = title_text.replace('BURCU', '').replace('BURÇ', '').strip()
+        burc_name = normalize_burc_name(burc_name_raw)
+
+        if not burc_name:
+            logger.warning(f"Hurriyet - Burç ismi normalize edilemedi: {burc_name_raw}")
+            continue
+
+        # Burç yorumunu al
+        text_elem = desc_wrapper.select_one('.zodiac-widget-description-wrapper-text .truncate')
+        if text_elem:
+            yorum = clean_text(text_elem.get_text())
+            if yorum and len(yorum) > 20:
+                results[burc_name] = {"genel": yorum}
+
+    return results
+
+
+def find_haberturk_daily_link(soup) -> Optional[str]:
+    """Haberturk 'günün yorumu' sayfasından günlük burç yorumları linkini bulur"""
+    # figcaption içindeki h2.title'da "Günlük burç yorumları" geçen bağlantıyı ara
+    for figcaption in soup.find_all('figcaption'):
+        title_heading = figcaption.find('h2', class_='title')
+        if title_heading and 'günlük burç yorumları' in title_heading.get_text().lower():
+            # Parent <a> tag'ini bul
+            parent_link = figcaption.find_parent('a', href=True)
+            if parent_link:
+                href = parent_link['href']
+                return href if href.startswith('http') else f"https://hthayat.haberturk.com{href}"
+
+    # Alternatif yöntem: link içinde 'gunluk-burc-yorumlari' içeren bağlantıyı ara
+    for link in soup.find_all('a', href=True):
+        href = link['href']
+        if 'gunluk-burc-yorumlari' in href.lower():
+            return href if href.startswith('http') else f"https://hthayat.haberturk.com{href}"
+
+    return None
+
+
+def parse_haberturk(soup, key: str, site: Dict) -> Dict:
+    """Haberturk günlük sayfası: her figcaption bir burcun yorumu"""
+    results = {}
+
+    for fig in soup.find_all('figcaption'):
+        text = clean_text(fig.get_text())
+
+        # Burç ismini bul - hem Türkçe hem İngilizce büyük harf versiyonları
+        found = find_upper_sign(text)
+        if found:
+            burc_name, search_term, idx = found
+            burc_text = text[idx + len(search_term):].replace('GÜNLÜK BURÇ YORUMU', '').replace('Günlük Burç Yorumu', '').strip()
+
+            if burc_text and len(burc_text) > 20:
+                results[burc_name] = {"genel": burc_text}
+
+    return results
+
+
+def parse_onedio(soup, category: str, site: Dict) -> Dict:
+    """Onedio kategori sayfası: 12 figcaption, her biri 'Sevgili <Burç>,' ile başlar"""
+    results = {}
+
+    for figcaption in soup.find_all('figcaption'):
+        paragraphs = figcaption.find_all('p')
+        full_text = ' '.join([clean_text(p.get_text()) for p in paragraphs])
+
+        # Hangi burç için olduğunu bul
+        for burc_name in BURCLAR:
+            if f'Sevgili {burc_name}' in full_text:
+                # "Sevgili Burç," kısmından sonrasını al
+                burc_yorum = full_text.split(f'Sevgili {burc_name}', 1)[1].strip()
+                # Virgül varsa kaldır
+                if burc_yorum.startswith(','):
+                    burc_yorum = burc_yorum[1:].strip()
+
+                results[burc_name] = {category: burc_yorum}
+                break
+
+    return results
+
+
+def parse_vogue(soup, key: str, site: Dict) -> Dict:
+    """Vogue günlük sayfası: her burç bir h2 başlığı ve ardından gelen paragraf"""
+    results = {}
+    content_div = soup.select_one(site['selector'])
+    if not content_div:
+        return results
+
+    current_burc = None
+    for element in content_div.find_all(['h2', 'p']):
+        if element.name == 'h2':
+            # "Koç ve yükselen Koç" -> "Koç"
+            h2_text = element.get_text(strip=True)
+            burc_text = h2_text.split(' ve yükselen')[0].strip()
+            current_burc = normalize_burc_name(burc_text)
+
+        elif element.name == 'p' and current_burc:
+            # Görsel içeren p etiketlerini atla
+            if element.find('img'):
+                continue
+
+            text = clean_text(element.get_text())
+            if text and len(text) > 20:
+                results[current_burc] = {"genel": text}
+                current_burc = None  # Bir sonraki burca geç
+
+    return results
+
+
+# SİTE KAYITLARI (çıktı dosyasındaki site sırası da budur)
+
+SITES = {
+    'milliyet': {
+        'label': 'Milliyet',
+        'pages': 'per_sign',
+        'url': "https://www.milliyet.com.tr/pembenar/astroloji/{slug}-burcu-gunluk-yorum/",
+        'selector': '.horoscope-tabs__content__main-inner',
+        'parse_only': SoupStrainer(class_=_class_token('horoscope-tabs__content__main-inner')),
+        # genel metinden temizlenecek kategori etiketleri
+        'category_labels': LabelSet(['iş:', 'aşk:', 'para:', 'kariyer:', 'sağlık:', 'ilişkiler:']),
+        # aşk/para/sağlık sadece sayfada etiketli paragraf varsa dolar
+        'fields': ['genel'],
+        'parse': parse_milliyet,
+    },
+    'hurriyet': {
+        'label': 'Hurriyet',
+        'pages': 'single',
+        'url': "https://www.hurriyet.com.tr/mahmure/astroloji/",
+        'selector': '.zodiac-widget-description-wrapper',
+        'parse_only': SoupStrainer(class_=_class_token('zodiac-widget-description-wrapper')),
+        # Her burcun ayrı bir wrapper'ı var; 12'si de kapanınca sayfanın geri kalanı gerekmez
+        'stream_until': {'class': 'zodiac-widget-description-wrapper', 'count': 12,
+                         'text_all': SIGN_PATTERNS},
+        'fields': ['genel'],
+        'parse': parse_hurriyet,
+    },
+    'haberturk': {
+        'label': 'Haberturk',
+        'pages': 'single',
+        # Günlük sayfanın adresi makale id'si içerdiği için index'ten bulunur
+        'url': "https://hthayat.haberturk.com/astroloji/gunun-yorumu",
+        'follow': find_haberturk_daily_link,
+        'parse_only': SoupStrainer('figcaption'),
+        'stream_until': {'tag': 'figcaption', 'count': 12, 'text_all': SIGN_PATTERNS},
+        'fields': ['genel'],
+        'parse': parse_haberturk,
+    },
+    'elele': {
+        'label': 'Elele',
+        'pages': 'per_sign',
+        'url': "https://www.elele.com.tr/astroloji/burclar/{slug}",
+        'selector': '.news-content',
+        'parse_only': SoupStrainer(class_=_class_token('news-content')),
+        'strip_prefix': True,
+        'fields': ['genel'],
+        'parse': parse_first_paragraph,
+    },
+    'onedio': {
+        'label': 'Onedio',
+        'pages': 'per_category',
+        'urls': {
+            'genel': "https://onedio.com/astroloji/gunluk-burc-yorumuna-gore-{date}-gunun-nasil-gececek",
+            'aşk': "https://onedio.com/astroloji/gunluk-ask-burc-yorumuna-gore-{date}-gunun-nasil-gececek",
+            'para': "https://onedio.com/astroloji/gunluk-para-burc-yorumuna-gore-{date}-gunun-nasil-gececek",
+            'sağlık': "https://onedio.com/astroloji/gunluk-saglik-burc-yorumuna-gore-{date}-gunun-nasil-gececek",
+        },
+        'parse_only': SoupStrainer('figcaption'),
+        'stream_until': {'tag': 'figcaption', 'count': 12,
+                         'text_all': sign_patterns(r'Sevgili {name}\b')},
+        'fields': ['genel', 'aşk', 'para', 'sağlık'],
+        'parse': parse_onedio,
+    },
+    'mynet': {
+        'label': 'Mynet',
+        'pages': 'per_sign',
+        'url': "https://www.mynet.com/kadin/burclar-astroloji/{slug}-burcu-gunluk-yorumu.html",
+        'selector': '#contextual .detail-content-inner',
+        'parse_only': SoupStrainer(id='contextual'),
+        'fields': ['genel'],
+        'parse': parse_first_paragraph,
+    },
+    'twitburc': {
+        'label': 'Twitburc',
+        'pages': 'per_sign',
+        'url': "https://twitburc.com.tr/burclar/{slug}",
+        'parse_only': SoupStrainer('div', class_=_class_token('tab-pane')),
+        'skip_phrases': ['BURCU ÖZELLİKLERİ', 'Grubun:', 'Şanslı'],
+        'fields': ['genel'],
+        'parse': parse_twitburc,
+    },
+    'vogue': {
+        'label': 'Vogue',
+        'pages': 'single',
+        'url': "https://vogue.com.tr/astroloji/gunluk-burc-yorumlari-{date}",
+        'selector': '.category-detail__content',
+        'parse_only': SoupStrainer(class_=_class_token('category-detail__content')),
+        'stream_until': {'class': 'category-detail__content'},
+        'fields': ['genel'],
+        'parse': parse_vogue,
+    },
+    'gunlukburc': {
+        'label': 'Gunlukburc',
+        'pages': 'per_sign',
+        'url': "https://www.gunlukburc.net/gunluk-burc-yorumlari/{slug}.html",
+        'selector': '#agplay',
+        'parse_only': SoupStrainer(id='agplay'),
+        # h2 başlığı -> kategori (sırayla denenir, ilk eşleşen kullanılır);
+        # iş/kariyer paragrafları para kategorisine eklenir
+        'headings': [
+            (('genel durum',), 'genel'),
+            (('aşk', 'ilişki'), 'aşk'),
+            (('iş', 'kariyer'), 'para'),
+            (('maddi durum', 'para'), 'para'),
+        ],
+        # Tanıtım metinleri
+        'skip_phrases': [
+            'günlük yıldız falınız',
+            'yıldız falınızı okuyun',
+            'gününe özel',
+            'gezegenler ve yıldızların',
+            'burcu günlük yorumu',
+        ],
+        'fields': ['genel', 'aşk', 'para'],
+        'parse': parse_gunlukburc,
+    },
+    'myburc': {
+        'label': 'Myburc',
+        'pages': 'per_sign',
+        'url': "https://www.myburc.com/gunluk-burc-yorumu/{slug}-burcu.htm",
+        # Genel yorum container dışından da okunduğu için tam sayfa parse edilir
+        'selector': '#myTabContent',
+        'fields': ['genel', 'aşk', 'para'],
+        'parse': parse_myburc,
+    },
+}
+
+
+def page_urls(site: Dict, date: Optional[datetime] = None,
+              keys: Optional[List[str]] = None) -> Dict[str, str]:
+    """
+    Sitenin çekilecek sayfalarını snapshot anahtarı -> URL olarak döner.
+    per_sign sitelerde anahtar burç adı, per_category sitelerde kategori adıdır.
+
+    Args:
+        keys: Verilirse sadece bu anahtarlara ait sayfalar döner
+    """
+    date_str = url_date(date or datetime.now())
+    if site['pages'] == 'per_sign':
+        urls = {burc: site['url'].format(slug=slug) for burc, slug in BURC_SLUGS.items()}
+    elif site['pages'] == 'per_category':
+        urls = {category: url.format(date=date_str) for category, url in site['urls'].items()}
+    else:
+        urls = {'index': site['url'].format(date=date_str)}
+
+    if keys is not None:
+        urls = {key: url for key, url in urls.items() if key in keys}
+    return urls
+
+
+def date_addressable(site: Dict) -> bool:
+    """
+    Sitenin tüm sayfa adresleri tarihten üretilebiliyor mu, yani geçmiş bir günün
+    sayfaları çekilebilir mi. Adresi index sayfasından bulunan (follow) siteler
+    ve tarih içermeyen (hep "bugün"ü gösteren) sayfalar bu kapsamda değildir.
+    """
+    templates = site['urls'].values() if 'urls' in site else [site['url']]
+    return 'follow' not in site and all('{date}' in template for template in templates)
+
+
+def missing_pages(site: Dict, site_data: Optional[Dict]) -> List[str]:
+    """
+    Kayıtlı site verisinde beklenen alanlardan (fields) biri boş kalan
+    burç/kategori hücrelerini tamamlamak için yeniden çekilmesi gereken
+    sayfa anahtarlarını döner. Site verisi hiç yoksa tüm sayfalar döner.
+    """
+    keys = list(page_urls(site))
+    if not site_data:
+        return keys
+
+    def is_missing(burc: str, category: str) -> bool:
+        return (site_data.get(burc) or {}).get(category) is None
+
+    if site['pages'] == 'per_sign':
+        return [burc for burc in keys if any(is_missing(burc, f) for f in site['fields'])]
+    if site['pages'] == 'per_category':
+        return [category for category in keys if any(is_missing(burc, category) for burc in BURCLAR)]
+    # Tek sayfalık sitede tüm burçlar aynı sayfadan gelir
+    if any(is_missing(burc, f) for burc in BURCLAR for f in site['fields']):
+        return keys
+    return []
@@ -0,0 +1,93 @@
+"""
+AIstrolog - Ham HTML Snapshot Deposu
+Scraper'ın indirdiği sayfaları site/anahtar/tarih bazında sıkıştırılmış olarak saklar.
+
+Klasör yapısı:
+    snapshots/
+        2025-12-04/
+            milliyet/
+                _manifest.json      # anahtar -> URL
+                Koç.html.gz
+                ...
+            hurriyet/
+                index.html.gz
+
+Saklanan sayfalar `python scraper.py --from-snapshots` ile ağa çıkmadan yeniden
+parse edilebilir; böylece bozulan bir selector düzeltildiğinde geçmiş günler de
+yeniden üretilebilir.
+"""
+
+import gzip
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Varsayılan snapshot klasörü
+SNAPSHOT_DIR = "snapshots"
+
+MANIFEST_FILE = "_manifest.json"
+
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+class SnapshotStore:
+    """Belirli bir günün sayfa snapshot'larını okur/yazar"""
+
+    def __init__(self, root: str = SNAPSHOT_DIR, date: Optional[str] = None):
+        self.root = root
+        self.date = date or datetime.now().strftime("%Y-%m-%d")
+        self._lock = threading.Lock()
+
+    def site_dir(self, site: str) -> str:
+        return os.path.join(self.root, self.date, site)
+
+    def path(self, site: str, key: str) -> str:
+        # Anahtar URL parçası içerebilir, dosya adında '/' olmasın
+        safe_key = key.replace('/', '_')
+        return os.path.join(self.site_dir(site), f"{safe_key}.html.gz")
+
+    def manifest(self, site: str) -> Dict[str, str]:
+        """Site için anahtar -> URL eşlemesini döner"""
+        manifest_path = os.path.join(self.site_dir(site), MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return {}
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def save(self, site: str, key: str, url: str, body: bytes):
+        """Sayfa gövdesini sıkıştırıp kaydeder ve manifest'i günceller"""
+        path = self.path(site, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        # Manifest aynı sitenin paralel istekleri tarafından güncellenir
+        with self._lock:
+            manifest = self.manifest(site)
+            manifest[key] = url
+            manifest_path = os.path.join(self.site_dir(site), MANIFEST_FILE)
+            tmp_path = f"{manifest_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, manifest_path)
+
+    def load(self, site: str, key: str) -> Optional[bytes]:
+        """Kayıtlı sayfa gövdesini döner, yoksa None"""
+        path = self.path(site, key)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rb') as f:
+            return f.read()
+
+
+def available_dates(root: str = SNAPSHOT_DIR) -> List[str]:
+    """Snapshot'ı bulunan günleri eskiden yeniye sıralı döner"""
+    if not os.path.isdir(root):
+        return []
+    return sorted(name for name in os.listdir(root) if DATE_PATTERN.match(name))
@@ -0,0 +1,453 @@
+"""
+AIstrolog - SQLite Veri Deposu
+Günlük JSON dosyalarının (daily_raw_, processed_, summarized_, scored_) isteğe
+bağlı, sıkışık karşılığı. Her (gün, aşama, site, burç, kategori) hücresi tek
+satırdır ve metnin kendisini değil hash'ini tutar; metinler contents tablosunda
+bir kez saklanır. Böylece 'genel' metninin processed aşamasında tekrar yazılması
+ya da aynı yorumun birden fazla sitede yayımlanması yer kaplamaz; bir aylık
+geçmiş tek bir sorguyla okunur.
+
+run_full_pipeline.py ve günlük workflow depoyu data/aistrolog.db'ye yazar
+(workflow AISTROLOG_DB'yi ayarlar, depoyu Actions cache'inde saklar); adımlar elle
+tek tek çalıştırılırken depo açıkça istenir. API başlarken depoyu JSON'daki yeni
+günlerle tamamlar. JSON dosyaları her durumda yazılmaya devam eder, API depo yoksa
+ya da istenen gün depoda yoksa JSON'a döner:
+    AISTROLOG_DB=data/aistrolog.db python scorer.py
+    python scraper.py --db data/aistrolog.db
+
+Mevcut JSON dosyalarını depoya aktarmak için:
+    python storage.py import
+    python storage.py import --data-dir data --db data/aistrolog.db
+    python storage.py import --only-new     # sadece depoda henüz olmayan yeni günler
+
+Tablolar:
+    contents (hash, text)                                    hash: metnin sha1'inin ilk 16 hanesi
+    texts    (date, stage, site, sign, category, hash)       stage: raw / processed / summarized
+    scores   (date, sign, category, score, sentiment, data)  data: kategorinin JSON değeri
+    rankings (date, category, position, sign, score, sentiment)
+
+API'nin bir istek için yaptığı sorgular (burcun günlük yorumu, günün ya da son N
+günün sıralaması, en son gün) indeksli tek aramadır; geçmişteki gün sayısına bağlı değildir.
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import history_store
+
+# Deponun yolu bu ortam değişkeninden okunur; tanımlı değilse depo kullanılmaz
+DB_ENV = "AISTROLOG_DB"
+
+# Varsayılan depo dosyası (--db için öneri)
+DEFAULT_DB = os.path.join("data", "aistrolog.db")
+
+# Metin aşamaları
+STAGES = ("raw", "processed", "summarized")
+
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Skor kolonlarının tipi bilerek yok: değer yazıldığı gibi (100 / 94.0) saklanır
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contents (
+    hash TEXT PRIMARY KEY,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS texts (
+    date     TEXT NOT NULL,
+    stage    TEXT NOT NULL,
+    site     TEXT NOT NULL,
+    sign     TEXT NOT NULL,
+    category TEXT NOT NULL,
+    hash     TEXT
+);
+CREATE TABLE IF NOT EXISTS scores (
+    date      TEXT NOT NULL,
+    sign      TEXT NOT NULL,
+    category  TEXT NOT NULL,
+    score,
+    sentiment TEXT,
+    data      TEXT
+);
+CREATE TABLE IF NOT EXISTS rankings (
+    date      TEXT NOT NULL,
+    category  TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    sign      TEXT NOT NULL,
+    score,
+    sentiment TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_texts_day ON texts (date, stage, sign, category);
+CREATE INDEX IF NOT EXISTS idx_scores_day ON scores (date, sign, category);
+CREATE INDEX IF NOT EXISTS idx_rankings_date ON rankings (date);
+"""
+
+# Şeması bu süreçte oluşturulmuş/kontrol edilmiş depolar
+_initialized = set()
+
+
+def db_path() -> Optional[str]:
+    """Ortam değişkeninden deponun yolunu döner (tanımlı değilse None)"""
+    return os.environ.get(DB_ENV) or None
+
+
+def date_from_path(path: str) -> Optional[str]:
+    """Dosya adındaki YYYY-MM-DD tarihini döner (örn. processed_daily_raw_2025-12-04.json)"""
+    match = DATE_PATTERN.search(os.path.basename(path))
+    return match.group(0) if match else None
+
+
+def text_hash(text: str) -> str:
+    """Metnin birebir (normalize edilmeden) hash'i; contents tablosunun anahtarı"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Depoyu açar, tablolar ve indeksler yoksa oluşturur (süreç başına bir kez)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path)
+    if path not in _initialized:
+        conn.executescript(SCHEMA)
+        _initialized.add(path)
+    return conn
+
+
+# ==================== YAZMA ====================
+
+def _text_rows(stage: str, date: str, data: Dict) -> Iterator[Tuple]:
+    """
+    Aşamanın JSON verisini (site, burç, kategori, metin) satırlarına açar.
+    raw / processed verisi site -> burç -> kategori, summarized verisi
+    burç -> kategori biçimindedir (site boş bırakılır).
+    """
+    if stage == "summarized":
+        data = {"": data}
+    for site, site_data in data.items():
+        for sign, categories in (site_data or {}).items():
+            for category, text in (categories or {}).items():
+                yield site, sign, category, text
+
+
+def write_texts(path: str, stage: str, date: str, data: Dict) -> int:
+    """Günün aşama verisini depoya yazar (günün eski satırlarının yerine); satır sayısını döner"""
+    if stage not in STAGES:
+        raise ValueError(f"Bilinmeyen aşama: {stage}")
+    rows = []
+    contents = {}
+    for site, sign, category, text in _text_rows(stage, date, data):
+        key = None
+        if text is not None:
+            key = text_hash(text)
+            contents[key] = text
+        rows.append((date, stage, site, sign, category, key))
+
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM texts WHERE date = ? AND stage = ?", (date, stage))
+            conn.executemany("INSERT OR IGNORE INTO contents VALUES (?, ?)", contents.items())
+            conn.executemany("INSERT INTO texts VALUES (?, ?, ?, ?, ?, ?)", rows)
+            # Günün eski halinden kalıp artık hiçbir hücrenin göstermediği metinler
+            conn.execute("DELETE FROM contents WHERE hash NOT IN "
+                         "(SELECT hash FROM texts WHERE hash IS NOT NULL)")
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def write_scores(path: str, date: str, scores: Dict, rankings: Dict) -> int:
+    """
+    Günün skorlarını ve sıralamalarını depoya yazar (günün eski satırlarının yerine).
+    Her burç/kategori değeri JSON olarak saklanır; skor ve duygu ayrıca kolondadır.
+    """
+    score_rows = []
+    for sign, categories in scores.items():
+        for category, value in categories.items():
+            if isinstance(value, dict):
+                score, sentiment = value.get('score'), value.get('sentiment')
+            else:
+                # 'toplam' sayıdır, 'issues' listedir
+                score = value if isinstance(value, (int, float)) else None
+                sentiment = None
+            score_rows.append((date, sign, category, score, sentiment,
+                               json.dumps(value, ensure_ascii=False)))
+
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM scores WHERE date = ?", (date,))
+            conn.executemany("INSERT INTO scores VALUES (?, ?, ?, ?, ?, ?)", score_rows)
+            _replace_rankings(conn, date, rankings)
+    finally:
+        conn.close()
+    return len(score_rows)
+
+
+def write_rankings(path: str, date: str, rankings: Dict) -> int:
+    """Sadece günün sıralamalarını yazar (örn. rankings_history.json'dan); satır sayısını döner"""
+    conn = connect(path)
+    try:
+        with conn:
+            return _replace_rankings(conn, date, rankings)
+    finally:
+        conn.close()
+
+
+def _replace_rankings(conn: sqlite3.Connection, date: str, rankings: Dict) -> int:
+    """'*_ranking' listelerini günün eski sıralama satırlarının yerine yazar"""
+    rows = [
+        (date, category, position, item['burc'], item['score'], item.get('sentiment'))
+        for category, items in rankings.items() if category.endswith('_ranking')
+        for position, item in enumerate(items)
+    ]
+    conn.execute("DELETE FROM rankings WHERE date = ?", (date,))
+    conn.executemany("INSERT INTO rankings VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+# ==================== OKUMA ====================
+
+def _nest_texts(stage: str, rows) -> Dict:
+    """(site, burç, kategori, metin) satırlarını aşamanın JSON biçimine geri çevirir"""
+    data = {}
+    for site, sign, category, text in rows:
+        site_data = data if stage == "summarized" else data.setdefault(site, {})
+        site_data.setdefault(sign, {})[category] = text
+    return data
+
+
+def load_texts(path: str, stage: str, date: str) -> Dict:
+    """Günün aşama verisini JSON dosyasıyla aynı biçimde döner (gün yoksa boş dict)"""
+    return load_texts_range(path, stage, date, date).get(date, {})
+
+
+def load_texts_range(path: str, stage: str, start: Optional[str] = None,
+                     end: Optional[str] = None) -> Dict[str, Dict]:
+    """Verilen gün aralığındaki (uçlar dahil) aşama verisini tek sorguyla okur: tarih -> veri"""
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT t.date, t.site, t.sign, t.category, c.text FROM texts t "
+            "LEFT JOIN contents c ON c.hash = t.hash "
+            "WHERE t.stage = ? AND t.date BETWEEN ? AND ? ORDER BY t.date, t.rowid",
+            (stage, start or '0000-00-00', end or '9999-99-99')
+        ).fetchall()
+    finally:
+        conn.close()
+
+    by_date: Dict[str, List[Tuple]] = {}
+    for date, *rest in rows:
+        by_date.setdefault(date, []).append(rest)
+    return {date: _nest_texts(stage, day_rows) for date, day_rows in by_date.items()}
+
+
+def load_sign(path: str, stage: str, date: str, sign: str, site: str = "") -> Dict[str, Optional[str]]:
+    """Tek bir burcun günlük metinleri: kategori -> metin (summarized için site boştur)"""
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT t.category, c.text FROM texts t LEFT JOIN contents c ON c.hash = t.hash "
+            "WHERE t.date = ? AND t.stage = ? AND t.sign = ? AND t.site = ? ORDER BY t.rowid",
+            (date, stage, sign, site)
+        ).fetchall()
+    finally:
+        conn.close()
+    return dict(rows)
+
+
+def latest_date(path: str, stage: str) -> Optional[str]:
+    """Aşamanın depodaki en yeni günü (hiç veri yoksa None)"""
+    conn = connect(path)
+    try:
+        row = conn.execute(
+            "SELECT date FROM texts WHERE stage = ? ORDER BY date DESC LIMIT 1", (stage,)
+        ).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def load_scores(path: str, date: str) -> Dict:
+    """Günün skorlarını scored_ dosyasındaki 'scores' biçiminde döner"""
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT sign, category, data FROM scores WHERE date = ? ORDER BY rowid", (date,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    scores = {}
+    for sign, category, data in rows:
+        scores.setdefault(sign, {})[category] = json.loads(data)
+    return scores
+
+
+def load_rankings_history(path: str, start: Optional[str] = None,
+                          end: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Verilen gün aralığındaki sıralamaları rankings_history.json biçiminde döner:
+    en yeni gün önce, her kategori için [{'burc', 'score'}, ...].
+    """
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT date, category, sign, score FROM rankings "
+            "WHERE date BETWEEN ? AND ? ORDER BY date DESC, rowid",
+            (start or '0000-00-00', end or '9999-99-99')
+        ).fetchall()
+    finally:
+        conn.close()
+
+    history: Dict[str, Dict] = {}
+    for date, category, sign, score in rows:
+        history.setdefault(date, {}).setdefault(category, []).append({'burc': sign, 'score': score})
+    return history
+
+
+def ranking_dates(path: str, limit: Optional[int] = None) -> List[str]:
+    """Sıralaması olan günler, en yeni önce (limit verilirse en yeni limit gün)"""
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT date FROM rankings ORDER BY date DESC LIMIT ?",
+            (-1 if limit is None else limit,)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [date for (date,) in rows]
+
+
+def ranking_span(path: str) -> Tuple[Optional[str], Optional[str]]:
+    """Sıralaması olan en eski ve en yeni gün (iki indeksli MIN/MAX araması; boşsa None)"""
+    conn = connect(path)
+    try:
+        return conn.execute(
+            "SELECT (SELECT MIN(date) FROM rankings), (SELECT MAX(date) FROM rankings)"
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def available_dates(path: str, stage: str) -> List[str]:
+    """Aşamanın depoda verisi olan günleri (eskiden yeniye)"""
+    conn = connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT DISTINCT date FROM texts WHERE stage = ? ORDER BY date", (stage,)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [date for (date,) in rows]
+
+
+# ==================== JSON AKTARIMI ====================
+
+# Dosya adı öneki -> aşama
+FILE_STAGES = [
+    ("summarized_processed_daily_raw_", "summarized"),
+    ("scored_processed_daily_raw_", "scored"),
+    ("processed_daily_raw_", "processed"),
+    ("daily_raw_", "raw"),
+]
+
+
+def _latest_dates(path: str) -> Dict[str, Optional[str]]:
+    """Her aşamanın ve sıralamaların depodaki en yeni günü (indeksli aramalar)"""
+    conn = connect(path)
+    try:
+        latest = {stage: conn.execute(
+            "SELECT MAX(date) FROM texts WHERE stage = ?", (stage,)).fetchone()[0]
+            for stage in STAGES}
+        latest["scored"] = conn.execute("SELECT MAX(date) FROM scores").fetchone()[0]
+        latest["rankings_history"] = conn.execute("SELECT MAX(date) FROM rankings").fetchone()[0]
+    finally:
+        conn.close()
+    return latest
+
+
+def import_json(path: str, data_dir: str = "data", only_new: bool = False) -> Dict[str, int]:
+    """
+    data_dir'deki günlük JSON dosyalarını ve sıralama geçmişini depoya aktarır.
+    Her gün/aşama önceki satırlarının yerine yazılır; tekrar çalıştırmak güvenlidir.
+    Skor dosyası olmayan günlerin sıralamaları geçmişten (rankings_history/ parçaları,
+    yoksa eski rankings_history.json) alınır.
+
+    only_new verilirse sadece aşamanın depodaki en yeni gününden sonraki günler
+    aktarılır (depoyu yazmadan çalışmış adımların ardından depoyu yetiştirmek için).
+
+    Returns:
+        aşama -> aktarılan gün sayısı
+    """
+    counts = {stage: 0 for _, stage in FILE_STAGES}
+    counts["rankings_history"] = 0
+    scored_dates = set()
+    latest = _latest_dates(path) if only_new else {}
+
+    for filepath in sorted(glob.glob(os.path.join(data_dir, "*.json"))):
+        name = os.path.basename(filepath)
+        stage = next((stage for prefix, stage in FILE_STAGES if name.startswith(prefix)), None)
+        date = date_from_path(name)
+        if not stage or not date:
+            continue
+        if latest.get(stage) and date <= latest[stage]:
+            continue
+
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if stage == "scored":
+            write_scores(path, date, data.get('scores', {}), data.get('rankings', {}))
+            scored_dates.add(date)
+        else:
+            write_texts(path, stage, date, data)
+        counts[stage] += 1
+
+    history_dir = os.path.join(data_dir, "rankings_history")
+    history_path = os.path.join(data_dir, "rankings_history.json")
+    history = {}
+    if history_store.exists(history_dir):
+        history = history_store.load_range(history_dir=history_dir)
+    elif os.path.exists(history_path):
+        with open(history_path, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+    for date, rankings in history.items():
+        if latest.get("rankings_history") and date <= latest["rankings_history"]:
+            continue
+        if date not in scored_dates:
+            write_rankings(path, date, rankings)
+            counts["rankings_history"] += 1
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AIstrolog SQLite veri deposu")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="data/ klasöründeki JSON dosyalarını depoya aktar")
+    import_parser.add_argument("--data-dir", default="data")
+    import_parser.add_argument("--db", default=db_path() or DEFAULT_DB,
+                               help=f"Depo dosyası (varsayılan: ${DB_ENV} ya da {DEFAULT_DB})")
+    import_parser.add_argument("--only-new", action="store_true",
+                               help="Sadece depodaki en yeni günden sonraki günleri aktar")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        if not os.path.isdir(args.data_dir):
+            print(f"Klasör bulunamadı: {args.data_dir}")
+            sys.exit(1)
+        counts = import_json(args.db, args.data_dir, only_new=args.only_new)
+        print(f"{args.db} deposuna aktarıldı:")
+        for stage, count in counts.items():
+            print(f"  {stage:17} {count} gün")
+        print(f"Depo boyutu: {os.path.getsize(args.db) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
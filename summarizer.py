@@ -14,10 +14,14 @@ Approaches:
 import json
 import re
 from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 import logging
 import numpy as np
 
+import content_index
+import storage
+from textnorm import content_hash
+
 # Try to import ML libraries (optional)
 try:
     from sentence_transformers import SentenceTransformer
@@ -33,6 +37,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Most recently used sentence embeddings kept in memory (a long-lived summarizer,
+# e.g. in the API, would otherwise keep every sentence it has ever seen)
+EMBEDDING_CACHE_SIZE = 20000
+
 
 class TurkishHoroscopeSummarizer:
     # Yasaklı bağlaçları veya konu geçiş ifadelerini içeren cümleler
@@ -117,7 +125,8 @@ class TurkishHoroscopeSummarizer:
         "neptün", "plüton"
     ]
     
-    def __init__(self, similarity_threshold: float = 0.7, use_ml: bool = True, synonym_ratio: float = 0.0):
+    def __init__(self, similarity_threshold: float = 0.7, use_ml: bool = True, synonym_ratio: float = 0.0,
+                 embedding_cache_size: int = EMBEDDING_CACHE_SIZE):
         """
         Initialize the summarizer.
         
@@ -125,11 +134,19 @@ class TurkishHoroscopeSummarizer:
             similarity_threshold: Threshold for considering sentences as duplicates (0.0-1.0)
             use_ml: Whether to use ML-based semantic similarity (requires sentence-transformers)
             synonym_ratio: Ratio of words to replace with synonyms (0.0=no changes, 0.3=recommended, 1.0=max)
+            embedding_cache_size: Maximum number of sentence embeddings kept (least recently used evicted)
         """
         self.similarity_threshold = similarity_threshold
         self.use_ml = use_ml and ML_AVAILABLE
         self.synonym_ratio = max(0.0, min(1.0, synonym_ratio))  # Clamp between 0.0 and 1.0
         self.model = None
+        # Sentence -> embedding (LRU); the same sentence is compared many times while
+        # deduplicating and ranking, so each one is encoded only once
+        self._embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.embedding_cache_size = embedding_cache_size
+        # Text group -> (text, filtered sentences) for the current summarize_all run;
+        # a text shared by several cells (see content_index.py) is split only once
+        self._cell_sentences: Dict = {}
         
         # Load ML model if requested and available
         if self.use_ml:
@@ -292,6 +309,21 @@ class TurkishHoroscopeSummarizer:
         
         return cleaned_sentences
     
+    def encode_sentences(self, sentences: List[str]) -> List[np.ndarray]:
+        """Encode sentences with the ML model, reusing cached embeddings."""
+        found = {}
+        for sentence in dict.fromkeys(sentences):
+            if sentence in self._embeddings:
+                self._embeddings.move_to_end(sentence)
+                found[sentence] = self._embeddings[sentence]
+        missing = [s for s in dict.fromkeys(sentences) if s not in found]
+        if missing:
+            for sentence, embedding in zip(missing, self.model.encode(missing)):
+                self._embeddings[sentence] = found[sentence] = embedding
+            while len(self._embeddings) > self.embedding_cache_size:
+                self._embeddings.popitem(last=False)
+        return [found[s] for s in sentences]
+    
     def calculate_sentence_similarity(self, sent1: str, sent2: str) -> float:
         """
         Calculate similarity between two sentences.
@@ -304,7 +336,7 @@ class TurkishHoroscopeSummarizer:
         # Use ML-based semantic similarity if available
         if self.use_ml and self.model is not None:
             try:
-                embeddings = self.model.encode([sent1, sent2])
+                embeddings = self.encode_sentences([sent1, sent2])
                 # Cosine similarity
                 similarity = np.dot(embeddings[0], embeddings[1]) / (
                     np.linalg.norm(embeddings[0]) * np.linalg.norm(embeddings[1])
@@ -372,7 +404,7 @@ class TurkishHoroscopeSummarizer:
         
         try:
             # Encode all sentences
-            embeddings = self.model.encode(sentences)
+            embeddings = self.encode_sentences(sentences)
             
             # Score each sentence for category relevance
             relevance_scores = np.array([
@@ -482,7 +514,8 @@ class TurkishHoroscopeSummarizer:
     def summarize_category(self, 
                           zodiac_sign: str, 
                           category: str, 
-                          source_data: Dict[str, Dict]) -> str:
+                          source_data: Dict[str, Dict],
+                          shared: Optional[Dict] = None) -> str:
         """
         Summarize predictions for a specific zodiac sign and category.
         
@@ -490,11 +523,14 @@ class TurkishHoroscopeSummarizer:
             zodiac_sign: e.g., "Koç", "Boğa", etc.
             category: "aşk", "para", "sağlık", or "genel"
             source_data: Dictionary of all sources and their predictions
+            shared: Duplicate cell -> first cell with the same text
+                    (content_index.shared_refs); hashed here when not given
         
         Returns:
             Summarized text combining insights from all sources
         """
         all_sentences = []
+        seen_texts = set()
         
         # Collect sentences from all sources
         for source_name, source_content in source_data.items():
@@ -510,10 +546,28 @@ class TurkishHoroscopeSummarizer:
             if not text or text == "null":
                 continue
             
-            # Clean and split into sentences
-            clean = self.clean_text(text)
-            sentences = self.split_sentences(clean)
-            sentences = self.filter_forbidden_sentences(sentences)
+            # The same text published by several sources would only produce
+            # sentences that remove_duplicate_sentences drops anyway
+            ref = (source_name, zodiac_sign, category)
+            if shared is None:
+                group = content_hash(text)
+            else:
+                group = shared.get(ref, ref)
+                if group != ref and content_index.cell_text(source_data, group) != text:
+                    group = ref
+            if group in seen_texts:
+                continue
+            seen_texts.add(group)
+            
+            # Clean and split into sentences (once per text, also across categories)
+            cached = self._cell_sentences.get(group)
+            if cached is not None and cached[0] == text:
+                sentences = cached[1]
+            else:
+                clean = self.clean_text(text)
+                sentences = self.split_sentences(clean)
+                sentences = self.filter_forbidden_sentences(sentences)
+                self._cell_sentences[group] = (text, sentences)
             all_sentences.extend(sentences)
         
         if not all_sentences:
@@ -591,13 +645,16 @@ class TurkishHoroscopeSummarizer:
         
         return summary
     
-    def summarize_all(self, data: Dict, output_path: Optional[str] = None) -> Dict:
+    def summarize_all(self, data: Dict, output_path: Optional[str] = None,
+                      index: Optional[Dict] = None) -> Dict:
         """
         Generate summaries for all zodiac signs and categories.
         
         Args:
             data: Input data dictionary
             output_path: Optional path to save summarized data
+            index: 'processed' section of the day's content index (content_index.py);
+                   built from data when not given
         
         Returns:
             Dictionary with summarized predictions
@@ -611,6 +668,8 @@ class TurkishHoroscopeSummarizer:
         
         summaries = {}
         stats = defaultdict(int)
+        shared = content_index.shared_refs(content_index.build(data) if index is None else index)
+        self._cell_sentences.clear()
         
         logger.info("🔄 Starting summarization...")
         logger.info(f"🤖 Mode: {'ML-based (Sentence Transformers + MMR)' if self.use_ml else 'Basic (Word Overlap)'}")
@@ -621,7 +680,7 @@ class TurkishHoroscopeSummarizer:
             summaries[sign] = {}
             
             for category in categories:
-                summary = self.summarize_category(sign, category, data)
+                summary = self.summarize_category(sign, category, data, shared)
                 summaries[sign][category] = summary
                 
                 if summary:
@@ -652,6 +711,13 @@ class TurkishHoroscopeSummarizer:
                 logger.info(f"✅ Summaries saved to {output_path}")
             except Exception as e:
                 logger.error(f"❌ Error saving summaries: {e}")
+            
+            # Optional SQLite store (see storage.py), keyed by the date in the file name
+            db_path = storage.db_path()
+            date = storage.date_from_path(output_path)
+            if db_path and date:
+                rows = storage.write_texts(db_path, 'summarized', date, summaries)
+                logger.info(f"🗄 {rows} rows written to {db_path}")
         
         return summaries
     
@@ -725,8 +791,9 @@ def main():
     # Load data
     data = summarizer.load_data(input_path)
     
-    # Generate summaries
-    summaries = summarizer.summarize_all(data, output_path)
+    # Generate summaries (texts shared by several cells are processed once)
+    summaries = summarizer.summarize_all(data, output_path,
+                                         content_index.load(input_path, 'processed', data))
     
     # Show example comparison
     print("\n" + "="*60)
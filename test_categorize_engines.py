@@ -0,0 +1,104 @@
+"""
+Kategorizasyon Motorları Test Sistemi
+
+categorize_horoscopes.py'nin iki motorunun (--engine python / vectorized) data/
+altındaki ham dosyalarda aynı sonucu verdiğini dener:
+  - vectorized motor hem scipy seyrek matrisleriyle hem de scipy olmadan (numpy)
+    python motoruyla birebir aynı kategorize veriyi üretir.
+  - StemMatrix'in kök sözlüğü dosyalar işlendikçe büyümez; kategori kökleriyle sınırlıdır.
+
+Çıktılar geçici bir klasöre yazılır; gerçek veri dosyalarına ve .cache/'e dokunmaz.
+
+Kullanım:
+    python test_categorize_engines.py
+"""
+
+import contextlib
+import glob
+import io
+import logging
+import os
+import sys
+import tempfile
+
+import categorize_horoscopes
+from categorize_horoscopes import HoroscopeCategorizer
+
+
+class EngineValidator:
+    """Her kontrol başarısızlıkta errors listesine mesaj ekler"""
+
+    def __init__(self, work_dir: str):
+        self.work_dir = work_dir
+        self.errors = []
+        self.inputs = sorted(glob.glob(os.path.join('data', 'daily_raw_*.json')))
+
+    def check(self, condition: bool, message: str):
+        print(f"  [{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            self.errors.append(message)
+
+    def categorizer(self, engine: str) -> HoroscopeCategorizer:
+        return HoroscopeCategorizer(engine=engine,
+                                    stem_cache_file=os.path.join(self.work_dir, f'stems_{engine}.json'),
+                                    manifest_file=os.path.join(self.work_dir, 'manifest.json'))
+
+    def categorize_all(self, categorizer: HoroscopeCategorizer) -> dict:
+        """Tüm ham dosyaları aynı categorizer ile işler: dosya adı -> kategorize veri"""
+        results = {}
+        for input_file in self.inputs:
+            categorizer.set_files(input_file, os.path.join(self.work_dir, os.path.basename(input_file)))
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[os.path.basename(input_file)] = categorizer.process_file()
+        return results
+
+    def check_engines(self):
+        """vectorized motor (scipy ve numpy) python motoruyla aynı sonucu verir"""
+        print("\n[1] Test: Motorların Eşitliği")
+        print("-" * 80)
+
+        expected = self.categorize_all(self.categorizer('python'))
+        scipy_available = categorize_horoscopes.SCIPY_AVAILABLE
+        for use_scipy, name in ((True, 'scipy'), (False, 'numpy')):
+            if use_scipy and not scipy_available:
+                print("  [-] scipy kurulu değil, seyrek matris yolu atlandı")
+                continue
+            categorize_horoscopes.SCIPY_AVAILABLE = use_scipy
+            try:
+                categorizer = self.categorizer('vectorized')
+                results = self.categorize_all(categorizer)
+            finally:
+                categorize_horoscopes.SCIPY_AVAILABLE = scipy_available
+
+            different = [file_name for file_name in expected if results[file_name] != expected[file_name]]
+            self.check(not different, f"vectorized ({name}): {len(expected)} dosyada sonuç python motoruyla aynı"
+                       + (f" (farklı: {', '.join(different)})" if different else ""))
+
+            matrix = categorizer.stem_matrix
+            stems = len(categorizer.LOVE_STEMS | categorizer.MONEY_STEMS | categorizer.HEALTH_STEMS)
+            self.check(len(matrix.stem_ids) == stems == len(matrix.category_matrix),
+                       f"vectorized ({name}): kök sözlüğü kategori kökleriyle sınırlı ({len(matrix.stem_ids)})")
+
+    def run_all_tests(self) -> bool:
+        if not self.inputs:
+            print("[X] data/ altında daily_raw_*.json bulunamadı")
+            return False
+        self.check_engines()
+
+        print("\n" + "=" * 80)
+        if self.errors:
+            print(f"[X] TEST BASARISIZ - {len(self.errors)} hata")
+            return False
+        print("[OK] TEST BASARILI - Kategorizasyon motorlari ayni sonucu veriyor!")
+        return True
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as work_dir:
+        success = EngineValidator(work_dir).run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
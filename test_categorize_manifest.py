@@ -0,0 +1,131 @@
+"""
+Toplu Kategorizasyon Manifest Test Sistemi
+
+categorize_horoscopes.py'nin toplu yeniden işleme (--from/--to, --glob) sırasında
+girdisi ve keyword ayarları değişmemiş dosyaları atladığını dener:
+  - Parmak izleri çıktı klasörüne (workflow'un commit'lediği data/) değil,
+    manifest dosyasına (varsayılan .cache/categorize_manifest.json) yazılır.
+  - Girdi ya da keyword ayarı değişince dosya güncel sayılmaz.
+  - İkinci toplu çalıştırma güncel dosyaları yeniden işlemez; --force hepsini işler.
+
+Geçici bir klasörde çalışır; gerçek veri dosyalarına ve .cache/'e dokunmaz.
+
+Kullanım:
+    python test_categorize_manifest.py
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+import categorize_horoscopes
+from categorize_horoscopes import HoroscopeCategorizer, load_manifest, select_inputs
+
+DATES = ['2025-11-30', '2025-12-01', '2025-12-02']
+
+
+class ManifestValidator:
+    """Her kontrol başarısızlıkta errors listesine mesaj ekler"""
+
+    def __init__(self, work_dir: str):
+        self.data_dir = os.path.join(work_dir, 'data')
+        self.manifest_file = os.path.join(work_dir, 'cache', 'categorize_manifest.json')
+        self.errors = []
+        os.makedirs(self.data_dir)
+        for date in DATES:
+            shutil.copy(os.path.join('data', f'daily_raw_{date}.json'), self.data_dir)
+
+    def check(self, condition: bool, message: str):
+        print(f"  [{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            self.errors.append(message)
+
+    def run_main(self, *args) -> str:
+        """categorize_horoscopes.main'i verilen argümanlarla çalıştırır, çıktısını döner"""
+        argv = sys.argv
+        sys.argv = ['categorize_horoscopes.py', *args]
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                categorize_horoscopes.main()
+        finally:
+            sys.argv = argv
+        return output.getvalue()
+
+    def check_fingerprint(self):
+        """Parmak izi manifest dosyasına yazılır; girdi ya da ayar değişince eskir"""
+        print("\n[1] Test: Parmak İzi")
+        print("-" * 80)
+
+        input_file = os.path.join(self.data_dir, f'daily_raw_{DATES[0]}.json')
+        categorizer = HoroscopeCategorizer(input_file, manifest_file=self.manifest_file)
+        self.check(not categorizer.is_up_to_date(), "İşlenmemiş dosya güncel değil")
+        with contextlib.redirect_stdout(io.StringIO()):
+            categorizer.process_file()
+
+        manifest = load_manifest(self.manifest_file)
+        self.check(list(manifest) == [os.path.normpath(categorizer.output_file)],
+                   "Parmak izi çıktının yoluyla manifest dosyasına yazıldı")
+        self.check(not any('manifest' in name for name in os.listdir(self.data_dir)),
+                   "Veri klasörüne manifest yazılmadı")
+        self.check(categorizer.is_up_to_date(), "İşlenen dosya güncel")
+
+        config_hash = categorizer.config_hash
+        categorizer.config_hash = 'degisti'
+        self.check(not categorizer.is_up_to_date(), "Keyword ayarı değişince güncel değil")
+        categorizer.config_hash = config_hash
+
+        with open(input_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        with open(input_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        self.check(not categorizer.is_up_to_date(), "Girdi dosyası değişince güncel değil")
+
+    def check_batch(self):
+        """İkinci toplu çalıştırma güncel dosyaları atlar, --force hepsini işler"""
+        print("\n[2] Test: Toplu Yeniden İşleme")
+        print("-" * 80)
+
+        selected = select_inputs(self.data_dir, date_from=DATES[1], date_to=DATES[2])
+        self.check([os.path.basename(path) for path in selected] ==
+                   [f'daily_raw_{date}.json' for date in DATES[1:]], "--from/--to aralığındaki dosyalar seçildi")
+
+        os.environ[categorize_horoscopes.MANIFEST_ENV] = self.manifest_file
+        try:
+            first = self.run_main('--from', DATES[0], '--data-dir', self.data_dir)
+            second = self.run_main('--from', DATES[0], '--data-dir', self.data_dir)
+            forced = self.run_main('--from', DATES[0], '--data-dir', self.data_dir, '--force')
+        finally:
+            del os.environ[categorize_horoscopes.MANIFEST_ENV]
+
+        self.check("3 dosyadan 0 tanesi güncel" in first, "İlk çalıştırmada girdisi değişen dosya da işlendi")
+        self.check("3 dosyadan 3 tanesi güncel" in second and "Sonuç kaydediliyor" not in second,
+                   "İkinci çalıştırmada hiçbir dosya yeniden işlenmedi")
+        self.check(forced.count("Sonuç kaydediliyor") == 3, "--force ile tüm dosyalar işlendi")
+
+    def run_all_tests(self) -> bool:
+        self.check_fingerprint()
+        self.check_batch()
+
+        print("\n" + "=" * 80)
+        if self.errors:
+            print(f"[X] TEST BASARISIZ - {len(self.errors)} hata")
+            return False
+        print("[OK] TEST BASARILI - Toplu kategorizasyon guncel dosyalari atliyor!")
+        return True
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as work_dir:
+        success = ManifestValidator(work_dir).run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
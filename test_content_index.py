@@ -0,0 +1,178 @@
+"""
+İçerik Hash Tablosu Test Sistemi
+
+Birden fazla sitede birebir yayımlanan metnin (content_index.py) pipeline'da bir
+kez işlendiğini dener:
+  - Kategorizasyon: tekrar eden genel metni bir kez kategorize edilir, sonucu
+    tüm hücrelerde aynıdır; sadece boşlukları farklı olan metin ayrıca işlenir.
+  - Skorlama: her farklı metin bir kez taranır, skorlar metinleri baştan tarayan
+    hesapla aynıdır.
+  - Özetleme: her farklı metin bir kez cümlelere bölünür, özetler aynıdır.
+
+Geçici bir klasörde çalışır; gerçek veri dosyalarına dokunmaz.
+
+Kullanım:
+    python test_content_index.py
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+
+import content_index
+import scorer
+from categorize_horoscopes import HoroscopeCategorizer
+from summarizer import TurkishHoroscopeSummarizer
+
+SHARED_TEXT = ("Bugün aşk hayatınızda romantik ve tutkulu anlar yaşayabilirsiniz. "
+               "Para konusunda yeni bir kazanç fırsatı kapınızı çalıyor. "
+               "Sağlık açısından biraz yorgun hissedebilirsiniz, dinlenmeye özen gösterin.")
+OTHER_TEXT = ("İş yerinde zorlu bir gün sizi bekliyor. "
+              "Maddi konularda dikkatli olun, gereksiz harcamalardan kaçının. "
+              "Partnerinizle güzel bir akşam geçirebilirsiniz.")
+# Hash'i aynı (boşluklar normalize edilir) ama metni farklı: ayrıca işlenmeli
+SPACED_TEXT = SHARED_TEXT.replace('. ', '.  ')
+
+RAW_DATA = {
+    'site_a': {'Koç': {'genel': SHARED_TEXT}, 'Boğa': {'genel': OTHER_TEXT}},
+    'site_b': {'Koç': {'genel': SHARED_TEXT}, 'Boğa': {'genel': 'null'}},
+    'site_c': {'Koç': {'genel': SPACED_TEXT}, 'Boğa': {'genel': SHARED_TEXT}},
+}
+
+
+class ContentIndexValidator:
+    """Her kontrol başarısızlıkta errors listesine mesaj ekler"""
+
+    def __init__(self, work_dir: str):
+        self.work_dir = work_dir
+        self.errors = []
+        self.processed_file = os.path.join(work_dir, 'processed_daily_raw_2025-12-04.json')
+
+    def check(self, condition: bool, message: str):
+        print(f"  [{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            self.errors.append(message)
+
+    def check_categorize(self):
+        """Tekrar eden metin bir kez kategorize edilir, tüm hücrelere aynı sonuç yazılır"""
+        print("\n[1] Test: Kategorizasyon")
+        print("-" * 80)
+
+        raw_file = os.path.join(self.work_dir, 'daily_raw_2025-12-04.json')
+        with open(raw_file, 'w', encoding='utf-8') as f:
+            json.dump(RAW_DATA, f, ensure_ascii=False)
+        index = content_index.write(raw_file, 'raw', RAW_DATA)
+        self.check(list(index.values()) == [[['site_a', 'Koç', 'genel'], ['site_b', 'Koç', 'genel'],
+                                             ['site_c', 'Koç', 'genel'], ['site_c', 'Boğa', 'genel']]],
+                   "Ham tabloda tekrar eden metnin hücreleri veri sırasıyla yer alıyor")
+
+        categorizer = HoroscopeCategorizer(raw_file, self.processed_file,
+                                           manifest_file=os.path.join(self.work_dir, 'manifest.json'))
+        calls = []
+        categorize_text = categorizer.categorize_text
+
+        def counting_categorize_text(text):
+            calls.append(text)
+            return categorize_text(text)
+
+        categorizer.categorize_text = counting_categorize_text
+        data = categorizer.process_file()
+
+        self.check(calls.count(SHARED_TEXT) == 1, "Tekrar eden metin bir kez kategorize edildi")
+        self.check(calls.count(SPACED_TEXT) == 1, "Boşlukları farklı metin ayrıca kategorize edildi")
+        self.check(len(calls) == 3, f"Toplam kategorizasyon: {len(calls)} (beklenen 3)")
+
+        cells = [data['site_a']['Koç'], data['site_b']['Koç'], data['site_c']['Boğa']]
+        self.check(all(cell == cells[0] for cell in cells) and 'aşk' in cells[0],
+                   "Tekrar eden metnin tüm hücrelerinde kategoriler aynı")
+        self.check(data['site_b']['Boğa'] == {'genel': 'null'}, "Boş hücre olduğu gibi kaldı")
+        self.check(content_index.load(self.processed_file, 'processed', {}) == content_index.build(data),
+                   "Kategorize veri için 'processed' tablosu yazıldı")
+
+    def check_score(self):
+        """Her farklı metin bir kez taranır; skorlar tam tarama ile aynıdır"""
+        print("\n[2] Test: Skorlama")
+        print("-" * 80)
+
+        with open(self.processed_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        index = content_index.load(self.processed_file, 'processed', data)
+
+        scanned = []
+        matches = scorer.LEXICON_MATCHER.matches
+
+        def counting_matches(text):
+            scanned.append(text)
+            return matches(text)
+
+        scorer.LEXICON_MATCHER.matches = counting_matches
+        try:
+            scores = scorer.score_all_burcs(data, index)
+        finally:
+            del scorer.LEXICON_MATCHER.matches
+
+        texts = [text for site in data.values() for cells in site.values()
+                 for text in cells.values() if text and text != 'null']
+        self.check(len(scanned) == len(set(texts)) < len(texts),
+                   f"{len(texts)} hücrede {len(set(texts))} farklı metin, {len(scanned)} tarama")
+
+        # Eşleşmeler verilmeden (her burçta birleşik metin baştan taranarak) aynı sonuç
+        for burc in ('Koç', 'Boğa'):
+            merged = {cat: [site[burc][cat] for site in data.values()
+                            if site[burc].get(cat) and site[burc][cat] != 'null']
+                      for cat in ('genel', 'aşk', 'para', 'sağlık')}
+            self.check(scores[burc] == scorer.score_burc(burc, merged),
+                       f"{burc} skorları tam taramayla aynı")
+
+    def check_summarize(self):
+        """Her farklı metin bir kez cümlelere bölünür; özetler aynıdır"""
+        print("\n[3] Test: Özetleme")
+        print("-" * 80)
+
+        with open(self.processed_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        summarizer = TurkishHoroscopeSummarizer(use_ml=False)
+        expected = {sign: {category: summarizer.summarize_category(sign, category, data)
+                           for category in ('genel', 'aşk', 'para', 'sağlık')}
+                    for sign in ('Koç', 'Boğa')}
+
+        split = []
+        split_sentences = summarizer.split_sentences
+
+        def counting_split(text):
+            split.append(text)
+            return split_sentences(text)
+
+        summarizer.split_sentences = counting_split
+        summaries = summarizer.summarize_all(data, index=content_index.load(self.processed_file, 'processed', data))
+
+        texts = {text for site in data.values() for cells in site.values()
+                 for text in cells.values() if text and text != 'null'}
+        self.check(len(split) == len(texts), f"{len(texts)} farklı metin, {len(split)} bölme")
+        self.check(all(summaries[sign] == expected[sign] for sign in expected),
+                   "Özetler tablo kullanılmadan üretilenlerle aynı")
+
+    def run_all_tests(self) -> bool:
+        self.check_categorize()
+        self.check_score()
+        self.check_summarize()
+
+        print("\n" + "=" * 80)
+        if self.errors:
+            print(f"[X] TEST BASARISIZ - {len(self.errors)} hata")
+            return False
+        print("[OK] TEST BASARILI - Tekrar eden metinler bir kez isleniyor!")
+        return True
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as work_dir:
+        success = ContentIndexValidator(work_dir).run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
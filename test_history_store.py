@@ -0,0 +1,136 @@
+"""
+Sıralama Geçmişi Deposu Test Sistemi
+
+history_store.py'nin aylık JSONL parçalarını geçici bir klasörde dener:
+  - Eski tek dosyalık rankings_history.json parçalara bir kez aktarılır.
+  - Aynı gün aynı sıralamayla yeniden eklenince hiçbir şey yazılmaz; farklı
+    sıralamayla eklenince parça her gün tek satır olacak şekilde yeniden yazılır.
+  - Yazılırken kesilmiş son satır okunurken atlanır, sonraki ekleme yeni satırdan
+    başlar ve index düzelir.
+
+Kullanım:
+    python test_history_store.py
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+
+import history_store
+
+
+def ranking(score: float) -> dict:
+    return {'genel_ranking': [{'burc': 'Koç', 'score': score}, {'burc': 'Boğa', 'score': score - 1}]}
+
+
+LEGACY = {
+    '2025-12-02': ranking(71.0),
+    '2025-12-01': ranking(70.0),
+    '2025-11-30': ranking(69.0),
+}
+
+
+def line_count(path: str) -> int:
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for line in f if line.strip())
+
+
+class HistoryStoreValidator:
+    """Her kontrol başarısızlıkta errors listesine mesaj ekler"""
+
+    def __init__(self, work_dir: str):
+        self.history_dir = os.path.join(work_dir, 'rankings_history')
+        self.legacy_path = os.path.join(work_dir, 'rankings_history.json')
+        self.errors = []
+
+    def check(self, condition: bool, message: str):
+        print(f"  [{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            self.errors.append(message)
+
+    def check_migration(self):
+        """Eski tek dosya parçalara bir kez aktarılır"""
+        print("\n[1] Test: Eski Dosyanın Aktarılması")
+        print("-" * 80)
+
+        with open(self.legacy_path, 'w', encoding='utf-8') as f:
+            json.dump(LEGACY, f)
+        migrated = history_store.migrate_legacy(self.legacy_path, self.history_dir)
+        self.check(migrated == 3, f"{migrated} gün aktarıldı")
+        self.check(history_store.load_index(self.history_dir) ==
+                   {'2025-12': ['2025-12-02', '2025-12-01'], '2025-11': ['2025-11-30']},
+                   "Index ay -> günler (yeniden eskiye)")
+        self.check(history_store.load_range(history_dir=self.history_dir) == LEGACY,
+                   "Parçalardan okunan geçmiş eski dosyayla aynı")
+        self.check(history_store.load_range('2025-12-01', '2025-12-31', self.history_dir) ==
+                   {date: LEGACY[date] for date in ('2025-12-02', '2025-12-01')},
+                   "Tarih aralığı sadece ilgili günleri döner")
+        self.check(history_store.migrate_legacy(self.legacy_path, self.history_dir) == 0,
+                   "Geçmiş varken ikinci kez aktarılmadı")
+        self.check(history_store.span(history_store.load_index(self.history_dir)) ==
+                   ('2025-11-30', '2025-12-02'), "En eski / en yeni gün index'ten")
+
+    def check_rerank(self):
+        """Aynı sıralama yeniden yazılmaz, değişen sıralama parçada tek satır kalır"""
+        print("\n[2] Test: Aynı Günün Yeniden Sıralanması")
+        print("-" * 80)
+
+        path = history_store.segment_path(self.history_dir, '2025-12')
+        self.check(history_store.append_day('2025-12-03', ranking(72.0), self.history_dir),
+                   "Yeni gün eklendi")
+        mtime = os.stat(path).st_mtime_ns
+        lines = line_count(path)
+        self.check(not history_store.append_day('2025-12-03', ranking(72.0), self.history_dir),
+                   "Aynı sıralama için değişiklik yok")
+        self.check(line_count(path) == lines and os.stat(path).st_mtime_ns == mtime,
+                   "Parçaya satır eklenmedi")
+
+        self.check(history_store.append_day('2025-12-03', ranking(75.0), self.history_dir),
+                   "Değişen sıralama yazıldı")
+        days = history_store.read_segment(path)
+        self.check(line_count(path) == len(days) == 3, "Parçada her gün tek satır")
+        self.check(days['2025-12-03'] == ranking(75.0), "Günün yeni sıralaması okunuyor")
+        self.check(not any(name.endswith('.tmp') for name in os.listdir(self.history_dir)),
+                   "Geçici dosya kalmadı")
+
+    def check_truncated(self):
+        """Kesilmiş son satır atlanır, sonraki ekleme yeni satırdan başlar"""
+        print("\n[3] Test: Yarım Kalmış Yazma")
+        print("-" * 80)
+
+        path = history_store.segment_path(self.history_dir, '2025-12')
+        line = json.dumps({'date': '2025-12-04', 'rankings': ranking(73.0)})
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(line[:len(line) // 2])
+        self.check('2025-12-04' not in history_store.read_segment(path), "Yarım satır atlandı")
+
+        history_store.append_day('2025-12-05', ranking(74.0), self.history_dir)
+        days = history_store.read_segment(path)
+        self.check(days.get('2025-12-05') == ranking(74.0), "Sonraki gün yarım satıra yapışmadan eklendi")
+        self.check(history_store.dates(self.history_dir)[:2] == ['2025-12-05', '2025-12-03'],
+                   "Index parçadaki günlerle güncellendi")
+
+    def run_all_tests(self) -> bool:
+        self.check_migration()
+        self.check_rerank()
+        self.check_truncated()
+
+        print("\n" + "=" * 80)
+        if self.errors:
+            print(f"[X] TEST BASARISIZ - {len(self.errors)} hata")
+            return False
+        print("[OK] TEST BASARILI - Siralama gecmisi deposu duzgun calisiyor!")
+        return True
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as work_dir:
+        success = HistoryStoreValidator(work_dir).run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
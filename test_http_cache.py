@@ -0,0 +1,179 @@
+"""
+HTTP Cache Test Sistemi
+
+Fetcher'ın disk cache'ini replay sunucusuna karşı uçtan uca dener:
+  - Cache'teki sayfa süresi dolunca koşullu istekle (ETag) 304 alır ve gövdeyi
+    cache'ten döner; scraper'ın istek metriği bu response'la kurulabilir.
+  - Temizlik (prune) kayıtları meta'daki stored_at'e göre bütün olarak siler;
+    304 ile yeni tazelenmiş kaydın gövdesi ve parse sonucu korunur.
+  - stream_until ile kesilmiş gövde kısmi olarak saklanır; sayfanın tamamını
+    isteyen çağırana ne cache'ten ne de 304 ile verilir.
+
+Ağa çıkmaz; geçici bir snapshot deposu ve cache klasörü kullanır.
+
+Kullanım:
+    python test_http_cache.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import fetcher
+import scraper
+from replay_server import ReplayConfig, make_server
+from snapshots import SnapshotStore
+
+# Testte kullanılan sayfa (replay sunucusu host/path ile eşleştirir)
+HOST = 'cache-test.local'
+URL = f'https://{HOST}/burc/koc-burcu-gunluk/'
+BODY = '<html><body><div class="yorum">Koç burcu için test yorumu.</div></body></html>'.encode('utf-8')
+
+# Akış halinde okunurken ilk figcaption'dan sonra kesilen uzun sayfa
+PARTIAL_URL = f'https://{HOST}/burc/boga-burcu-gunluk/'
+LONG_BODY = ('<html><body><figure><figcaption>Boğa</figcaption></figure>'
+             + ''.join(f'<p>{i} {"y" * 200}</p>' for i in range(400))
+             + '<div class="yorum">Sayfanın sonu.</div></body></html>').encode('utf-8')
+
+
+class CacheValidator:
+    """Her kontrol başarısızlıkta errors listesine mesaj ekler"""
+
+    def __init__(self, work_dir: str):
+        self.work_dir = work_dir
+        self.errors = []
+
+    def check(self, condition: bool, message: str):
+        print(f"  [{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            self.errors.append(message)
+
+    def check_revalidation(self):
+        """Süresi dolmuş cache kaydı 304 ile tazelenir ve metriğe dönüştürülebilir"""
+        print("\n[1] Test: 304 ile Tazeleme")
+        print("-" * 80)
+
+        store = SnapshotStore(os.path.join(self.work_dir, 'snapshots'), '2025-12-04')
+        store.save('test', 'Koç', URL, BODY)
+        config = ReplayConfig(store)
+        server = make_server(config, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        # TTL 0: ikinci istek cache'ten değil koşullu istekle yanıtlanır
+        fetcher.HOST_CONFIG[HOST] = {'cache_ttl': 0, 'rate': 100.0, 'burst': 10}
+        fetcher.configure(cache_dir=os.path.join(self.work_dir, 'http'),
+                          base_url=f'http://127.0.0.1:{server.server_port}')
+        try:
+            first = fetcher.fetch(URL, key='Koç')
+            second = fetcher.fetch(URL, key='Koç')
+        finally:
+            fetcher.configure(cache_dir=None, base_url=None)
+            fetcher.HOST_CONFIG.pop(HOST, None)
+            server.shutdown()
+            server.server_close()
+
+        self.check(first.timings.get('source') == 'network', "İlk istek ağdan geldi")
+        self.check(config.stats['304'] == 1, "Sunucu ikinci isteğe 304 döndü")
+        self.check(second.timings.get('source') == 'revalidated', "İkinci response 'revalidated' işaretli")
+        self.check(second.status_code == 200 and second.content == BODY, "Gövde cache'ten okundu")
+
+        try:
+            record = scraper._request_metric('test', 'Koç', URL, second)
+        except TypeError as e:
+            self.check(False, f"İstek metriği kurulamadı: {e}")
+            return
+        self.check(record['status'] == 200 and record['bytes'] == len(BODY),
+                   "Metrikte status/bytes response'tan geldi")
+
+    def check_prune(self):
+        """Tazelenen kayıt dosyalarının mtime'ı eski olsa da korunur, eskimiş kayıt bütün olarak silinir"""
+        print("\n[2] Test: Cache Temizliği")
+        print("-" * 80)
+
+        cache = fetcher.HttpCache(os.path.join(self.work_dir, 'prune'))
+        response = fetcher._stored_response(URL, BODY)
+        old_url = URL + 'eski/'
+        metas = {}
+        for url in (URL, old_url):
+            metas[url] = cache.put(url, response)
+            cache.put_parsed(url, 'fingerprint', {'Koç': 'yorum'})
+
+        # Tüm dosyalar max_age'den eski; URL'in kaydı ardından 304 ile tazelendi
+        max_age = 3600
+        old_time = time.time() - 2 * max_age
+        for name in os.listdir(cache.cache_dir):
+            os.utime(os.path.join(cache.cache_dir, name), (old_time, old_time))
+        cache.touch(URL, metas[URL])
+        with open(cache._paths(old_url)[0], 'w', encoding='utf-8') as f:
+            json.dump(dict(metas[old_url], stored_at=old_time), f)
+
+        removed = cache.prune(max_age)
+        self.check(removed == 1, "Sadece eskimiş kayıt silindi")
+        self.check(cache.get(URL) is not None and cache.get_parsed(URL, 'fingerprint') is not None,
+                   "Tazelenen kaydın gövdesi ve parse sonucu korundu")
+        old_key = os.path.basename(cache._base(old_url))
+        self.check(not any(name.startswith(old_key) for name in os.listdir(cache.cache_dir)),
+                   "Eskimiş kaydın gövde, meta ve parse dosyaları birlikte silindi")
+
+    def check_partial(self):
+        """Kesilmiş gövde, stream_until'siz isteğe cache'ten ya da 304 ile verilmez"""
+        print("\n[3] Test: Kısmi Gövde")
+        print("-" * 80)
+
+        store = SnapshotStore(os.path.join(self.work_dir, 'snapshots-partial'), '2025-12-04')
+        store.save('test', 'Boğa', PARTIAL_URL, LONG_BODY)
+        config = ReplayConfig(store)
+        server = make_server(config, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        # Uzun TTL: kayıt tazeyken de kısmi gövde sayfanın tamamı yerine geçmemeli
+        fetcher.HOST_CONFIG[HOST] = {'cache_ttl': 3600, 'rate': 100.0, 'burst': 10}
+        cache_dir = os.path.join(self.work_dir, 'http-partial')
+        fetcher.configure(cache_dir=cache_dir, base_url=f'http://127.0.0.1:{server.server_port}')
+        rule = {'tag': 'figcaption'}
+        try:
+            streamed = fetcher.fetch(PARTIAL_URL, key='Boğa', stream_until=rule)
+            partial_meta = fetcher.HttpCache(cache_dir).get(PARTIAL_URL)[0]
+            full = fetcher.fetch(PARTIAL_URL, key='Boğa')
+            full_meta = fetcher.HttpCache(cache_dir).get(PARTIAL_URL)[0]
+            streamed_again = fetcher.fetch(PARTIAL_URL, key='Boğa', stream_until=rule)
+        finally:
+            fetcher.configure(cache_dir=None, base_url=None)
+            fetcher.HOST_CONFIG.pop(HOST, None)
+            server.shutdown()
+            server.server_close()
+
+        self.check(streamed.timings.get('truncated') and len(streamed.content) < len(LONG_BODY),
+                   "Akış halinde okunan gövde kesildi")
+        self.check(partial_meta.get('partial') is True, "Cache kaydı kısmi olarak işaretlendi")
+        self.check(full.timings.get('source') == 'network' and config.stats['304'] == 0,
+                   "stream_until'siz istek kısmi kaydı kullanmadan ağdan geldi (koşullu istek yok)")
+        self.check(full.content == LONG_BODY, "Sayfanın tamamı döndü")
+        self.check('partial' not in full_meta, "Cache kaydı tam gövdeyle değişti")
+        self.check(streamed_again.timings.get('source') == 'cache' and streamed_again.content == LONG_BODY,
+                   "Tam kayıt akış halinde okuyan çağırana da cache'ten verildi")
+
+    def run_all_tests(self) -> bool:
+        self.check_revalidation()
+        self.check_prune()
+        self.check_partial()
+
+        print("\n" + "=" * 80)
+        if self.errors:
+            print(f"[X] TEST BASARISIZ - {len(self.errors)} hata")
+            return False
+        print("[OK] TEST BASARILI - HTTP cache duzgun calisiyor!")
+        return True
+
+
+def main():
+    with tempfile.TemporaryDirectory() as work_dir:
+        success = CacheValidator(work_dir).run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Çoklu Kelime/İfade Eşleştirici Test Sistemi
+
+phrasematch.PhraseMatcher'ın yerini aldığı kelime kelime kontrollerle aynı sonucu
+verdiğini dener:
+  - scorer'ın kelime listeleri ve categorizer'ın ifade listeleri için data/ altındaki
+    tüm metinlerde counts() == text.count(kelime), found() == `kelime in text`.
+  - Çakışan, iç içe ve aynı yerde başlayan kelimeler str.count gibi sayılır.
+  - joined_matches, birleştirilmiş metnin baştan taranmasıyla aynı eşleşmeleri döner.
+
+Kullanım:
+    python test_phrasematch.py
+"""
+
+import glob
+import json
+import logging
+import os
+import random
+import sys
+
+import scorer
+from categorize_horoscopes import HoroscopeCategorizer
+from phrasematch import PhraseMatcher
+
+
+def expected_counts(phrases, text: str) -> dict:
+    """Eski hesap: her kelime için text.count"""
+    counts = {phrase: text.count(phrase) for phrase in phrases}
+    return {phrase: count for phrase, count in counts.items() if count}
+
+
+def data_texts() -> list:
+    """data/ altındaki ham ve kategorize dosyalardaki farklı metinler (küçük harfle)"""
+    texts = set()
+    paths = glob.glob(os.path.join('data', 'daily_raw_*.json')) + \
+        glob.glob(os.path.join('data', 'processed_daily_raw_*.json'))
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for site_data in data.values():
+            for categories in (site_data or {}).values():
+                for text in (categories or {}).values():
+                    if text and text != 'null':
+                        texts.add(text.lower())
+    return sorted(texts)
+
+
+class PhraseMatchValidator:
+    """Her kontrol başarısızlıkta errors listesine mesaj ekler"""
+
+    def __init__(self):
+        self.errors = []
+        self.texts = data_texts()
+
+    def check(self, condition: bool, message: str):
+        print(f"  [{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            self.errors.append(message)
+
+    def check_lists(self, name: str, matcher: PhraseMatcher):
+        """Listenin tüm metinlerde eski kontrollerle aynı sonucu vermesi"""
+        different = [text for text in self.texts
+                     if matcher.counts(text) != expected_counts(matcher.phrases, text)
+                     or matcher.found(text) != {p for p in matcher.phrases if p in text}]
+        self.check(not different, f"{name} ({len(matcher.phrases)} kelime): {len(self.texts)} metinde "
+                   f"counts/found str.count ve `in` ile aynı"
+                   + (f" (örn. {different[0][:60]!r})" if different else ""))
+
+    def check_data(self):
+        """scorer ve categorizer listeleri data/ metinlerinde"""
+        print("\n[1] Test: Veri Metinleri")
+        print("-" * 80)
+
+        self.check_lists("scorer.LEXICON_MATCHER", scorer.LEXICON_MATCHER)
+        self.check_lists("categorizer ifadeleri", HoroscopeCategorizer().phrase_matcher)
+
+    def check_edge_cases(self):
+        """Çakışan, iç içe ve aynı yerde başlayan kelimeler"""
+        print("\n[2] Test: Çakışan Kelimeler")
+        print("-" * 80)
+
+        cases = [
+            (['aa'], 'aaaaa'),
+            (['aa', 'a', 'aaa'], 'aaaa baaa'),
+            (['güç', 'güçlü', 'lü'], 'güçlü ve güç güçlülük'),
+            (['aşk', 'aşk hayatı', 'hayat'], 'aşk hayatınızda aşk hayatı'),
+            (['abab', 'bab'], 'ababababab'),
+            ([], 'metin'),
+            (['x'], ''),
+        ]
+        for phrases, text in cases:
+            matcher = PhraseMatcher(phrases)
+            self.check(matcher.counts(text) == expected_counts(matcher.phrases, text),
+                       f"{phrases} / {text!r}: {matcher.counts(text)}")
+
+    def check_random(self, rounds: int = 2000):
+        """Küçük alfabeyle rastgele listeler, metinler ve birleştirmeler"""
+        print("\n[3] Test: Rastgele Metinler")
+        print("-" * 80)
+
+        rng = random.Random(22)
+
+        def word(alphabet: str, low: int, high: int) -> str:
+            return ''.join(rng.choice(alphabet) for _ in range(rng.randint(low, high)))
+
+        count_errors = joined_errors = 0
+        for _ in range(rounds):
+            matcher = PhraseMatcher(word('ab ', 1, 4) for _ in range(rng.randint(1, 6)))
+            parts = [word('ab ', 0, 8) for _ in range(rng.randint(1, 5))]
+            sep = rng.choice([' ', '', 'a', '. '])
+            joined = sep.join(parts)
+            if matcher.counts(joined) != expected_counts(matcher.phrases, joined):
+                count_errors += 1
+            matches = matcher.joined_matches(parts, [matcher.matches(part) for part in parts], sep)
+            if matches != matcher.matches(joined):
+                joined_errors += 1
+        self.check(count_errors == 0, f"{rounds} rastgele metinde counts str.count ile aynı ({count_errors} fark)")
+        self.check(joined_errors == 0,
+                   f"{rounds} birleştirmede joined_matches baştan taramayla aynı ({joined_errors} fark)")
+
+    def run_all_tests(self) -> bool:
+        self.check_data()
+        self.check_edge_cases()
+        self.check_random()
+
+        print("\n" + "=" * 80)
+        if self.errors:
+            print(f"[X] TEST BASARISIZ - {len(self.errors)} hata")
+            return False
+        print("[OK] TEST BASARILI - Eslestirici eski kontrollerle ayni sonucu veriyor!")
+        return True
+
+
+def main():
+    logging.disable(logging.WARNING)
+    success = PhraseMatchValidator().run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
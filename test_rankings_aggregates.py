@@ -0,0 +1,163 @@
+"""
+Haftalık / Aylık Toplam Test Sistemi
+
+ranker.py'nin dönem toplamlarını (rankings_aggregates.json) data/rankings_history
+üzerinde dener:
+  - Günler tek tek eklenerek ilerletilen toplamlar sıfırdan hesaplananlarla aynıdır.
+  - Her gün ve dönem için ortalamalar, toplamlar öncesindeki hesapla (pencere günlerinin
+    skorları en yeni gün önce toplanıp gün sayısına bölünür) birebir aynıdır.
+  - API (/api/rankings/{date}?period=...) toplamlar dosyasıyla da dosyasız da
+    aynı skorları döner.
+
+Geçici bir veri klasörü kullanır; data/ altına yazmaz.
+
+Kullanım:
+    python test_rankings_aggregates.py
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import history_store
+import ranker
+
+HISTORY_DIR = os.path.join("data", "rankings_history")
+
+API_KEYS = {'genel_ranking': 'general', 'aşk_ranking': 'love',
+            'para_ranking': 'money', 'sağlık_ranking': 'health'}
+
+
+def baseline_averages(history: dict, end_date: str, days: int) -> dict:
+    """Toplamlar öncesindeki API hesabı: api kategori -> burç -> round(ortalama, 1)"""
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+    scores = {api_key: {} for api_key in API_KEYS.values()}
+    for i in range(days):
+        date = (end - timedelta(days=i)).strftime("%Y-%m-%d")
+        for file_key, api_key in API_KEYS.items():
+            for item in history.get(date, {}).get(file_key, []):
+                scores[api_key].setdefault(item['burc'], []).append(item['score'])
+    return {api_key: {burc: round(sum(values) / len(values), 1) for burc, values in signs.items()}
+            for api_key, signs in scores.items()}
+
+
+def aggregate_averages(aggregate: dict) -> dict:
+    """Dönem toplamından API'deki gibi hesaplanan ortalamalar"""
+    return {API_KEYS[file_key]: {burc: round(sum(entry['scores']) / len(entry['scores']), 1)
+                                 for burc, entry in aggregate.get(file_key, {}).items()}
+            for file_key in API_KEYS}
+
+
+class AggregateValidator:
+    """Her kontrol başarısızlıkta errors listesine mesaj ekler"""
+
+    def __init__(self, work_dir: str):
+        self.work_dir = work_dir
+        self.errors = []
+        self.history = history_store.load_range(history_dir=HISTORY_DIR)
+
+    def check(self, condition: bool, message: str):
+        print(f"  [{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            self.errors.append(message)
+
+    def check_incremental(self):
+        """Günler sırayla eklenerek ilerletilen toplamlar sıfırdan hesaplananlarla aynı"""
+        print("\n[1] Test: Artımlı ve Sıfırdan Toplamlar")
+        print("-" * 80)
+
+        rebuilt = ranker.update_aggregates(self.history, max(self.history), None)
+        incremental = None
+        for date in sorted(self.history):
+            known = {d: rankings for d, rankings in self.history.items() if d <= date}
+            incremental = ranker.update_aggregates(known, date, incremental)
+        # JSON'a yazılıp okunan hali (burç sırası dahil) aynı olmalı
+        self.check(json.dumps(incremental, ensure_ascii=False) == json.dumps(rebuilt, ensure_ascii=False),
+                   f"{len(self.history)} gün ilerletilen toplamlar sıfırdan hesaplananlarla aynı")
+
+        # Geçmiş bir günün güncellenmesi o günü içeren dönemleri yeniden hesaplar
+        date = sorted(self.history)[len(self.history) // 2]
+        changed = json.loads(json.dumps(self.history))
+        changed[date]['genel_ranking'][0]['score'] += 10
+        updated = ranker.update_aggregates(changed, date, json.loads(json.dumps(rebuilt)))
+        self.check(updated == ranker.update_aggregates(changed, max(changed), None),
+                   f"{date} güncellenince toplamlar sıfırdan hesaplananlarla aynı")
+
+    def check_baseline(self):
+        """Her gün ve dönem için ortalamalar toplamlar öncesindeki hesapla aynı"""
+        print("\n[2] Test: Ortalamalar")
+        print("-" * 80)
+
+        aggregates = ranker.update_aggregates(self.history, max(self.history), None)
+        for period, days in ranker.AGGREGATE_PERIODS.items():
+            mismatches = [
+                f"{date} {api_key} {burc}: {average} != {expected[api_key][burc]}"
+                for date in sorted(self.history)
+                for expected in [baseline_averages(self.history, date, days)]
+                for api_key, signs in aggregate_averages(aggregates[period][date]).items()
+                for burc, average in signs.items()
+                if expected[api_key].get(burc) != average
+            ]
+            self.check(not mismatches, f"{period}: {len(self.history)} günün ortalamaları aynı"
+                       + (f" ({len(mismatches)} fark, örn. {mismatches[0]})" if mismatches else ""))
+
+    def check_api(self):
+        """API toplamlar dosyasıyla ve dosyasız toplamlar öncesindeki skorları döner"""
+        print("\n[3] Test: API")
+        print("-" * 80)
+
+        import main
+
+        data_dir = Path(self.work_dir) / 'data'
+        shutil.copytree(HISTORY_DIR, data_dir / 'rankings_history')
+        main.DATA_DIR = data_dir
+        main.DB_PATH = str(data_dir / 'aistrolog.db')
+
+        def responses() -> dict:
+            return {
+                (period, date): asyncio.run(main.get_rankings(
+                    datetime.strptime(date, "%Y-%m-%d").strftime("%d-%m-%Y"), period))['rankings']
+                for period in ranker.AGGREGATE_PERIODS for date in sorted(self.history)
+            }
+
+        without_aggregates = responses()
+        ranker.save_aggregates(ranker.update_aggregates(self.history, max(self.history), None),
+                               str(data_dir / 'rankings_aggregates.json'))
+        with_aggregates = responses()
+
+        expected_mismatches = 0
+        for (period, date), rankings in with_aggregates.items():
+            expected = baseline_averages(self.history, date, ranker.AGGREGATE_PERIODS[period])
+            for api_key, items in rankings.items():
+                expected_mismatches += sum(item['score'] != expected[api_key][item['sign']] for item in items)
+        self.check(expected_mismatches == 0, "Toplamlarla API skorları toplamlar öncesindeki hesapla aynı")
+        self.check(with_aggregates == without_aggregates, "Toplamlar dosyası olmadan da aynı sıralamalar")
+
+    def run_all_tests(self) -> bool:
+        self.check_incremental()
+        self.check_baseline()
+        self.check_api()
+
+        print("\n" + "=" * 80)
+        if self.errors:
+            print(f"[X] TEST BASARISIZ - {len(self.errors)} hata")
+            return False
+        print("[OK] TEST BASARILI - Donem toplamlari dogru!")
+        return True
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as work_dir:
+        success = AggregateValidator(work_dir).run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
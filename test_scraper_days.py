@@ -0,0 +1,213 @@
+"""
+Eksik Hücre Tamamlama ve Backfill Test Sistemi
+
+scraper.py'nin günün ham dosyasını yeniden kurmadan tamamlayan ve geçmiş günleri
+çeken modlarını dener:
+  - --resume sadece dosyada boş kalan hücrelerin sayfalarını çeker; dolu hücreler ve
+    SITES'ta olmayan eski siteler korunur, site sırası SITES'taki gibidir.
+  - Eksik kalmayan dosya için hiçbir sayfa çekilmez.
+  - --backfill her günün sayfasını o günün adresinden çeker ve günün dosyasına yazar;
+    adresi tarihten üretilemeyen siteler atlanır, var olan dosyada sadece boş
+    hücreler doldurulur.
+  - Metrikler çekilen günün scrape_metrics dosyasına, --resume'unkiler bugününkine yazılır.
+
+Ağa çıkmaz: scraper'ın sayfa çekme fonksiyonu yerine, istenen adresten sayfa üreten
+sahte bir fonksiyon kullanılır (parse fonksiyonları gerçek sayfa yapısıyla çalışır).
+Dosyalar geçici bir klasöre yazılır.
+
+Kullanım:
+    python test_scraper_days.py
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+
+import scraper
+from sites import BURC_SLUGS, BURCLAR, url_date
+
+BACKFILL_DAYS = ['2025-11-28', '2025-11-29', '2025-11-30']
+
+SLUG_BURCS = {slug: burc for burc, slug in BURC_SLUGS.items()}
+
+
+class FakeResponse:
+    """scrape_site'ın kullandığı kadarıyla requests.Response"""
+
+    def __init__(self, url: str, body: str):
+        self.url = url
+        self.content = body.encode('utf-8')
+        self.status_code = 200
+        self.timings = {'source': 'network'}
+
+
+def page_text(site_name: str, burc: str, day: str) -> str:
+    return f"{burc} burcu için {day} tarihli {site_name} test yorumu, parse edilecek kadar uzun."
+
+
+def fake_page(url: str) -> str:
+    """Adresten sitenin gerçek sayfa yapısında bir sayfa üretir"""
+    if 'mynet.com' in url:
+        slug = re.search(r'/([a-z]+)-burcu-gunluk-yorumu', url).group(1)
+        text = page_text('mynet', SLUG_BURCS[slug], 'bugün')
+        return (f'<html><body><div id="contextual"><div class="detail-content-inner">'
+                f'<p>{text}</p></div></div></body></html>')
+    if 'vogue.com.tr' in url:
+        day = url.rsplit('gunluk-burc-yorumlari-', 1)[1]
+        signs = ''.join(f'<h2>{burc} ve yükselen {burc}</h2><p>{page_text("vogue", burc, day)}</p>'
+                        for burc in BURCLAR)
+        return f'<html><body><div class="category-detail__content">{signs}</div></body></html>'
+    raise ValueError(f"Testte sayfası olmayan adres: {url}")
+
+
+class ScraperDaysValidator:
+    """Her kontrol başarısızlıkta errors listesine mesaj ekler"""
+
+    def __init__(self, work_dir: str):
+        self.work_dir = work_dir
+        self.errors = []
+        self.requested = []
+
+    def check(self, condition: bool, message: str):
+        print(f"  [{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            self.errors.append(message)
+
+    def fake_fetch_all(self, urls, stream_until=None):
+        self.requested.extend(urls.values())
+        return {key: FakeResponse(url, fake_page(url)) for key, url in urls.items()}
+
+    def check_resume(self):
+        """Sadece boş hücrelerin sayfaları çekilir, dolu hücreler korunur"""
+        print("\n[1] Test: Eksik Hücreleri Tamamlama (--resume)")
+        print("-" * 80)
+
+        output_dir = os.path.join(self.work_dir, 'resume')
+        os.makedirs(output_dir)
+        today = datetime.now().strftime("%Y-%m-%d")
+        filepath = os.path.join(output_dir, f"daily_raw_{today}.json")
+
+        # Eski site önde, vogue hiç yok, mynet'te Koç ve Aslan boş
+        mynet = {burc: {'genel': f"{burc} için önceki çalıştırmada alınmış yorum."} for burc in BURCLAR}
+        mynet['Koç']['genel'] = None
+        mynet['Aslan']['genel'] = None
+        existing = {'eski_site': {'Koç': {'genel': "Artık çekilmeyen bir siteden kalan yorum."}},
+                    'mynet': mynet}
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(existing, f, ensure_ascii=False)
+
+        self.requested = []
+        new_data, path = scraper.resume_day(output_dir=output_dir, site_names=['mynet', 'vogue'])
+        mynet_pages = sorted(url for url in self.requested if 'mynet.com' in url)
+        self.check(mynet_pages == sorted(f"https://www.mynet.com/kadin/burclar-astroloji/{BURC_SLUGS[burc]}"
+                                         f"-burcu-gunluk-yorumu.html" for burc in ('Koç', 'Aslan')),
+                   f"mynet'ten sadece boş 2 burcun sayfası çekildi ({len(mynet_pages)})")
+        self.check(sum('vogue.com.tr' in url for url in self.requested) == 1,
+                   "Dosyada olmayan vogue'un sayfası çekildi")
+
+        with open(path, 'r', encoding='utf-8') as f:
+            saved = json.load(f)
+        self.check(list(saved) == ['mynet', 'vogue', 'eski_site'],
+                   f"Site sırası SITES'taki gibi, eski site sonda: {list(saved)}")
+        self.check(saved['eski_site'] == existing['eski_site'], "SITES'ta olmayan eski site korundu")
+        self.check(all(saved['mynet'][burc]['genel'] == page_text('mynet', burc, 'bugün')
+                       for burc in ('Koç', 'Aslan')), "Boş hücreler dolduruldu")
+        self.check(all(saved['mynet'][burc] == mynet[burc] for burc in BURCLAR if burc not in ('Koç', 'Aslan')),
+                   "Dolu hücreler değiştirilmedi")
+        self.check(all(saved['vogue'][burc]['genel'] for burc in BURCLAR), "vogue'un 12 burcu eklendi")
+
+        self.requested = []
+        new_data, path = scraper.resume_day(output_dir=output_dir, site_names=['mynet', 'vogue'])
+        self.check(new_data == {} and not self.requested, "Eksik kalmayınca hiçbir sayfa çekilmedi")
+
+        metrics = scraper.write_metrics('resume', output_dir)
+        self.check([os.path.basename(path) for path in metrics] == [f"scrape_metrics_{today}.jsonl"],
+                   "--resume metrikleri bugünün dosyasına yazıldı")
+
+    def check_backfill(self):
+        """Her gün kendi adresinden çekilir ve kendi dosyasına yazılır"""
+        print("\n[2] Test: Geçmiş Günler (--backfill)")
+        print("-" * 80)
+
+        output_dir = os.path.join(self.work_dir, 'backfill')
+        os.makedirs(output_dir)
+        # Ortadaki günün dosyası var: mynet verisi ve vogue'un bir dolu, bir boş hücresi
+        existing = {'mynet': {'Koç': {'genel': "Günün kendi çalıştırmasında alınmış mynet yorumu."}},
+                    'vogue': {'Koç': {'genel': "Günün kendi çalıştırmasında alınmış vogue yorumu."},
+                              'Boğa': {'genel': None}}}
+        with open(os.path.join(output_dir, f"daily_raw_{BACKFILL_DAYS[1]}.json"), 'w', encoding='utf-8') as f:
+            json.dump(existing, f, ensure_ascii=False)
+
+        self.requested = []
+        days = [datetime.strptime(day, "%Y-%m-%d") for day in BACKFILL_DAYS]
+        paths = scraper.backfill_days(days[0], days[-1], workers=2, output_dir=output_dir,
+                                      site_names=['mynet', 'vogue'])
+        self.check([os.path.basename(path) for path in paths] ==
+                   [f"daily_raw_{day}.json" for day in BACKFILL_DAYS], "Her gün için dosya yazıldı (gün sırasıyla)")
+        self.check(not any('mynet.com' in url for url in self.requested),
+                   "Adresi tarihten üretilemeyen mynet atlandı")
+        self.check(sorted(self.requested) == sorted(
+            f"https://vogue.com.tr/astroloji/gunluk-burc-yorumlari-{url_date(day)}" for day in days),
+            f"vogue her gün için o günün adresinden bir kez çekildi ({len(self.requested)})")
+
+        saved = {}
+        for day, path in zip(days, paths):
+            with open(path, 'r', encoding='utf-8') as f:
+                saved[day] = json.load(f)
+        self.check(all(saved[day]['vogue'][burc]['genel'] == page_text('vogue', burc, url_date(day))
+                       for day in (days[0], days[2]) for burc in BURCLAR),
+                   "Dosyası olmayan günlere o günün yorumları yazıldı")
+        middle = saved[days[1]]
+        self.check(middle['mynet'] == existing['mynet'] and
+                   middle['vogue']['Koç'] == existing['vogue']['Koç'],
+                   "Var olan dosyadaki diğer site ve dolu hücre korundu")
+        self.check(middle['vogue']['Boğa']['genel'] == page_text('vogue', 'Boğa', url_date(days[1])) and
+                   len(middle['vogue']) == len(BURCLAR), "Var olan dosyadaki boş hücreler dolduruldu")
+
+        metrics_dir = os.path.join(self.work_dir, 'metrics')
+        metrics = scraper.write_metrics('backfill', metrics_dir)
+        self.check([os.path.basename(path) for path in metrics] ==
+                   [f"scrape_metrics_{day}.jsonl" for day in BACKFILL_DAYS],
+                   "Metrikler çekilen günlerin dosyalarına yazıldı (bugününkine değil)")
+        day_urls = []
+        for path in metrics:
+            with open(path, 'r', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+            day_urls.append([record['url'] for record in records if record['type'] == 'request'])
+        self.check(all(urls == [f"https://vogue.com.tr/astroloji/gunluk-burc-yorumlari-{url_date(day)}"]
+                       for day, urls in zip(days, day_urls)),
+                   "Her günün dosyasında sadece o günün istek kaydı var")
+
+    def run_all_tests(self) -> bool:
+        fetch_all = scraper.fetch_all
+        db_path = scraper.DB_PATH
+        scraper.fetch_all = self.fake_fetch_all
+        scraper.DB_PATH = None
+        try:
+            self.check_resume()
+            self.check_backfill()
+        finally:
+            scraper.fetch_all = fetch_all
+            scraper.DB_PATH = db_path
+
+        print("\n" + "=" * 80)
+        if self.errors:
+            print(f"[X] TEST BASARISIZ - {len(self.errors)} hata")
+            return False
+        print("[OK] TEST BASARILI - Eksik hucreler ve gecmis gunler dogru cekiliyor!")
+        return True
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as work_dir:
+        success = ScraperDaysValidator(work_dir).run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Kök Önbelleği Test Sistemi
+
+categorize_horoscopes.StemCache'in kalıcı kök sözlüğünü geçici bir klasörde dener:
+  - İlk çalıştırma sözlüğü yazar; aynı sözlükle ikinci çalıştırma stemmer'ı hiç
+    çağırmaz ve kategorizasyon sonucu önbelleksiz çalıştırmayla aynıdır.
+  - Sözlük maxsize ile sınırlıdır; sınırın dışında kalan kelimeler yine doğru köklenir.
+  - Worker süreçlerinde bulunan kökler ana süreçte sözlüğe eklenip kaydedilir.
+
+Gerçek .cache/ klasörüne dokunmaz.
+
+Kullanım:
+    python test_stem_cache.py
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+
+from categorize_horoscopes import HoroscopeCategorizer, StemCache, categorize_parallel
+
+DATES = ['2025-12-02', '2025-12-03', '2025-12-04']
+
+
+class StemCacheValidator:
+    """Her kontrol başarısızlıkta errors listesine mesaj ekler"""
+
+    def __init__(self, work_dir: str):
+        self.work_dir = work_dir
+        self.errors = []
+        self.inputs = [os.path.join('data', f'daily_raw_{date}.json') for date in DATES]
+
+    def check(self, condition: bool, message: str):
+        print(f"  [{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            self.errors.append(message)
+
+    def categorizer(self, stem_cache_file: str = None, **kwargs) -> HoroscopeCategorizer:
+        return HoroscopeCategorizer(stem_cache_file=stem_cache_file,
+                                    manifest_file=os.path.join(self.work_dir, 'manifest.json'), **kwargs)
+
+    def process(self, categorizer: HoroscopeCategorizer, categorized: dict = None) -> list:
+        results = []
+        for input_file in self.inputs:
+            categorizer.set_files(input_file, os.path.join(self.work_dir, os.path.basename(input_file)))
+            with contextlib.redirect_stdout(io.StringIO()):
+                results.append(categorizer.process_file(categorized))
+        return results
+
+    def check_persistence(self):
+        """İkinci çalıştırma kökleri sözlükten okur, sonuç aynı"""
+        print("\n[1] Test: Kalıcı Sözlük")
+        print("-" * 80)
+
+        expected = self.process(self.categorizer())
+        path = os.path.join(self.work_dir, 'first', 'stem_cache.json')
+
+        first = self.categorizer(path)
+        first_results = self.process(first)
+        stats = first.stem_cache.stats()
+        self.check(os.path.exists(path) and not os.path.exists(f"{path}.tmp"), "Sözlük dosyası yazıldı")
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        self.check(len(stored) == stats['stemmed'] > 0,
+                   f"Köklenen {stats['stemmed']} kelimenin hepsi sözlükte ({len(stored)})")
+        self.check(first_results == expected, "Sonuç önbelleksiz çalıştırmayla aynı")
+
+        second = self.categorizer(path)
+        second_results = self.process(second)
+        stats = second.stem_cache.stats()
+        self.check(stats['stemmed'] == 0 and stats['stored_hits'] == len(stored),
+                   f"İkinci çalıştırmada stemmer çağrılmadı ({stats['stored_hits']} kök sözlükten)")
+        self.check(second_results == expected, "İkinci çalıştırmanın sonucu aynı")
+
+    def check_limit(self):
+        """Sözlük maxsize ile sınırlı, sınır dışındaki kelimeler yine doğru"""
+        print("\n[2] Test: Boyut Sınırı")
+        print("-" * 80)
+
+        stemmer = self.categorizer().stemmer
+        with open(self.inputs[0], 'r', encoding='utf-8') as f:
+            text = json.dumps(json.load(f), ensure_ascii=False).lower()
+        words = list(dict.fromkeys(word for word in text.split() if word.isalpha()))[:300]
+
+        path = os.path.join(self.work_dir, 'limit', 'stem_cache.json')
+        cache = StemCache(stemmer, maxsize=100, path=path)
+        stems = [cache.stem(word) for word in words]
+        cache.save()
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        self.check(len(stored) == 100, f"{len(words)} kelimeden {len(stored)} tanesi sözlükte (sınır 100)")
+
+        reloaded = StemCache(stemmer, maxsize=100, path=path)
+        self.check([reloaded.stem(word) for word in words] == stems == [stemmer.stem(w) for w in words],
+                   "Sözlükten ve stemmer'dan gelen kökler aynı")
+        self.check(reloaded.stats()['stored_hits'] == 100, "Sınır içindeki kökler sözlükten okundu")
+
+    def check_workers(self):
+        """Worker'larda bulunan kökler ana süreçte sözlüğe kaydedilir"""
+        print("\n[3] Test: Worker Süreçleri")
+        print("-" * 80)
+
+        path = os.path.join(self.work_dir, 'workers', 'stem_cache.json')
+        categorizer = self.categorizer(path)
+        files = [(input_file, os.path.join(self.work_dir, os.path.basename(input_file)))
+                 for input_file in self.inputs]
+        with contextlib.redirect_stdout(io.StringIO()):
+            categorized = categorize_parallel(categorizer, files, 2)
+        merged = len(categorizer.stem_cache.stored)
+        results = self.process(categorizer, categorized)
+        self.check(merged > 0 and categorizer.stem_cache.stats()['stemmed'] == 0,
+                   f"Ana süreç stemmer'ı çağırmadı, {merged} kök worker'lardan geldi")
+        self.check(results == self.process(self.categorizer()), "2 süreçle sonuç tek süreçli çalıştırmayla aynı")
+
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        self.check(len(stored) > 0 and stored == categorizer.stem_cache.stored,
+                   f"Worker'ların bulduğu {len(stored)} kök sözlüğe kaydedildi")
+
+        second = self.categorizer(path)
+        self.process(second)
+        self.check(second.stem_cache.stats()['stemmed'] == 0, "Sonraki çalıştırma stemmer'ı çağırmadı")
+
+    def run_all_tests(self) -> bool:
+        self.check_persistence()
+        self.check_limit()
+        self.check_workers()
+
+        print("\n" + "=" * 80)
+        if self.errors:
+            print(f"[X] TEST BASARISIZ - {len(self.errors)} hata")
+            return False
+        print("[OK] TEST BASARILI - Kok onbellegi dogru calisiyor!")
+        return True
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as work_dir:
+        success = StemCacheValidator(work_dir).run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+SQLite Veri Deposu Test Sistemi
+
+storage.py'nin deposunu data/ altındaki JSON dosyalarıyla geçici bir klasörde dener:
+  - Aktarılan her günün raw / processed / summarized verisi, skorları ve sıralamaları
+    depodan JSON dosyasındakiyle birebir aynı okunur.
+  - Birden fazla hücrede (ya da aşamada) geçen metinler contents tablosunda bir kez
+    saklanır; günün yeniden yazılmasıyla kimsenin göstermediği metinler silinir.
+  - Aktarmayı tekrarlamak satırları çoğaltmaz; --only-new depodaki günleri atlar.
+  - API'nin depoya sorduğu her sorgu indeksle çalışır (tabloyu baştan taramaz).
+  - API depoyla, deposuz ve JSON dosyalarının gerisinde kalmış bir depoyla aynı
+    yanıtları döner.
+
+Kullanım:
+    python test_storage.py
+"""
+
+import asyncio
+import glob
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+
+import history_store
+import storage
+
+DATA_DIR = "data"
+
+SIGN_SLUGS = ['koc', 'boga', 'ikizler', 'yengec', 'aslan', 'basak',
+              'terazi', 'akrep', 'yay', 'oglak', 'kova', 'balik']
+
+# Sorgu planında indekssiz tablo taraması: "SCAN texts" (sonunda USING ... INDEX yok)
+FULL_SCAN = re.compile(r'^SCAN (?!CONSTANT ROW)\S+$')
+
+
+def load_json(path: str) -> dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def row_counts(db: str) -> dict:
+    conn = storage.connect(db)
+    try:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('contents', 'texts', 'scores', 'rankings')}
+    finally:
+        conn.close()
+
+
+class StorageValidator:
+    """Her kontrol başarısızlıkta errors listesine mesaj ekler"""
+
+    def __init__(self, work_dir: str):
+        self.work_dir = work_dir
+        self.db = os.path.join(work_dir, 'aistrolog.db')
+        self.errors = []
+        # aşama -> [(tarih, dosya yolu), ...]
+        self.files = {stage: [] for _, stage in storage.FILE_STAGES}
+        for path in sorted(glob.glob(os.path.join(DATA_DIR, '*.json'))):
+            name = os.path.basename(path)
+            stage = next((stage for prefix, stage in storage.FILE_STAGES if name.startswith(prefix)), None)
+            date = storage.date_from_path(name)
+            if stage and date:
+                self.files[stage].append((date, path))
+
+    def check(self, condition: bool, message: str):
+        print(f"  [{'OK' if condition else 'X'}] {message}")
+        if not condition:
+            self.errors.append(message)
+
+    def check_roundtrip(self):
+        """Depodan okunan her gün JSON dosyasıyla aynı"""
+        print("\n[1] Test: JSON -> Depo -> JSON")
+        print("-" * 80)
+
+        counts = storage.import_json(self.db, DATA_DIR)
+        self.check(all(counts[stage] == len(files) for stage, files in self.files.items()),
+                   "Her aşamanın tüm günleri aktarıldı: " +
+                   ', '.join(f"{stage} {counts[stage]}" for stage in self.files))
+
+        for stage in storage.STAGES:
+            different = [date for date, path in self.files[stage]
+                         if storage.load_texts(self.db, stage, date) != load_json(path)]
+            self.check(not different, f"{stage}: {len(self.files[stage])} gün dosyayla aynı"
+                       + (f" (farklı: {', '.join(different)})" if different else ""))
+
+        different = []
+        for date, path in self.files['scored']:
+            data = load_json(path)
+            rankings = {category: [{'burc': item['burc'], 'score': item['score']} for item in items]
+                        for category, items in data['rankings'].items() if category.endswith('_ranking')}
+            if (storage.load_scores(self.db, date) != data['scores'] or
+                    storage.load_rankings_history(self.db, date, date).get(date) != rankings):
+                different.append(date)
+        self.check(not different, f"scored: {len(self.files['scored'])} günün skorları ve sıralamaları aynı"
+                   + (f" (farklı: {', '.join(different)})" if different else ""))
+
+        history = history_store.load_range(history_dir=os.path.join(DATA_DIR, 'rankings_history'))
+        self.check(storage.load_rankings_history(self.db) == history,
+                   f"Sıralama geçmişi ({len(history)} gün) history_store ile aynı")
+
+    def check_contents(self):
+        """Tekrar eden metinler bir kez saklanır, sahipsiz metinler silinir"""
+        print("\n[2] Test: Metinlerin Tekilleştirilmesi")
+        print("-" * 80)
+
+        conn = storage.connect(self.db)
+        try:
+            cells, distinct = conn.execute(
+                "SELECT COUNT(hash), COUNT(DISTINCT hash) FROM texts").fetchone()
+            contents = conn.execute("SELECT COUNT(*) FROM contents").fetchone()[0]
+        finally:
+            conn.close()
+        self.check(contents == distinct < cells,
+                   f"{cells} dolu hücrede {distinct} farklı metin, contents'te {contents} satır")
+
+        date = self.files['raw'][-1][0]
+        data = storage.load_texts(self.db, 'raw', date)
+        site = next(iter(data))
+        sign = next(iter(data[site]))
+        data[site][sign]['genel'] = "Depo testi için geçici metin."
+        storage.write_texts(self.db, 'raw', date, data)
+        self.check(storage.load_texts(self.db, 'raw', date) == data, "Günün yeniden yazılan hali okunuyor")
+
+        storage.write_texts(self.db, 'raw', date, load_json(self.files['raw'][-1][1]))
+        conn = storage.connect(self.db)
+        try:
+            orphan = conn.execute("SELECT COUNT(*) FROM contents WHERE text = ?",
+                                  ("Depo testi için geçici metin.",)).fetchone()[0]
+        finally:
+            conn.close()
+        self.check(orphan == 0, "Artık hiçbir hücrenin göstermediği metin silindi")
+        self.check(row_counts(self.db)['contents'] == contents, "contents ilk aktarımdaki haline döndü")
+
+    def check_reimport(self):
+        """Aktarmayı tekrarlamak satırları çoğaltmaz"""
+        print("\n[3] Test: Tekrar Aktarma")
+        print("-" * 80)
+
+        before = row_counts(self.db)
+        storage.import_json(self.db, DATA_DIR)
+        self.check(row_counts(self.db) == before, f"Tam aktarım tekrarlandı, satır sayıları aynı: {before}")
+
+        counts = storage.import_json(self.db, DATA_DIR, only_new=True)
+        self.check(not any(counts.values()), "--only-new depodaki günleri atladı")
+
+    def api_responses(self, db: str) -> dict:
+        """Summarized günlerinin burç yorumları ve dönem sıralamaları (API yanıtları)"""
+        import main
+
+        main.DB_PATH = db
+        responses = {}
+        dates = [datetime.strptime(date, "%Y-%m-%d").strftime("%d-%m-%Y")
+                 for date, _ in self.files['summarized']]
+        # Verisi olmayan gün: en son güne / son günlere düşülür
+        for date in dates + ['01-01-2030']:
+            for slug in SIGN_SLUGS:
+                responses[('gunluk', slug, date)] = asyncio.run(main.get_daily_horoscope(slug, date))
+            for period in ('daily', 'weekly', 'monthly'):
+                try:
+                    responses[('rankings', period, date)] = asyncio.run(main.get_rankings(date, period))
+                except Exception as e:
+                    responses[('rankings', period, date)] = repr(e)
+        return responses
+
+    def check_queries(self):
+        """API'nin depoya sorduğu sorgular indeksle çalışır"""
+        print("\n[4] Test: İndeksli Sorgular")
+        print("-" * 80)
+
+        statements = []
+        connect = storage.connect
+
+        def tracing_connect(path):
+            conn = connect(path)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        storage.connect = tracing_connect
+        try:
+            self.api_responses(self.db)
+        finally:
+            storage.connect = connect
+
+        queries = sorted({sql for sql in statements if sql.lstrip().upper().startswith('SELECT')})
+        conn = connect(self.db)
+        try:
+            scans = [(sql, line) for sql in queries
+                     for *_, line in conn.execute(f"EXPLAIN QUERY PLAN {sql}")
+                     if FULL_SCAN.match(line)]
+        finally:
+            conn.close()
+        self.check(bool(queries), f"API {len(queries)} farklı sorguyla depoyu kullandı")
+        self.check(not scans, "Hiçbir sorgu tabloyu indekssiz taramıyor"
+                   + (f" (örn. {scans[0][1]}: {scans[0][0][:80]})" if scans else ""))
+
+    def check_api(self):
+        """API depoyla, deposuz ve geride kalmış depoyla aynı yanıtları döner"""
+        print("\n[5] Test: API")
+        print("-" * 80)
+
+        without_store = self.api_responses(os.path.join(self.work_dir, 'yok.db'))
+        with_store = self.api_responses(self.db)
+        different = [key for key in without_store if with_store[key] != without_store[key]]
+        self.check(not different, f"{len(with_store)} yanıt depoyla ve deposuz aynı"
+                   + (f" (örn. {different[0]})" if different else ""))
+
+        # Depo son günü almadan kalmış (örn. adımlar AISTROLOG_DB olmadan çalışmış)
+        last = self.files['summarized'][-1][0]
+        conn = storage.connect(self.db)
+        try:
+            with conn:
+                for table in ('texts', 'scores', 'rankings'):
+                    conn.execute(f"DELETE FROM {table} WHERE date >= ?", (last,))
+        finally:
+            conn.close()
+        stale_store = self.api_responses(self.db)
+        different = [key for key in without_store if stale_store[key] != without_store[key]]
+        self.check(not different, f"Depo {last} gününü içermezken yanıtlar JSON dosyalarıyla aynı"
+                   + (f" (örn. {different[0]})" if different else ""))
+
+    def run_all_tests(self) -> bool:
+        if not self.files['raw']:
+            print(f"[X] {DATA_DIR}/ altında daily_raw_*.json bulunamadı")
+            return False
+        self.check_roundtrip()
+        self.check_contents()
+        self.check_reimport()
+        self.check_queries()
+        self.check_api()
+
+        print("\n" + "=" * 80)
+        if self.errors:
+            print(f"[X] TEST BASARISIZ - {len(self.errors)} hata")
+            return False
+        print("[OK] TEST BASARILI - Depo JSON dosyalariyla ayni veriyi tutuyor!")
+        return True
+
+
+def main():
+    logging.disable(logging.WARNING)
+    with tempfile.TemporaryDirectory() as work_dir:
+        success = StorageValidator(work_dir).run_all_tests()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+AIstrolog - Metin Normalizasyonu
+Scraper parse fonksiyonlarının ortak kullandığı metin temizleme ve burç adı
+tespit yardımcıları ile tekrar eden metinler için içerik hash'i. Regex'ler ve
+burç adı varyantları modül yüklenirken bir kez hazırlanır; parse döngüleri
+içinde derleme ya da string üretimi yapılmaz.
+
+Ölçüm: python benchmarks/textnorm_benchmark.py
+"""
+
+import hashlib
+import re
+from typing import List, Optional, Pattern, Tuple
+
+# Sabit burç listesi
+BURCLAR = [
+    "Koç", "Boğa", "İkizler", "Yengeç", "Aslan", "Başak",
+    "Terazi", "Akrep", "Yay", "Oğlak", "Kova", "Balık"
+]
+
+# Burç isim normalizasyonu için mapping
+BURC_NORMALIZATION = {
+    "koc": "Koç", "koç": "Koç", "aries": "Koç",
+    "boga": "Boğa", "boğa": "Boğa", "taurus": "Boğa",
+    "ikizler": "İkizler", "gemini": "İkizler",
+    "yengec": "Yengeç", "yengeç": "Yengeç", "cancer": "Yengeç",
+    "aslan": "Aslan", "leo": "Aslan",
+    "basak": "Başak", "başak": "Başak", "virgo": "Başak",
+    "terazi": "Terazi", "libra": "Terazi",
+    "akrep": "Akrep", "scorpio": "Akrep",
+    "yay": "Yay", "sagittarius": "Yay",
+    "oglak": "Oğlak", "oğlak": "Oğlak", "capricorn": "Oğlak",
+    "kova": "Kova", "aquarius": "Kova",
+    "balik": "Balık", "balık": "Balık", "pisces": "Balık"
+}
+
+# Özel durumlar için direkt mapping (Hurriyet'te büyük harf sorunları için)
+SPECIAL_CASES = {
+    "İKİZLER": "İkizler",
+    "IKIZLER": "İkizler",
+    "TERAZİ": "Terazi",
+    "TERAZI": "Terazi",
+}
+
+# Küçük harfli isim -> burç; önce normalizasyon tablosu, sonra direkt eşleşme
+_LOWER_LOOKUP = {burc.lower(): burc for burc in BURCLAR}
+_LOWER_LOOKUP.update(BURC_NORMALIZATION)
+
+# Burç adlarının küçük harfli halleri (BURCLAR sırasıyla)
+BURCLAR_LOWER = [burc.lower() for burc in BURCLAR]
+
+# Büyük harfli metinde aranan burç adı varyantları: (burç, Türkçe, İngilizce)
+# İKİZLER / IKIZLER, TERAZİ / TERAZI
+SIGN_UPPER_VARIANTS = [
+    (burc, burc.upper(), burc.replace('İ', 'I').replace('i', 'I').upper())
+    for burc in BURCLAR
+]
+
+
+def clean_text(text: str) -> str:
+    """Metni temizler: whitespace, satır sonu vb."""
+    if not text:
+        return ""
+    return ' '.join(text.strip().split())
+
+
+def content_hash(text: str) -> str:
+    """
+    Metnin boşlukları normalize edilmiş halinin kısa içerik hash'i. Farklı
+    site/burç/kategori hücrelerinde aynı metnin tekrarını bulmak için kullanılır.
+    """
+    return hashlib.sha1(clean_text(text).encode('utf-8')).hexdigest()[:16]
+
+
+def normalize_burc_name(name: str) -> Optional[str]:
+    """Burç ismini normalize eder"""
+    if not name:
+        return None
+
+    clean_name = name.strip()
+    special = SPECIAL_CASES.get(clean_name.upper())
+    if special:
+        return special
+    return _LOWER_LOOKUP.get(clean_name.lower())
+
+
+def sign_patterns(template: str, flags: int = 0) -> List[Pattern]:
+    """Her burç için, şablondaki {name} yerine burç adı konmuş derlenmiş regex"""
+    return [re.compile(template.format(name=re.escape(burc)), flags) for burc in BURCLAR]
+
+
+def find_upper_sign(text: str, head_len: int = 200) -> Optional[Tuple[str, str, int]]:
+    """
+    Metnin ilk head_len karakterinde (büyük harfe çevrilmiş) geçen ilk burcu
+    BURCLAR sırasıyla bulur. Her burç için önce Türkçe, sonra İngilizce büyük
+    harf yazımı denenir. Metnin sadece başı büyük harfe çevrilir.
+
+    Returns:
+        (burç, bulunan yazım, yazımın büyük harfli metindeki konumu) ya da None
+    """
+    # upper() bazı karakterleri uzatabildiği için baş kısım çevrildikten sonra kesilir
+    head = text[:head_len].upper()[:head_len]
+    for burc, upper_tr, upper_en in SIGN_UPPER_VARIANTS:
+        if upper_tr in head:
+            return burc, upper_tr, head.index(upper_tr)
+        if upper_en in head:
+            return burc, upper_en, head.index(upper_en)
+    return None
+
+
+class LabelSet:
+    """
+    Kategori etiketleri (örn. 'aşk:') ve cümle içinde silinmeleri için derlenmiş
+    regex'leri. Etiketlerin hiçbiri geçmeyen metinler tek bir taramayla elenir.
+    """
+
+    def __init__(self, labels: List[str]):
+        self.labels = [(label, re.compile(rf'\b{re.escape(label)}\s*', re.IGNORECASE))
+                       for label in labels]
+        self.any_label = re.compile(
+            r'\b(?:{})'.format('|'.join(re.escape(label) for label in labels)), re.IGNORECASE)
+
+    def strip(self, text: str) -> str:
+        """
+        Metindeki kategori etiketlerini temizler. Etiketler sırayla denenir: metin
+        etiketle başlıyorsa etiket kesilip durulur, değilse etiket cümle içinden silinir.
+        """
+        if not self.any_label.search(text):
+            # Hiçbir etiket silinmeyeceği için sadece baştaki etiket kontrolü kalır
+            text_lower = text.lower()
+            for label, _ in self.labels:
+                if text_lower.startswith(label):
+                    return text[len(label):].strip()
+            return text
+
+        for label, pattern in self.labels:
+            if text.lower().startswith(label):
+                return text[len(label):].strip()
+            text = pattern.sub('', text)
+        return text